@@ -2,8 +2,8 @@
 # Oct,21 2005
 '''Interpolated Properties'''
 
-from scipy import  interpolate
-from numpy import array, float64
+import copy
+from numpy import array, asarray, float64, arange, lexsort, ndim, clip, broadcast_to
 
 class InterpProp:
     '''Interpolate tables of properties
@@ -21,19 +21,16 @@ class InterpProp:
         minY=None, maxY=None):
           
         # Sort Data to Make sure that x array is monotonically increasing
-        a = map(float,xInp)  
-        b = map(float,yInp)
-        c = [(x,y) for x,y in zip(a,b)]
-        c.sort()
-        a = []
-        b = []
-        for aa,bb in c:
-            a.append(aa)
-            b.append(bb)
-        
-        # now turn lists into Numpy/SciPy arrays
-        self.x = array(a,float64)
-        self.y = array(b,float64)
+        #  (sort on x, then y, same as sorting (x,y) pairs)
+        a = array(xInp, float64).ravel()
+        b = array(yInp, float64).ravel()
+        if len(a) != len(b):
+            raise Exception('in InterpProp, xInp and yInp must be the same length')
+        iSortArr = lexsort( (b, a) )
+        
+        # Numpy/SciPy arrays
+        self.x = a[iSortArr]
+        self.y = b[iSortArr]
         
         self.extrapOK = extrapOK
         self.linear = linear
@@ -48,6 +45,8 @@ class InterpProp:
             self.Nterp = 2
         
         if len(self.x) > 1:
+            from scipy import interpolate # import only when needed (slow to import)
+            
             #self.interpFunc = interpolate.interp1d(self.x, self.y, 
             #    kind=self.Nterp, bounds_error=False)
                 
@@ -74,21 +73,71 @@ class InterpProp:
             self.maxY = None
         
         self.delX = max(self.x) - min(self.x)
-        
+        self.set_end_values()
+
+    def get_scaled(self, xScale=1.0, yScale=1.0):
+        '''Return a new InterpProp of the data (xScale*x, yScale*y).
+           The PCHIP interpolator scales exactly, so its coefficients are
+           scaled instead of fitting the scaled data again.
+           (xScale and yScale must be > 0)'''
+        xScale = float(xScale)
+        yScale = float(yScale)
+        if xScale <= 0.0 or yScale <= 0.0:
+            raise Exception('in InterpProp.get_scaled, xScale and yScale must be > 0')
+
+        if len(self.x) <= 1:
+            return InterpProp( self.x*xScale, self.y*yScale, extrapOK=self.extrapOK,
+                               linear=self.linear, minY=self.minY, maxY=self.maxY )
+
+        def scale_ppoly( f, fScale ):
+            # piecewise polynomial in powers of (x - x[i]), highest power first
+            fNew = copy.copy( f )
+            Npow = f.c.shape[0] - 1
+            powArr = arange(Npow, -1, -1).reshape( (-1,) + (1,)*(f.c.ndim-1) )
+            fNew.c = f.c * (fScale / xScale**powArr)
+            fNew.x = f.x * xScale
+            return fNew
+
+        newObj = copy.copy( self )
+        newObj.x = self.x * xScale
+        newObj.y = self.y * yScale
+        newObj.interpFunc = scale_ppoly( self.interpFunc, yScale )
+        newObj.derivFunc  = scale_ppoly( self.derivFunc, yScale / xScale )
+        if self.minY is not None: newObj.minY = self.minY * yScale
+        if self.maxY is not None: newObj.maxY = self.maxY * yScale
+        newObj.delX = self.delX * xScale
+        newObj.set_end_values()
+        return newObj
+
+    def set_end_values(self):
+        '''Save end points and end slopes as floats for scalar calls.'''
+        x = self.x
+        y = self.y
+        self.x0, self.xn = float(x[0]), float(x[-1])
+        self.y0, self.yn = float(y[0]), float(y[-1])
+        if len(x) > 1:
+            self.slope0 = float( (y[1]-y[0])/(x[1]-x[0]) )
+            self.slopen = float( (y[-1]-y[-2])/(x[-1]-x[-2]) )
+        else:
+            self.slope0 = self.slopen = 0.0
+
     def getValue(self, xval=0.0):
-        xval = float(xval)
+        '''Return interpolated value at xval (float), 
+           or array of values if xval is an array.'''
+        if type(xval) is not float and ndim(xval):
+            return self.getValue_arr( xval )
         
         if not self.extrapOK:
-            if xval<self.x[0]: return self.y[0]
-            if xval>self.x[-1]: return self.y[-1]
+            if xval<self.x0: return self.y0
+            if xval>self.xn: return self.yn
             #print '1) self.interpFunc( %s ) ='%xval,self.interpFunc( xval )
             return float(self.interpFunc( xval ))
         
         # if not in data range, linearly extrapoate from end points.
-        if xval<self.x[0]: 
-            yval = self.y[0]+(xval-self.x[0])*(self.y[1]-self.y[0])/(self.x[1]-self.x[0])
-        elif xval>self.x[-1]: 
-            yval = self.y[-1]+(xval-self.x[-1])*(self.y[-1]-self.y[-2])/(self.x[-1]-self.x[-2])
+        if xval<self.x0: 
+            yval = self.y0 + (xval-self.x0)*self.slope0
+        elif xval>self.xn: 
+            yval = self.yn + (xval-self.xn)*self.slopen
         else:
             #print '2) self.interpFunc( %s ) ='%xval,self.interpFunc( xval )
             yval = float(self.interpFunc( xval ))
@@ -97,11 +146,38 @@ class InterpProp:
         if self.minY is not None: yval = max(yval, self.minY)
         if self.maxY is not None: yval = min(yval, self.maxY)
         return yval
+    
+    def getValue_arr(self, xArr):
+        '''Return array of interpolated values at xArr (same shape as xArr).'''
+        xArr = asarray( xArr, dtype=float64 )
+        
+        # interpolate inside data range, then replace values outside of range
+        yArr = array( broadcast_to( self.interpFunc( clip(xArr, self.x0, self.xn) ), xArr.shape ), 
+                      dtype=float64 )
+        loArr = xArr < self.x0
+        hiArr = xArr > self.xn
+        
+        if not self.extrapOK:
+            yArr[loArr] = self.y0
+            yArr[hiArr] = self.yn
+            return yArr
+        
+        # if not in data range, linearly extrapoate from end points.
+        yArr[loArr] = self.y0 + (xArr[loArr]-self.x0)*self.slope0
+        yArr[hiArr] = self.yn + (xArr[hiArr]-self.xn)*self.slopen
+        
+        # if limits set, use them
+        if self.minY is not None or self.maxY is not None:
+            yArr = clip( yArr, self.minY, self.maxY )
+        return yArr
         
     def deriv(self, xval=0.0, stepFrac=0.0001):
+        '''Return 1st derivative at xval (or array of derivatives if xval is an array).'''
+        if type(xval) is not float and ndim(xval):
+            return self.deriv_arr( xval, stepFrac=stepFrac )
         
         # if possible, use UnivariateSpline for 1st derivative.
-        if xval>=self.x[0] and xval<=self.x[-1]: 
+        if xval>=self.x0 and xval<=self.xn: 
             # for UnivariateSpline, linear has 0th and 1st deriv
             #                       quadratic has 0th, 1st and 2nd derivs
             
@@ -111,6 +187,20 @@ class InterpProp:
         # otherwise, make a rough estimate.
         dx = self.delX * stepFrac
         return (self(xval+dx) - self(xval-dx)) / 2.0 / dx
+    
+    def deriv_arr(self, xArr, stepFrac=0.0001):
+        '''Return array of 1st derivatives at xArr (same shape as xArr).'''
+        xArr = asarray( xArr, dtype=float64 )
+        dydxArr = array( broadcast_to( self.derivFunc( clip(xArr, self.x0, self.xn) ), xArr.shape ), 
+                         dtype=float64 )
+        
+        # outside data range, make a rough estimate.
+        outArr = (xArr < self.x0) | (xArr > self.xn)
+        if outArr.any():
+            dx = self.delX * stepFrac
+            xOutArr = xArr[outArr]
+            dydxArr[outArr] = (self.getValue_arr(xOutArr+dx) - self.getValue_arr(xOutArr-dx)) / 2.0 / dx
+        return dydxArr
           
 if __name__ == "__main__": #Self Test
     from pylab import *
@@ -0,0 +1,240 @@
+r"""
+Batch evaluation of a RocketThruster over arrays of inputs.
+
+evaluate_batch takes numpy arrays (or a structured array / dict of arrays)
+of inputs such as MRcore, Pc, eps, Rthrt, pcentBell, pcentFFC and Pamb and
+returns a numpy structured array with one row per design point that holds
+the inputs, the main performance outputs and every individual efficiency.
+
+The CEA states of all points are evaluated first (each unique (Pc, MRcore, eps)
+state runs once and is then held in the shared CEA cache).  The MLP efficiency
+models (throat Cd, boundary layer loss and kinetic IspODK) are then evaluated
+for all points in one array pass each.  Each point then only sets its inputs
+and makes a single call to calc_all_eff, instead of the full reset_attr/evaluate
+cascade for every changed input.
+
+For example::
+
+    import numpy as np
+    from rocketisp.rocket_isp import RocketThruster
+    from rocketisp.batch_eval import evaluate_batch
+
+    R = RocketThruster( ... )
+    resultArr = evaluate_batch( R, MRcore=np.linspace(1.4, 2.2, 20), Pc=500.0 )
+    print( resultArr['IspDel'] )
+"""
+import copy
+import numpy as np
+from rocketisp.stream_tubes import BarrierStream
+from rocketisp.cea_table import TABLE_VALUE_L
+from rocketisp.efficiency.calc_full_pcentLossBL import calc_pcentLossBL_arr
+from rocketisp.efficiency.calc_noz_kinetics import calc_IspODK_arr
+from rocketisp.nozzle.calc_full_Cd import calc_Cd_arr
+
+# inputs that belong to each object of a RocketThruster
+GEOMETRY_INPUT_L = ['Rthrt', 'CR', 'eps', 'pcentBell', 'LnozInp', 'RupThroat', 'RdwnThroat',
+                    'RchmConv', 'cham_conv_deg', 'LchmOvrDt', 'LchmMin', 'LchamberInp']
+CORE_INPUT_L = ['MRcore', 'Pc', 'Pamb', 'CdThroat', 'adjCstarODE', 'adjIspIdeal']
+BARRIER_INPUT_L = ['pcentFFC', 'ko']
+THRUSTER_INPUT_L = ['noz_regen_eps', 'pulse_sec', 'pulse_quality']
+
+BATCH_INPUT_L = GEOMETRY_INPUT_L + CORE_INPUT_L + BARRIER_INPUT_L + THRUSTER_INPUT_L
+
+# CoreStream outputs saved for each point
+BATCH_OUTPUT_L = ['IspDel', 'IspDel_core', 'IspDelPulse', 'IspAmb', 'IspODE', 'IspODK', 'IspODF',
+                  'cstarODE', 'cstarERE', 'FvacTotal', 'Fambient', 'wdotTot', 'wdotOx', 'wdotFl',
+                  'MRthruster', 'Pexit', 'CdThroat', 'TcODE', 'CfVacDel', 'CfAmbDel']
+
+# individual and consolidated efficiencies saved for each point (as "eff" + name)
+BATCH_EFF_L = ['Div', 'Kin', 'BL', 'TP', 'Mix', 'Em', 'Vap', 'HL', 'FFC', 'Pulse',
+               'ERE', 'Noz', 'Isp', 'IspPulsing']
+
+def get_batch_inputs( inputs=None, **inputArrD ):
+    """
+    Return dictionary of 1D input arrays, all of the same length.
+    inputs can be a numpy structured array or a dictionary of arrays.
+    Scalar inputs are broadcast to the length of the array inputs.
+    """
+    inpD = {} # index=input name, value=array or scalar
+    if inputs is not None:
+        if isinstance(inputs, np.ndarray) and inputs.dtype.names:
+            for name in inputs.dtype.names:
+                inpD[name] = inputs[name]
+        else:
+            inpD.update( inputs )
+    inpD.update( inputArrD )
+
+    for name in inpD.keys():
+        if name not in BATCH_INPUT_L:
+            raise Exception('in evaluate_batch, "%s" is not a recognized batch input'%name)
+
+    nameL = [name for name in BATCH_INPUT_L if name in inpD]
+    arrL = np.broadcast_arrays( *[np.atleast_1d( np.asarray(inpD[name], dtype=np.float64) ) for name in nameL] )
+
+    return dict( [(name, arr.ravel()) for name, arr in zip(nameL, arrL)] )
+
+def set_pcentFFC( coreObj, pcentFFC ):
+    """
+    Set pcentFFC of coreObj, adding or removing the BarrierStream as required.
+    A removed BarrierStream is saved and restored by the next pcentFFC > 0, 
+    so its inputs (e.g. ko) do not depend on the order of the points.
+    """
+    if pcentFFC > 0.0:
+        if coreObj.barrierObj is None:
+            if coreObj.saved_barrierObj is not None:
+                coreObj.barrierObj, coreObj.saved_barrierObj = coreObj.saved_barrierObj, None
+            else:
+                coreObj.barrierObj = BarrierStream(coreObj, pcentFFC=pcentFFC)
+        coreObj.barrierObj.pcentFFC = pcentFFC
+        coreObj.add_barrier = True
+    elif coreObj.add_barrier:
+        coreObj.add_barrier = False
+        coreObj.saved_barrierObj = coreObj.barrierObj
+        coreObj.barrierObj = None
+        if not coreObj.effObj['FFC'].is_const:
+            # barrier calc set effFFC... return to default
+            coreObj.effObj.set_value('FFC', 1.0, value_src='default', re_evaluate=False)
+
+def set_ko( coreObj, ko ):
+    """
+    Set ko of the BarrierStream of coreObj (or of the BarrierStream saved by set_pcentFFC).
+    Return False if coreObj has no BarrierStream to hold ko.
+    """
+    barrierObj = coreObj.barrierObj
+    if barrierObj is None:
+        barrierObj = coreObj.saved_barrierObj
+    if barrierObj is None:
+        return False
+    barrierObj.ko = ko
+    return True
+
+def precompute_mlp_models( rocketObj, inpD, Npts, TcODEArr ):
+    """
+    Evaluate the MLP efficiency models used by rocketObj.calc_all_eff for all
+    points in one array pass each and save them as precomputed stage values.
+    TcODEArr holds the TcODE of each point.
+    """
+    # avoid circular import
+    from rocketisp.rocket_isp import selected_eff_modelD
+    
+    coreObj = rocketObj.coreObj
+    geomObj = coreObj.geomObj
+    effObj = coreObj.effObj
+    
+    def get_arr( name, default ):
+        return inpD.get(name, np.full(Npts, default, dtype=np.float64))
+    
+    PcArr   = get_arr('Pc', coreObj.Pc)
+    MRArr   = get_arr('MRcore', coreObj.MRcore)
+    epsArr  = get_arr('eps', geomObj.eps)
+    RtArr   = get_arr('Rthrt', geomObj.Rthrt)
+    bellArr = get_arr('pcentBell', geomObj.pcentBell)
+    
+    stages = rocketObj.stages
+    if rocketObj.calc_CdThroat:
+        RupArr = get_arr('RupThroat', geomObj.RupThroat)
+        CdArr = calc_Cd_arr( Pc=PcArr, Rthrt=RtArr, RWTU=RupArr )
+        stages.set_precomputed('Cd', zip(PcArr.tolist(), RtArr.tolist(), RupArr.tolist()), CdArr.tolist())
+    
+    if not effObj['BL'].is_const and selected_eff_modelD['BL'] == 'MLP fit':
+        pclossArr = calc_pcentLossBL_arr( Pc=PcArr, eps=epsArr, Rthrt=RtArr, pcentBell=bellArr, TcCham=TcODEArr )
+        keyL = zip(PcArr.tolist(), epsArr.tolist(), RtArr.tolist(), bellArr.tolist(), TcODEArr.tolist())
+        stages.set_precomputed('pcentLossBL', keyL, pclossArr.tolist())
+    
+    if not effObj['Kin'].is_const:
+        IspODKArr = calc_IspODK_arr( coreObj.ceaObj, Pc=PcArr, eps=epsArr, Rthrt=RtArr, 
+                                     pcentBell=bellArr, MR=MRArr )
+        keyL = zip(PcArr.tolist(), epsArr.tolist(), RtArr.tolist(), bellArr.tolist(), MRArr.tolist())
+        stages.set_precomputed('IspODK', keyL, IspODKArr.tolist())
+
+def evaluate_batch( rocketObj, inputs=None, **inputArrD ):
+    """
+    Evaluate rocketObj at each point of the input arrays and return a numpy
+    structured array of inputs, BATCH_OUTPUT_L and "eff" + BATCH_EFF_L.
+    The batch is run on a copy of rocketObj, so rocketObj is not changed.
+    
+    A ko input needs a barrier stream (pcentFFC > 0 in rocketObj or at that point)
+    and a CdThroat input needs rocketObj.calc_CdThroat to be False, otherwise an
+    Exception is raised (the input would not be applied).
+
+    :param rocketObj: RocketThruster object to evaluate
+    :param inputs: structured array or dictionary of input arrays (see BATCH_INPUT_L)
+    :param inputArrD: input arrays given by keyword (e.g. MRcore=np.linspace(1.4, 2.2, 20))
+    :type rocketObj: RocketThruster
+    :type inputs: numpy.ndarray
+    :type inputArrD: numpy.ndarray
+    :return: structured array of results, one row per point
+    :rtype: numpy.ndarray
+    """
+    inpD = get_batch_inputs( inputs, **inputArrD )
+    if 'CdThroat' in inpD and rocketObj.calc_CdThroat:
+        raise Exception('in evaluate_batch, CdThroat input is replaced by the Cd model (calc_CdThroat is True)')
+    if inpD:
+        Npts = len( list(inpD.values())[0] )
+    else:
+        Npts = 1
+
+    # work on a copy so that rocketObj is unchanged by the batch
+    rocketObj = copy.deepcopy( rocketObj )
+    coreObj = rocketObj.coreObj
+    geomObj = coreObj.geomObj
+    effObj = coreObj.effObj
+
+    # ........ run each unique CEA state once (later calls are cache hits)
+    PcArr  = inpD.get('Pc',     np.full(Npts, coreObj.Pc))
+    MRArr  = inpD.get('MRcore', np.full(Npts, coreObj.MRcore))
+    epsArr = inpD.get('eps',    np.full(Npts, geomObj.eps))
+
+    ceaTable = coreObj.ceaTable
+    TcODED = {} # index=(Pc, MR, eps), value=TcODE
+    for Pc, MR, eps in set( zip(PcArr.tolist(), MRArr.tolist(), epsArr.tolist()) ):
+        if ceaTable is not None and ceaTable.is_in_range(Pc, MR, eps):
+            TcODED[(Pc, MR, eps)] = ceaTable(Pc, MR, eps)[ TABLE_VALUE_L.index('TcODE') ]
+        else:
+            TcODED[(Pc, MR, eps)] = coreObj.ceaObj.get_state( Pc=Pc, MR=MR, eps=eps).TcODE
+    TcODEArr = np.array( [TcODED[k] for k in zip(PcArr.tolist(), MRArr.tolist(), epsArr.tolist())] )
+    
+    # ........ evaluate MLP efficiency models for all points at once
+    precompute_mlp_models( rocketObj, inpD, Npts, TcODEArr )
+
+    # ........ build results array
+    inp_nameL = list( inpD.keys() )
+    dtype = [(name, np.float64) for name in inp_nameL + BATCH_OUTPUT_L] + \
+            [('eff'+name, np.float64) for name in BATCH_EFF_L]
+    resultArr = np.zeros( Npts, dtype=dtype )
+    for name in inp_nameL:
+        resultArr[name] = inpD[name]
+
+    geom_changes = [name for name in inp_nameL if name in GEOMETRY_INPUT_L]
+
+    for i in range( Npts ):
+        for name in inp_nameL:
+            value = float( inpD[name][i] )
+            if name in ['LnozInp', 'LchamberInp'] and np.isnan(value):
+                value = None # NaN in batch array means no user input
+            
+            if name in GEOMETRY_INPUT_L:
+                geomObj.reset_attr( name, value, re_evaluate=False)
+            elif name in CORE_INPUT_L:
+                setattr( coreObj, name, value )
+            elif name in THRUSTER_INPUT_L:
+                setattr( rocketObj, name, value )
+            elif name == 'pcentFFC':
+                set_pcentFFC( coreObj, value )
+            elif name == 'ko':
+                if not set_ko( coreObj, value ):
+                    raise Exception('in evaluate_batch, ko input needs a barrier stream (pcentFFC > 0)')
+
+        if geom_changes:
+            geomObj.evaluate()
+
+        if not rocketObj.calc_all_eff():
+            coreObj.evaluate() # calc_all_eff made no change, so did not evaluate
+
+        row = resultArr[i]
+        for name in BATCH_OUTPUT_L:
+            row[name] = getattr( coreObj, name )
+        for name in BATCH_EFF_L:
+            row['eff'+name] = effObj( name )
+
+    return resultArr
@@ -0,0 +1,396 @@
+r"""
+Bounded, least-recently-used (LRU) cache of NASA CEA results.
+
+Every delivered Isp evaluation makes several CEA calls (core, barrier, kinetics
+and injector models) and most design studies revisit the same
+(Pc, MR, eps) states many times.  CachedCEA_Obj is a drop-in replacement
+for rocketcea's CEA_Obj that memoizes the CEA methods used by RocketIsp in
+a single cache shared by all instances.
+
+Cache keys hold the propellant pair (oxName, fuelName, fac_CR), the method name
+and the method inputs.  Floating point inputs are canonicalized to 12 significant
+figures so that, for example, MR=1.9 and MR=1.9000000000001 share a cache entry.
+
+Results that miss the cache are looked up in the optional persistent store
+(see cea_store.py) before CEA is run.
+
+A single (Pc, MR, eps) state is evaluated by get_state, which runs CEA once in
+equilibrium and, only when frozen values are requested, once frozen.  All of
+the values RocketIsp uses (Isp, cstar, Tc, MW, gamma, Pc/Pe, sonic velocities and
+species mass fractions) are read from those runs, and the CEA_Obj methods that
+return them (e.g. get_IvacCstrTc_ChmMwGam, get_PcOvPe, get_SpeciesMassFractions)
+are answered from the saved CEA_State instead of making separate CEA runs.
+
+For example::
+
+    from rocketisp.cea_cache import CachedCEA_Obj, get_cea_cache_stats
+
+    ceaObj = CachedCEA_Obj(oxName='N2O4', fuelName='MMH')
+    IspODE, cstarODE, TcODE, MWchm, gammaChm = ceaObj.get_IvacCstrTc_ChmMwGam(Pc=500, MR=1.9, eps=40)
+    state = ceaObj.get_state(Pc=500, MR=1.9, eps=40)
+    print( state.IspODE, state.IspODF, state.PcOvPe, state.sonicVelL )
+    print( get_cea_cache_stats() )
+"""
+import os
+import inspect
+from collections import OrderedDict
+from rocketisp.cea_store import get_cea_store
+
+if 'READTHEDOCS' not in os.environ:
+    from rocketcea.cea_obj import CEA_Obj, py_cea
+else:
+    from rocketisp.mock.cea_obj import CEA_Obj
+    py_cea = None
+
+# CEA_Obj methods that are memoized by CachedCEA_Obj
+CACHED_METHOD_L = ['get_IvacCstrTc', 'getFrozen_IvacCstrTc', 'get_IvacCstrTc_ChmMwGam',
+                   'get_Isp', 'get_Cstar', 'get_Tcomb', 'get_PcOvPe', 'get_eps_at_PcOvPe',
+                   'get_SonicVelocities', 'get_SpeciesMassFractions', 'getMRforER']
+
+def canonical_value( value ):
+    """Return a hashable, canonical version of a CEA input value."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float( '%.12g'%value )
+    try:
+        return float( '%.12g'%float(value) ) # e.g. numpy scalars
+    except:
+        return value
+
+class CEA_ResultCache(object):
+    """
+    Least-recently-used cache of CEA results with hit/miss counters.
+
+    :param maxsize: maximum number of results held in cache
+    :type maxsize: int
+    :return: CEA_ResultCache object
+    :rtype: CEA_ResultCache
+    """
+
+    def __init__(self, maxsize=50000):
+        self.maxsize = maxsize
+        self.resultD = OrderedDict() # index=key tuple, value=CEA result
+        self.hits = 0
+        self.misses = 0
+        self.cea_runs = 0 # number of times the CEA FORTRAN code was run
+
+    def __len__(self):
+        return len( self.resultD )
+
+    def get(self, key):
+        """Return cached result for key or None if not in cache."""
+        try:
+            result = self.resultD[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.resultD.move_to_end( key )
+        self.hits += 1
+        return result
+
+    def set(self, key, result):
+        """Save result to cache, discarding the least recently used result(s) if full."""
+        self.resultD[key] = result
+        self.resultD.move_to_end( key )
+        while len(self.resultD) > self.maxsize:
+            self.resultD.popitem( last=False )
+
+    def set_maxsize(self, maxsize):
+        """Change the maximum number of results held in cache."""
+        self.maxsize = max(1, int(maxsize))
+        while len(self.resultD) > self.maxsize:
+            self.resultD.popitem( last=False )
+
+    def clear(self):
+        """Empty the cache and reset the hit/miss/run counters."""
+        self.resultD.clear()
+        self.hits = 0
+        self.misses = 0
+        self.cea_runs = 0
+
+    def get_stats(self):
+        """Return dictionary of cache statistics."""
+        n_calls = self.hits + self.misses
+        if n_calls > 0:
+            hit_rate = float(self.hits) / n_calls
+        else:
+            hit_rate = 0.0
+        return {'hits':self.hits, 'misses':self.misses, 'size':len(self.resultD),
+                'maxsize':self.maxsize, 'hit_rate':hit_rate, 'cea_runs':self.cea_runs}
+
+# one cache shared by all CachedCEA_Obj instances
+CEA_CACHE = CEA_ResultCache()
+
+def get_cea_cache_stats():
+    """Return dictionary of hits, misses, size, maxsize, hit_rate and cea_runs of the shared CEA cache."""
+    return CEA_CACHE.get_stats()
+
+def clear_cea_cache():
+    """Empty the shared CEA cache and reset its hit/miss counters."""
+    CEA_CACHE.clear()
+
+def set_cea_cache_size( maxsize ):
+    """Set the maximum number of results held in the shared CEA cache."""
+    CEA_CACHE.set_maxsize( maxsize )
+
+# CEA_State attributes from the equilibrium run and from the frozen run
+STATE_EQUIL_L = ['IspODE', 'cstarODE', 'TcODE', 'MWchm', 'gammaChm', 'PcOvPe',
+                 'sonicVelL', 'molWtD', 'massFracD']
+STATE_FROZEN_L = ['IspODF', 'cstarODF', 'TcODF']
+
+# default min_fraction of rocketcea get_SpeciesMassFractions
+DEFAULT_MIN_FRACTION = 0.000005
+
+class CEA_State(object):
+    """
+    All of the CEA results used by RocketIsp for one (Pc, MR, eps) state.
+    Frozen values are None until a frozen CEA run has been made for the state.
+
+    :param IspODE: sec, one dimensional equilibrium vacuum Isp
+    :param cstarODE: ft/sec, ideal equilibrium characteristic velocity
+    :param TcODE: degR, chamber temperature
+    :param MWchm: g/gmole, chamber molecular weight
+    :param gammaChm: chamber ratio of specific heats
+    :param PcOvPe: equilibrium ratio of chamber pressure to exit pressure
+    :param sonicVelL: ft/sec, equilibrium sonic velocities at chamber, throat and exit
+    :param molWtD: dictionary of species molecular weights (index=species)
+    :param massFracD: dictionary of equilibrium species mass fractions (index=species, value=[injface, chm, tht, exit])
+    :param IspODF: sec, one dimensional frozen vacuum Isp (frozen in chamber)
+    :param cstarODF: ft/sec, characteristic velocity of frozen run
+    :param TcODF: degR, chamber temperature of frozen run
+    """
+
+    def __init__(self, **stateD):
+        for name in STATE_EQUIL_L + STATE_FROZEN_L:
+            setattr(self, name, stateD.get(name, None))
+    
+    def has_frozen(self):
+        """Return True if frozen values have been set."""
+        return self.IspODF is not None
+    
+    def get_dict(self):
+        """Return dictionary of all values (e.g. to save in persistent store)."""
+        return dict( [(name, getattr(self, name)) for name in STATE_EQUIL_L + STATE_FROZEN_L] )
+
+def read_equilibrium_run( ceaObj ):
+    """
+    Return dictionary of STATE_EQUIL_L values from the equilibrium CEA run just made
+    by ceaObj.setupCards.  Values are read the same way as the rocketcea CEA_Obj methods.
+    """
+    i_chm, i_exit = ceaObj.i_chm, ceaObj.i_exit
+    
+    MWchm = py_cea.prtout.wm[ i_chm ]
+    try:
+        MWchm = 1.0 / py_cea.prtout.totn[ i_chm ]
+    except:
+        pass # just use above MWchm if 1/totn fails
+    
+    PcOvPe = py_cea.rockt.app[ i_exit ]
+    if ceaObj.fac_CR is not None:
+        PcOvPe = PcOvPe * py_cea.rockt.app[ i_chm ]
+        sonicVelL = list( py_cea.rockt.sonvel[1:4] )
+    else:
+        sonicVelL = list( py_cea.rockt.sonvel[:3] )
+    
+    # species mass fractions at injector face, chamber, throat and exit
+    massFracD = {} # index=species: value=[massfrac_injface, massfrac_chm, massfrac_tht, massfrac_exit]
+    molWtD    = {} # index=species: value=molecular weight
+    for k in range( py_cea.indx.ngc ):
+        p = py_cea.cdata.prod[k].decode("utf-8").strip()
+        if p:
+            mw = py_cea.therm.mw[k-1]
+            mfL = [float(py_cea.comp.en[k-1,i]*mw) for i in [ceaObj.i_injface, i_chm, ceaObj.i_thrt, i_exit]]
+            if max(mfL) >= DEFAULT_MIN_FRACTION:
+                massFracD[p] = mfL
+                molWtD[p] = float(mw)
+    
+    return {'IspODE':float(py_cea.rockt.vaci[ i_exit ]), 
+            'cstarODE':float(py_cea.rockt.cstr),
+            'TcODE':float(py_cea.prtout.ttt[ i_chm ] * 1.8), # convert from Kelvin to Rankine
+            'MWchm':float(MWchm), 
+            'gammaChm':float(py_cea.prtout.gammas[ i_chm ]),
+            'PcOvPe':float(PcOvPe), 
+            'sonicVelL':[float(v * 3.28083) for v in sonicVelL], # convert from m/sec into ft/sec
+            'molWtD':molWtD, 'massFracD':massFracD}
+
+def read_frozen_run( ceaObj ):
+    """Return dictionary of STATE_FROZEN_L values from the frozen CEA run just made by ceaObj.setupCards."""
+    return {'IspODF':float(py_cea.rockt.vaci[ ceaObj.i_exit ]), 
+            'cstarODF':float(py_cea.rockt.cstr),
+            'TcODF':float(py_cea.prtout.ttt[ ceaObj.i_chm ] * 1.8)}
+
+def _make_cached_method( name ):
+    """Return a memoized version of the named CEA_Obj method."""
+    base_method = getattr(CEA_Obj, name)
+
+    sig = inspect.signature( base_method )
+    defaultD = OrderedDict() # index=argument name, value=default value
+    for arg_name, p in sig.parameters.items():
+        if arg_name != 'self':
+            defaultD[arg_name] = p.default
+    arg_nameL = list( defaultD.keys() )
+
+    def cached_method(self, *args, **kwargs):
+        inpD = dict( defaultD )
+        if args:
+            inpD.update( zip(arg_nameL, args) )
+        inpD.update( kwargs )
+
+        key = (self.cache_prefix, name) + tuple( [canonical_value(inpD[a]) for a in arg_nameL] )
+        result = CEA_CACHE.get( key )
+        if result is None:
+            # look in the persistent store (if enabled) before running CEA
+            store = get_cea_store( self.cache_prefix )
+            if store is not None:
+                result = store.get( key )
+
+            if result is None:
+                result = base_method(self, *args, **kwargs)
+                if isinstance(result, list):
+                    result = tuple( result )
+                if store is not None:
+                    store.set( key, result )
+            CEA_CACHE.set( key, result )
+
+        if name == 'get_SonicVelocities': # rocketcea returns a list
+            return list( result )
+        return result
+
+    cached_method.__name__ = name
+    cached_method.__doc__ = base_method.__doc__
+    return cached_method
+
+class CachedCEA_Obj( CEA_Obj ):
+    """
+    CEA_Obj that memoizes results in the shared, least-recently-used CEA cache.
+    Results that are dictionaries (e.g. get_SpeciesMassFractions) are shared
+    between callers and should be treated as read-only.
+
+    :param oxName: name of oxidizer (e.g. N2O4, LOX)
+    :param fuelName: name of fuel (e.g. MMH, LH2)
+    :param fac_CR: contraction ratio of finite area combustor (None=infinite)
+    :type oxName: str
+    :type fuelName: str
+    :type fac_CR: float
+    :return: CachedCEA_Obj object
+    :rtype: CachedCEA_Obj
+    """
+
+    def __init__(self, oxName='N2O4', fuelName='MMH', fac_CR=None, **kwargs):
+        CEA_Obj.__init__(self, oxName=oxName, fuelName=fuelName, fac_CR=fac_CR, **kwargs)
+
+        self.oxName = oxName
+        self.fuelName = fuelName
+        self.cache_prefix = (oxName, fuelName, canonical_value(fac_CR))
+    
+    def setupCards(self, *args, **kwargs):
+        """Run CEA (see rocketcea CEA_Obj.setupCards) and count the run."""
+        CEA_CACHE.cea_runs += 1
+        return CEA_Obj.setupCards(self, *args, **kwargs)
+    
+    def get_state(self, Pc=100.0, MR=1.0, eps=40.0, frozen=True):
+        """
+        Return CEA_State of all CEA results for (Pc, MR, eps).
+        A new state makes one equilibrium CEA run.  If frozen is True, one frozen
+        CEA run is also made (once) to set IspODF, cstarODF and TcODF.
+        The returned CEA_State is shared between callers and should be treated as read-only.
+        """
+        key = (self.cache_prefix, 'get_state', canonical_value(Pc), canonical_value(MR), canonical_value(eps))
+        state = CEA_CACHE.get( key )
+        
+        store = get_cea_store( self.cache_prefix )
+        is_changed = False
+        if state is None:
+            # look in the persistent store (if enabled) before running CEA
+            if store is not None:
+                stateD = store.get( key )
+                if stateD is not None:
+                    state = CEA_State( **stateD )
+            
+            if state is None:
+                self.setupCards( Pc=Pc, MR=MR, eps=eps )
+                state = CEA_State( **read_equilibrium_run(self) )
+                is_changed = True
+            CEA_CACHE.set( key, state )
+        
+        if frozen and not state.has_frozen():
+            self.setupCards( Pc=Pc, MR=MR, eps=eps, frozen=1, frozenAtThroat=0 )
+            for name, value in read_frozen_run(self).items():
+                setattr(state, name, value)
+            is_changed = True
+        
+        if is_changed and store is not None:
+            store.set( key, state.get_dict(), replace=True )
+        return state
+    
+    # ......... CEA_Obj methods answered from CEA_State (see CEA_Obj for descriptions)
+    
+    def get_IvacCstrTc(self, Pc=100.0, MR=1.0, eps=40.0, frozen=0, frozenAtThroat=0):
+        if frozen:
+            return self.getFrozen_IvacCstrTc(Pc=Pc, MR=MR, eps=eps, frozenAtThroat=frozenAtThroat)
+        state = self.get_state(Pc=Pc, MR=MR, eps=eps, frozen=False)
+        return state.IspODE, state.cstarODE, state.TcODE
+    
+    def getFrozen_IvacCstrTc(self, Pc=100.0, MR=1.0, eps=40.0, frozenAtThroat=0):
+        if frozenAtThroat:
+            return self._memo_getFrozen_IvacCstrTc(Pc=Pc, MR=MR, eps=eps, frozenAtThroat=frozenAtThroat)
+        state = self.get_state(Pc=Pc, MR=MR, eps=eps, frozen=True)
+        return state.IspODF, state.cstarODF, state.TcODF
+    
+    def get_IvacCstrTc_ChmMwGam(self, Pc=100.0, MR=1.0, eps=40.0):
+        state = self.get_state(Pc=Pc, MR=MR, eps=eps, frozen=False)
+        return state.IspODE, state.cstarODE, state.TcODE, state.MWchm, state.gammaChm
+    
+    def get_Isp(self, Pc=100.0, MR=1.0, eps=40.0, frozen=0, frozenAtThroat=0):
+        if frozen:
+            return self.getFrozen_IvacCstrTc(Pc=Pc, MR=MR, eps=eps, frozenAtThroat=frozenAtThroat)[0]
+        return self.get_state(Pc=Pc, MR=MR, eps=eps, frozen=False).IspODE
+    
+    def get_Cstar(self, Pc=100.0, MR=1.0):
+        return self.get_state(Pc=Pc, MR=MR, eps=2.0, frozen=False).cstarODE # eps=2 same as CEA_Obj
+    
+    def get_Tcomb(self, Pc=100.0, MR=1.0):
+        return self.get_state(Pc=Pc, MR=MR, eps=2.0, frozen=False).TcODE # eps=2 same as CEA_Obj
+    
+    def get_PcOvPe(self, Pc=100.0, MR=1.0, eps=40.0, frozen=0, frozenAtThroat=0):
+        if frozen:
+            return self._memo_get_PcOvPe(Pc=Pc, MR=MR, eps=eps, frozen=frozen, frozenAtThroat=frozenAtThroat)
+        return self.get_state(Pc=Pc, MR=MR, eps=eps, frozen=False).PcOvPe
+    
+    def get_SonicVelocities(self, Pc=100.0, MR=1.0, eps=40.0, frozen=0, frozenAtThroat=0):
+        if frozen:
+            return self._memo_get_SonicVelocities(Pc=Pc, MR=MR, eps=eps, frozen=frozen, frozenAtThroat=frozenAtThroat)
+        return list( self.get_state(Pc=Pc, MR=MR, eps=eps, frozen=False).sonicVelL )
+    
+    def get_SpeciesMassFractions(self, Pc=100.0, MR=1.0, eps=40.0, 
+                                 frozen=0, frozenAtThroat=0, min_fraction=DEFAULT_MIN_FRACTION):
+        if frozen or min_fraction != DEFAULT_MIN_FRACTION:
+            return self._memo_get_SpeciesMassFractions(Pc=Pc, MR=MR, eps=eps, frozen=frozen, 
+                                        frozenAtThroat=frozenAtThroat, min_fraction=min_fraction)
+        state = self.get_state(Pc=Pc, MR=MR, eps=eps, frozen=False)
+        return state.molWtD, state.massFracD
+
+# memoized CEA_Obj methods are available as "_memo_" + name.
+# Methods not answered from CEA_State are replaced by their memoized version.
+for _name in CACHED_METHOD_L:
+    if hasattr(CEA_Obj, _name):
+        _method = _make_cached_method(_name)
+        setattr( CachedCEA_Obj, '_memo_' + _name, _method )
+        if _name not in CachedCEA_Obj.__dict__:
+            setattr( CachedCEA_Obj, _name, _method )
+    
+
+if __name__ == '__main__':
+    import time
+
+    ceaObj = CachedCEA_Obj(oxName='N2O4', fuelName='MMH')
+
+    for i in range(2):
+        t0 = time.time()
+        for MR in [1.5, 1.6, 1.7, 1.8, 1.9, 2.0]:
+            IspODE, cstarODE, TcODE, MWchm, gammaChm = \
+                ceaObj.get_IvacCstrTc_ChmMwGam(Pc=500, MR=MR, eps=40)
+            IspODF,_,_ = ceaObj.getFrozen_IvacCstrTc(Pc=500, MR=MR, eps=40)
+        print( 'pass %i took %.3f ms'%(i+1, 1000.0*(time.time() - t0)), get_cea_cache_stats() )
@@ -0,0 +1,248 @@
+r"""
+Optional persistent, on-disk store of NASA CEA results.
+
+When enabled, results that miss the in-memory CEA cache (see cea_cache.py)
+are looked up in an SQLite file for the propellant pair before CEA is run,
+and new CEA results are saved to that file.  A warm store lets repeat trade
+studies in new processes and new sessions start hot.
+
+There is one SQLite file per (oxName, fuelName, fac_CR) in the store directory.
+The files use write-ahead logging (WAL) so that many processes can read
+while another process writes.  Writes use "INSERT OR IGNORE", so two processes
+that save the same CEA point do not conflict.
+
+Each file has a "meta" table with the store schema version (STORE_SCHEMA_VERSION)
+and the rocketcea version that made its results.  If either one does not match
+the running code (e.g. after a rocketcea upgrade or a change to the stored
+layout), the stored results are discarded and the file is rebuilt as CEA runs.
+
+The store assumes the stock rocketcea propellant cards.  Results are keyed by
+propellant name only, so a user propellant card added under an existing name
+(or a changed card) will NOT be detected.  Use a separate store directory
+(or disable the store) when running with user propellant cards.
+
+If a store file can not be opened, read or written (e.g. an unusable store
+directory), that store is turned off for the rest of the session (see
+CEA_Store.error_msg) and CEA simply runs.
+
+The store is off by default.  Turn it on with enable_cea_store() or by setting
+the environment variable ROCKETISP_CEA_STORE to a directory name.
+
+For example::
+
+    from rocketisp.cea_store import enable_cea_store
+    enable_cea_store() # defaults to ~/.rocketisp/cea_store
+"""
+import os
+import json
+import sqlite3
+
+DEFAULT_STORE_DIR = os.path.join( os.path.expanduser('~'), '.rocketisp', 'cea_store' )
+
+# change whenever the layout of stored keys or values changes
+STORE_SCHEMA_VERSION = '1'
+
+def get_rocketcea_version():
+    """Return version string of rocketcea (results of other versions are not used)."""
+    try:
+        import rocketcea
+        return str( rocketcea.__version__ )
+    except (ImportError, AttributeError):
+        return 'unknown'
+
+# directory of active store (None = store is disabled)
+_store_dir = None
+storeD = {} # index=cache_prefix tuple, value=CEA_Store
+
+def get_store_filename( store_dir, oxName, fuelName, fac_CR=None ):
+    """Return the SQLite file name used for the propellant pair."""
+    name = '%s_%s'%(oxName, fuelName)
+    if fac_CR is not None:
+        name += '_CR%g'%fac_CR
+    # keep file name safe for all operating systems
+    name = ''.join( [c if (c.isalnum() or c in '_-.') else '-' for c in name] )
+    return os.path.join( store_dir, name + '.sqlite' )
+
+class CEA_Store(object):
+    """
+    SQLite file of CEA results for one propellant pair.
+
+    :param filename: path to SQLite file (created if it does not exist)
+    :param timeout: sec, time to wait on a locked database before giving up
+    :type filename: str
+    :type timeout: float
+    :return: CEA_Store object
+    :rtype: CEA_Store
+    """
+
+    def __init__(self, filename, timeout=30.0):
+        self.filename = filename
+        self.timeout = timeout
+        self.n_read = 0    # number of results found in store
+        self.n_written = 0 # number of results saved to store
+        self.n_rebuilds = 0 # number of times stale results were discarded
+        self.error_msg = '' # if not empty, store failed and is no longer used
+        self._conn = None
+        self._pid = None
+
+    def __getstate__(self):
+        # connections can not be pickled or shared with child processes
+        stateD = self.__dict__.copy()
+        stateD['_conn'] = None
+        stateD['_pid'] = None
+        return stateD
+
+    def get_connection(self):
+        """Return SQLite connection for this process (reconnect after a fork)."""
+        if self._conn is None or self._pid != os.getpid():
+            dirname = os.path.dirname( self.filename )
+            if dirname and not os.path.isdir( dirname ):
+                os.makedirs( dirname, exist_ok=True )
+
+            self._conn = sqlite3.connect( self.filename, timeout=self.timeout,
+                                          check_same_thread=False )
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS cea (key TEXT PRIMARY KEY, value TEXT)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+            self._conn.commit()
+            self._pid = os.getpid()
+            self.check_meta()
+        return self._conn
+
+    def get_meta(self):
+        """Return dictionary of the meta table (e.g. schema_version, rocketcea_version)."""
+        return dict( self.get_connection().execute('SELECT name, value FROM meta').fetchall() )
+
+    def check_meta(self):
+        """
+        Discard all stored results if the schema version or rocketcea version of the
+        store do not match the running code (or the store has no meta data).
+        """
+        metaD = {'schema_version':STORE_SCHEMA_VERSION, 'rocketcea_version':get_rocketcea_version()}
+        conn = self.get_connection()
+        sql = 'SELECT name, value FROM meta'
+        if dict( conn.execute(sql).fetchall() ) == metaD:
+            return
+
+        conn.execute('BEGIN IMMEDIATE') # lock out other writers while rebuilding
+        try:
+            if dict( conn.execute(sql).fetchall() ) != metaD: # another process may have just rebuilt it
+                if conn.execute('DELETE FROM cea').rowcount > 0:
+                    self.n_rebuilds += 1
+                conn.execute('DELETE FROM meta')
+                conn.executemany('INSERT INTO meta (name, value) VALUES (?,?)', list(metaD.items()) )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    def set_failed(self, exc):
+        """Stop using the store after an error (the store is only an accelerator, never fail a calculation over it)."""
+        self.error_msg = '%s: %s'%(type(exc).__name__, exc)
+        try:
+            self.close()
+        except sqlite3.Error:
+            self._conn = None
+            self._pid = None
+
+    def get(self, key):
+        """Return stored result for key tuple or None if not in store (or the store failed)."""
+        if self.error_msg:
+            return None
+        try:
+            row = self.get_connection().execute('SELECT value FROM cea WHERE key=?',
+                                                (repr(key),) ).fetchone()
+        except (sqlite3.Error, OSError) as exc:
+            self.set_failed( exc )
+            return None
+        if row is None:
+            return None
+
+        self.n_read += 1
+        result = json.loads( row[0] )
+        if isinstance(result, list):
+            return tuple( result )
+        return result
+
+    def set(self, key, result, replace=False):
+        """Save result for key tuple (an existing entry for key is kept unless replace is True)."""
+        if self.error_msg:
+            return
+        if replace:
+            sql = 'INSERT OR REPLACE INTO cea (key, value) VALUES (?,?)'
+        else:
+            sql = 'INSERT OR IGNORE INTO cea (key, value) VALUES (?,?)'
+        try:
+            conn = self.get_connection()
+            conn.execute(sql, (repr(key), json.dumps(result)) )
+            conn.commit()
+            self.n_written += 1
+        except (sqlite3.Error, OSError) as exc:
+            self.set_failed( exc )
+
+    def __len__(self):
+        """Return number of stored results (0 if the store failed)."""
+        if self.error_msg:
+            return 0
+        try:
+            return self.get_connection().execute('SELECT COUNT(*) FROM cea').fetchone()[0]
+        except (sqlite3.Error, OSError) as exc:
+            self.set_failed( exc )
+            return 0
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._pid = None
+
+def enable_cea_store( store_dir=None ):
+    """
+    Turn on the persistent CEA store.
+
+    :param store_dir: directory of SQLite files (default is ~/.rocketisp/cea_store)
+    :type store_dir: str
+    :return: store directory
+    :rtype: str
+    """
+    global _store_dir
+    if store_dir is None:
+        store_dir = DEFAULT_STORE_DIR
+    store_dir = os.path.abspath( store_dir )
+
+    if store_dir != _store_dir:
+        disable_cea_store()
+        _store_dir = store_dir
+    return _store_dir
+
+def disable_cea_store():
+    """Turn off the persistent CEA store and close any open SQLite files."""
+    global _store_dir
+    for store in storeD.values():
+        store.close()
+    storeD.clear()
+    _store_dir = None
+
+def get_cea_store_dir():
+    """Return directory of active CEA store (None if store is disabled)."""
+    return _store_dir
+
+def get_cea_store( cache_prefix ):
+    """
+    Return CEA_Store for cache_prefix=(oxName, fuelName, fac_CR) or None if
+    the store is disabled.
+    """
+    if _store_dir is None:
+        return None
+    try:
+        return storeD[cache_prefix]
+    except KeyError:
+        oxName, fuelName, fac_CR = cache_prefix
+        store = CEA_Store( get_store_filename( _store_dir, oxName, fuelName, fac_CR ) )
+        storeD[cache_prefix] = store
+        return store
+
+if os.environ.get('ROCKETISP_CEA_STORE', ''):
+    enable_cea_store( os.environ['ROCKETISP_CEA_STORE'] )
+
@@ -0,0 +1,281 @@
+r"""
+Tabulated NASA CEA thermochemistry for fast lookup.
+
+A CEA_Table holds IspODE, IspODF, cstarODE, TcODE, MWchm, gammaChm and PcOvPe
+on a (Pc, MR, eps) grid for one propellant pair.  Values are interpolated
+linearly in (log10(Pc), MR, log10(eps)), so an evaluation takes microseconds
+instead of a CEA run.  The table estimates its own interpolation error by
+comparing with direct CEA at cell centers.
+
+Tables are saved as compressed numpy (npz) files so they only need to be built once.
+
+For example::
+
+    from rocketisp.cea_table import build_cea_table
+
+    table = build_cea_table('N2O4', 'MMH', PcMin=100, PcMax=1000, MRmin=1.2, MRmax=2.6,
+                            epsMin=10, epsMax=200, npz_file='N2O4_MMH.npz')
+    print( table.get_error_str() )
+    core.set_fast_lookup( table )
+"""
+import os
+from bisect import bisect_right
+from math import log10
+import numpy as np
+
+from rocketisp.cea_cache import CachedCEA_Obj
+
+# names of tabulated values (in order)
+TABLE_VALUE_L = ['IspODE', 'IspODF', 'cstarODE', 'TcODE', 'MWchm', 'gammaChm', 'PcOvPe']
+I_PCOVPE = TABLE_VALUE_L.index('PcOvPe')
+
+def _find_cell( xL, x ):
+    """Return index of lower grid point and fractional distance into cell (clamped to grid)."""
+    i = bisect_right(xL, x) - 1
+    if i < 0:
+        i = 0
+    elif i > len(xL) - 2:
+        i = len(xL) - 2
+    return i, (x - xL[i]) / (xL[i+1] - xL[i])
+
+class CEA_Table(object):
+    """
+    Grid of CEA results for one propellant pair, interpolated in (log10(Pc), MR, log10(eps)).
+
+    :param oxName: name of oxidizer (e.g. N2O4, LOX)
+    :param fuelName: name of fuel (e.g. MMH, LH2)
+    :param PcArr: psia, increasing chamber pressures of grid
+    :param MRArr: increasing mixture ratios of grid
+    :param epsArr: increasing area ratios of grid
+    :param valueArr: array of shape (len(PcArr), len(MRArr), len(epsArr), 7) of TABLE_VALUE_L (None=run CEA)
+    :type oxName: str
+    :type fuelName: str
+    :type PcArr: numpy.array
+    :type MRArr: numpy.array
+    :type epsArr: numpy.array
+    :type valueArr: numpy.array
+    :return: CEA_Table object
+    :rtype: CEA_Table
+    """
+
+    def __init__(self, oxName, fuelName, PcArr, MRArr, epsArr, valueArr=None):
+        self.oxName = oxName
+        self.fuelName = fuelName
+
+        self.PcArr = np.asarray(PcArr, dtype=np.float64)
+        self.MRArr = np.asarray(MRArr, dtype=np.float64)
+        self.epsArr = np.asarray(epsArr, dtype=np.float64)
+
+        for name, arr in [('PcArr', self.PcArr), ('MRArr', self.MRArr), ('epsArr', self.epsArr)]:
+            if len(arr) < 2 or np.any( np.diff(arr) <= 0.0 ):
+                raise Exception('in CEA_Table, %s must have at least 2 increasing values'%name)
+
+        if valueArr is None:
+            valueArr = self.calc_cea_values()
+        self.valueArr = np.ascontiguousarray( valueArr, dtype=np.float64 )
+
+        self.errorD = {} # index=value name, value=max relative interpolation error
+        self.set_interp_data()
+
+    def set_interp_data(self):
+        """Set the python lists used by the scalar interpolation."""
+        self.logPcL = [log10(Pc) for Pc in self.PcArr]
+        self.MRL = [float(MR) for MR in self.MRArr]
+        self.logepsL = [log10(eps) for eps in self.epsArr]
+
+        # PcOvPe is nearly a power law of eps, so interpolate log10(PcOvPe)
+        self.interpArr = self.valueArr.copy()
+        self.interpArr[...,I_PCOVPE] = np.log10( np.maximum(self.valueArr[...,I_PCOVPE], 1.0E-30) )
+        self.valueL = self.interpArr.tolist()
+
+        self.PcMin, self.PcMax = float(self.PcArr[0]), float(self.PcArr[-1])
+        self.MRmin, self.MRmax = self.MRL[0], self.MRL[-1]
+        self.epsMin, self.epsMax = float(self.epsArr[0]), float(self.epsArr[-1])
+
+    def calc_cea_values(self):
+        """Run CEA at every grid point and return array of TABLE_VALUE_L."""
+        ceaObj = CachedCEA_Obj(oxName=self.oxName, fuelName=self.fuelName)
+        valueArr = np.zeros( (len(self.PcArr), len(self.MRArr), len(self.epsArr), len(TABLE_VALUE_L)) )
+
+        for i,Pc in enumerate(self.PcArr):
+            for j,MR in enumerate(self.MRArr):
+                for k,eps in enumerate(self.epsArr):
+                    valueArr[i,j,k,:] = get_cea_values( ceaObj, Pc, MR, eps )
+        return valueArr
+
+    def is_in_range(self, Pc, MR, eps):
+        """Return True if (Pc, MR, eps) is inside the grid."""
+        return self.PcMin <= Pc <= self.PcMax and self.MRmin <= MR <= self.MRmax and \
+               self.epsMin <= eps <= self.epsMax
+
+    def __call__(self, Pc, MR, eps):
+        """
+        Return tuple of interpolated (IspODE, IspODF, cstarODE, TcODE, MWchm, gammaChm, PcOvPe)
+        for scalar inputs.  Inputs outside of the grid are clamped to the grid edges.
+        """
+        i, fi = _find_cell( self.logPcL, log10(min(max(Pc, self.PcMin), self.PcMax)) )
+        j, fj = _find_cell( self.MRL, min(max(MR, self.MRmin), self.MRmax) )
+        k, fk = _find_cell( self.logepsL, log10(min(max(eps, self.epsMin), self.epsMax)) )
+
+        resultL = [0.0] * len(TABLE_VALUE_L)
+        for ii, wi in ((i, 1.0-fi), (i+1, fi)):
+            for jj, wj in ((j, 1.0-fj), (j+1, fj)):
+                wij = wi * wj
+                for kk, wk in ((k, 1.0-fk), (k+1, fk)):
+                    w = wij * wk
+                    for n,v in enumerate( self.valueL[ii][jj][kk] ):
+                        resultL[n] += w * v
+        resultL[I_PCOVPE] = 10.0**resultL[I_PCOVPE]
+        return tuple( resultL )
+
+    def get_arrays(self, Pc, MR, eps):
+        """
+        Return dictionary of interpolated arrays (index=name in TABLE_VALUE_L)
+        for array inputs of Pc, MR and eps (inputs are broadcast together).
+        Inputs outside of the grid are clamped to the grid edges.
+        """
+        Pc, MR, eps = np.broadcast_arrays( np.asarray(Pc, dtype=np.float64),
+                                           np.asarray(MR, dtype=np.float64),
+                                           np.asarray(eps, dtype=np.float64) )
+        shape = Pc.shape
+
+        def cell_arrays( xArr, x ):
+            x = np.clip( x.ravel(), xArr[0], xArr[-1] )
+            i = np.clip( np.searchsorted(xArr, x, side='right') - 1, 0, len(xArr)-2 )
+            return i, (x - xArr[i]) / (xArr[i+1] - xArr[i])
+
+        i, fi = cell_arrays( np.log10(self.PcArr), np.log10(Pc) )
+        j, fj = cell_arrays( self.MRArr, MR )
+        k, fk = cell_arrays( np.log10(self.epsArr), np.log10(eps) )
+
+        result = np.zeros( (len(i), len(TABLE_VALUE_L)) )
+        for di, wi in ((0, 1.0-fi), (1, fi)):
+            for dj, wj in ((0, 1.0-fj), (1, fj)):
+                for dk, wk in ((0, 1.0-fk), (1, fk)):
+                    result += (wi*wj*wk)[:,None] * self.interpArr[i+di, j+dj, k+dk, :]
+        result[:,I_PCOVPE] = 10.0**result[:,I_PCOVPE]
+
+        return dict( [(name, result[:,n].reshape(shape)) for n,name in enumerate(TABLE_VALUE_L)] )
+
+    def estimate_error(self, max_samples=200, seed=0):
+        """
+        Compare interpolated values with direct CEA at the centers of (up to max_samples)
+        randomly chosen grid cells.  Sets and returns self.errorD (index=value name,
+        value=max relative error).
+        """
+        ceaObj = CachedCEA_Obj(oxName=self.oxName, fuelName=self.fuelName)
+        nP, nM, nE = len(self.PcArr)-1, len(self.MRArr)-1, len(self.epsArr)-1
+        n_cells = nP * nM * nE
+
+        rng = np.random.RandomState( seed )
+        cellL = rng.choice( n_cells, size=min(n_cells, max_samples), replace=False )
+
+        maxErrL = [0.0] * len(TABLE_VALUE_L)
+        for cell in cellL:
+            i, rem = divmod( int(cell), nM*nE )
+            j, k = divmod( rem, nE )
+            Pc = (self.PcArr[i] * self.PcArr[i+1])**0.5
+            MR = (self.MRArr[j] + self.MRArr[j+1]) / 2.0
+            eps = (self.epsArr[k] * self.epsArr[k+1])**0.5
+
+            ceaL = get_cea_values( ceaObj, Pc, MR, eps )
+            tableL = self( Pc, MR, eps )
+            for n, (vc, vt) in enumerate( zip(ceaL, tableL) ):
+                if abs(vc) > 0.0:
+                    maxErrL[n] = max( maxErrL[n], abs(vt - vc) / abs(vc) )
+
+        self.errorD = dict( zip(TABLE_VALUE_L, maxErrL) )
+        return self.errorD
+
+    def get_error_str(self):
+        """Return string describing the interpolation error estimate."""
+        if not self.errorD:
+            return '%s/%s CEA_Table: no error estimate'%(self.oxName, self.fuelName)
+        sL = ['%s/%s CEA_Table max interpolation error vs CEA:'%(self.oxName, self.fuelName)]
+        for name in TABLE_VALUE_L:
+            sL.append( '    %-9s %.4f %%'%(name, 100.0*self.errorD[name]) )
+        return '\n'.join( sL )
+
+    def save(self, npz_file):
+        """Save table to compressed numpy file."""
+        errArr = np.array( [self.errorD.get(name, -1.0) for name in TABLE_VALUE_L] )
+        np.savez_compressed( npz_file, oxName=self.oxName, fuelName=self.fuelName,
+                             PcArr=self.PcArr, MRArr=self.MRArr, epsArr=self.epsArr,
+                             valueArr=self.valueArr, errArr=errArr )
+
+    @classmethod
+    def load(cls, npz_file):
+        """Return CEA_Table read from compressed numpy file."""
+        with np.load( npz_file ) as data:
+            table = cls( str(data['oxName']), str(data['fuelName']),
+                         data['PcArr'], data['MRArr'], data['epsArr'], valueArr=data['valueArr'] )
+            errArr = data['errArr']
+
+        if np.all( errArr >= 0.0 ):
+            table.errorD = dict( zip(TABLE_VALUE_L, [float(e) for e in errArr]) )
+        return table
+
+def get_cea_values( ceaObj, Pc, MR, eps ):
+    """Return list of TABLE_VALUE_L from CEA (ceaObj is a CachedCEA_Obj)."""
+    state = ceaObj.get_state( Pc=Pc, MR=MR, eps=eps)
+    return [getattr(state, name) for name in TABLE_VALUE_L]
+
+def build_cea_table( oxName, fuelName, PcMin=100.0, PcMax=1000.0, NPc=10,
+                     MRmin=1.0, MRmax=3.0, NMR=41, epsMin=5.0, epsMax=200.0, Neps=15,
+                     npz_file=None, estimate_error=True):
+    """
+    Return a CEA_Table on a grid of log-spaced Pc, linear-spaced MR and log-spaced eps.
+    If npz_file exists and holds the same propellants and grid, the table is loaded from it.
+    Otherwise the table is built from CEA and saved to npz_file (if given).
+
+    :param oxName: name of oxidizer (e.g. N2O4, LOX)
+    :param fuelName: name of fuel (e.g. MMH, LH2)
+    :param PcMin: psia, minimum chamber pressure of grid
+    :param PcMax: psia, maximum chamber pressure of grid
+    :param NPc: number of chamber pressures in grid
+    :param MRmin: minimum mixture ratio of grid
+    :param MRmax: maximum mixture ratio of grid
+    :param NMR: number of mixture ratios in grid
+    :param epsMin: minimum area ratio of grid
+    :param epsMax: maximum area ratio of grid
+    :param Neps: number of area ratios in grid
+    :param npz_file: name of compressed numpy file to load from or save to
+    :param estimate_error: flag to estimate interpolation error of a newly built table
+    :return: CEA_Table object
+    :rtype: CEA_Table
+    """
+    PcArr = np.geomspace( PcMin, PcMax, NPc )
+    MRArr = np.linspace( MRmin, MRmax, NMR )
+    epsArr = np.geomspace( epsMin, epsMax, Neps )
+
+    if npz_file is not None and os.path.isfile( npz_file ):
+        table = CEA_Table.load( npz_file )
+        if table.oxName == oxName and table.fuelName == fuelName and \
+           table.PcArr.shape == PcArr.shape and np.allclose(table.PcArr, PcArr) and \
+           table.MRArr.shape == MRArr.shape and np.allclose(table.MRArr, MRArr) and \
+           table.epsArr.shape == epsArr.shape and np.allclose(table.epsArr, epsArr):
+            return table
+
+    table = CEA_Table( oxName, fuelName, PcArr, MRArr, epsArr )
+    if estimate_error:
+        table.estimate_error()
+
+    if npz_file is not None:
+        table.save( npz_file )
+    return table
+
+
+if __name__ == '__main__':
+    import time
+
+    t0 = time.time()
+    table = build_cea_table('N2O4', 'MMH', PcMin=100, PcMax=1000, NPc=6, MRmin=1.2, MRmax=2.6, NMR=15,
+                            epsMin=10, epsMax=200, Neps=8)
+    print( 'built table in %.2f sec'%(time.time() - t0) )
+    print( table.get_error_str() )
+
+    t0 = time.time()
+    for _ in range(1000):
+        table(500.0, 1.9, 40.0)
+    print( 'scalar lookup = %.1f microsec'%( 1000.0*(time.time() - t0) ) )
+    print( dict(zip(TABLE_VALUE_L, table(500.0, 1.9, 40.0))) )
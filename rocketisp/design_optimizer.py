@@ -0,0 +1,383 @@
+r"""
+Multi-variable constrained design optimizer for RocketThruster.
+
+Design variables (e.g. MRcore, eps, pcentBell, LchamberInp, pcentFFC, fdPinjOx)
+are given with bounds.  Constraints are given as (output name, "<=" or ">=", value)
+on any output of the thruster (e.g. Ltotal, Twallgas, Pexit) or one of the
+derived outputs in DERIVED_OUTPUT_D (e.g. chug_margin_ox, sep_margin).
+If ThrustLbf is given, every probe is scaled to that thrust (see scale_Rt_to_Thrust).
+
+The optimizer uses SLSQP (from scipy) on variables scaled to the range 0 to 1.
+Every probe goes through one evaluation cache, so the objective, all constraints
+and gradients at the same design share a single thruster evaluation.  The
+finite difference probes of a gradient are independent of each other, so they
+are evaluated together, in parallel processes if n_workers > 1.
+
+For example::
+
+    from rocketisp.design_optimizer import DesignOptimizer
+
+    opt = DesignOptimizer( R, varD={'MRcore':(1.2, 2.4), 'eps':(10.0, 80.0)},
+                           constraintL=[('Ltotal', '<=', 20.0)], ThrustLbf=500.0 )
+    R_opt, historyL = opt.optimize()
+"""
+import copy
+import numpy as np
+from rocketisp.batch_eval import GEOMETRY_INPUT_L, CORE_INPUT_L, THRUSTER_INPUT_L, set_pcentFFC, set_ko
+from rocketisp.thruster_spec import ThrusterSpec
+
+INJECTOR_INPUT_L = ['fdPinjOx', 'fdPinjFuel', 'dpOxInp', 'dpFuelInp', 'elemEm']
+
+DESIGN_VAR_L = GEOMETRY_INPUT_L + CORE_INPUT_L + ['pcentFFC', 'ko'] + INJECTOR_INPUT_L + THRUSTER_INPUT_L
+
+def _get_sep_margin( R ):
+    if R.coreObj.Pamb < 0.000001:
+        return 1000.0 # vacuum... never separated
+    return R.coreObj.Pexit / R.coreObj.Psep
+
+# outputs that are calculated from thruster attributes (index=name, value=function of RocketThruster)
+DERIVED_OUTPUT_D = {'chug_margin_ox':   lambda R: R.injObj.fdPinjOx - R.injObj.fdPinjOxReqd,
+                    'chug_margin_fuel': lambda R: R.injObj.fdPinjFuel - R.injObj.fdPinjFuelReqd,
+                    'sep_margin':       _get_sep_margin}
+
+def set_design_vars( rocketObj, varD ):
+    """Set design variables in varD (index=name, value=value) on rocketObj."""
+    coreObj = rocketObj.coreObj
+    geomObj = rocketObj.geomObj
+
+    # ko is set last, after pcentFFC has added any barrier stream
+    for name, value in sorted( varD.items(), key=lambda item: item[0] == 'ko' ):
+        if name == 'CdThroat' and rocketObj.calc_CdThroat:
+            raise Exception('in DesignOptimizer, CdThroat is replaced by the Cd model (calc_CdThroat is True)')
+        elif name in GEOMETRY_INPUT_L:
+            geomObj.reset_attr( name, value, re_evaluate=False)
+        elif name in CORE_INPUT_L:
+            setattr( coreObj, name, value )
+        elif name in THRUSTER_INPUT_L:
+            setattr( rocketObj, name, value )
+        elif name == 'pcentFFC':
+            set_pcentFFC( coreObj, value )
+        elif name == 'ko':
+            if not set_ko( coreObj, value ):
+                raise Exception('in DesignOptimizer, ko needs a barrier stream (pcentFFC > 0)')
+        elif name in INJECTOR_INPUT_L and rocketObj.injObj is not None:
+            setattr( rocketObj.injObj, name, value )
+        else:
+            raise Exception('in DesignOptimizer, "%s" is not a recognized design variable'%name)
+
+def get_output( rocketObj, name ):
+    """
+    Return output value of rocketObj.
+    name can be in DERIVED_OUTPUT_D, an efficiency (e.g. "effBL") or an attribute of
+    RocketThruster, CoreStream, Geometry, BarrierStream or Injector (searched in that order).
+    """
+    if name in DERIVED_OUTPUT_D:
+        return DERIVED_OUTPUT_D[name]( rocketObj )
+
+    if name.startswith('eff') and name[3:] in rocketObj.coreObj.effObj.effD:
+        return rocketObj.coreObj.effObj( name[3:] )
+
+    coreObj = rocketObj.coreObj
+    for obj in [rocketObj, coreObj, rocketObj.geomObj, coreObj.barrierObj, rocketObj.injObj]:
+        if obj is not None and hasattr(obj, name):
+            return getattr( obj, name )
+    raise Exception('in DesignOptimizer, "%s" is not a recognized output'%name)
+
+def evaluate_design( rocketObj, varD, output_nameL, ThrustLbf=None, Pamb=0.0 ):
+    """
+    Set design variables (varD) on rocketObj, evaluate it and
+    return dictionary of outputs (index=name in output_nameL).
+    """
+    set_design_vars( rocketObj, varD )
+    rocketObj.geomObj.evaluate()
+
+    if not rocketObj.calc_all_eff():
+        rocketObj.coreObj.evaluate() # calc_all_eff made no change, so did not evaluate
+
+    if ThrustLbf is not None:
+        rocketObj.scale_Rt_to_Thrust( ThrustLbf=ThrustLbf, Pamb=Pamb )
+
+    if rocketObj.injObj is not None:
+        # injector elements depend on final flow rates and geometry
+        rocketObj.injObj.calc_element_attr()
+        rocketObj.calc_all_eff()
+
+    return dict( [(name, float(get_output(rocketObj, name))) for name in output_nameL] )
+
+# ........ worker process support (each worker holds its own copy of the thruster)
+_worker_stateD = {}
+
+def _init_worker( spec, output_nameL, ThrustLbf, Pamb ):
+    _worker_stateD['args'] = (spec.build(), output_nameL, ThrustLbf, Pamb)
+
+def _evaluate_in_worker( varD ):
+    rocketObj, output_nameL, ThrustLbf, Pamb = _worker_stateD['args']
+    return evaluate_design( rocketObj, varD, output_nameL, ThrustLbf=ThrustLbf, Pamb=Pamb )
+
+
+class DesignOptimizer(object):
+    """
+    Find design variables of a RocketThruster that maximize (or minimize) an
+    objective subject to bounds and constraints.
+
+    :param rocketObj: RocketThruster to optimize (a copy is optimized, rocketObj is unchanged)
+    :param varD: design variables (index=name, value=(lower bound, upper bound)), see DESIGN_VAR_L
+    :param constraintL: list of constraints (output name, "<=" or ">=", value)
+    :param objective: name of output to optimize
+    :param maximize: flag to maximize (True) or minimize (False) objective
+    :param ThrustLbf: lbf, if not None, scale throat to give ThrustLbf at Pamb for every probe
+    :param Pamb: psia, ambient pressure for ThrustLbf
+    :param n_workers: number of processes used to evaluate independent probes (1=no parallel)
+    :param fd_step: finite difference step for gradients (fraction of variable range)
+    :type rocketObj: RocketThruster
+    :type varD: dict
+    :type constraintL: list
+    :type objective: str
+    :type maximize: bool
+    :type ThrustLbf: float
+    :type Pamb: float
+    :type n_workers: int
+    :type fd_step: float
+    :return: DesignOptimizer object
+    :rtype: DesignOptimizer
+    """
+
+    def __init__(self, rocketObj, varD, constraintL=None, objective='IspDel', maximize=True,
+                 ThrustLbf=None, Pamb=0.0, n_workers=1, fd_step=0.005):
+
+        self.rocketObj = copy.deepcopy( rocketObj )
+        self.var_nameL = list( varD.keys() )
+        self.loArr = np.array( [varD[name][0] for name in self.var_nameL], dtype=np.float64 )
+        self.hiArr = np.array( [varD[name][1] for name in self.var_nameL], dtype=np.float64 )
+
+        for name in self.var_nameL:
+            if name not in DESIGN_VAR_L:
+                raise Exception('in DesignOptimizer, "%s" is not a recognized design variable'%name)
+        if np.any( self.hiArr <= self.loArr ):
+            raise Exception('in DesignOptimizer, upper bounds must be greater than lower bounds')
+
+        self.constraintL = []
+        for name, op, value in (constraintL or []):
+            if op not in ('<=', '>='):
+                raise Exception('in DesignOptimizer, constraint operator must be "<=" or ">=", not "%s"'%op)
+            self.constraintL.append( (name, op, float(value)) )
+
+        self.objective = objective
+        self.maximize = maximize
+        self.ThrustLbf = ThrustLbf
+        self.Pamb = Pamb
+        self.n_workers = n_workers
+        self.fd_step = fd_step
+
+        self.output_nameL = [objective] + [c[0] for c in self.constraintL if c[0] != objective]
+        self.output_nameL = sorted( set(self.output_nameL), key=self.output_nameL.index )
+
+        self.evalD = {}      # index=tuple of design variable values, value=dict of outputs
+        self.historyL = []   # evaluation history, list of dict (variables and outputs) in order evaluated
+        self.n_cache_hits = 0
+        self.pool = None
+        self.warningL = []
+
+    def get_varD(self, xArr):
+        """Return dictionary of design variables for scaled variables xArr (0 to 1)."""
+        valArr = self.loArr + np.clip(xArr, 0.0, 1.0) * (self.hiArr - self.loArr)
+        return dict( zip(self.var_nameL, valArr.tolist()) )
+
+    def get_xArr(self, varD):
+        """Return scaled variables (0 to 1) for dictionary of design variables."""
+        valArr = np.array( [varD[name] for name in self.var_nameL], dtype=np.float64 )
+        return (valArr - self.loArr) / (self.hiArr - self.loArr)
+
+    def evaluate_list(self, xL):
+        """
+        Return list of output dictionaries for list of scaled variable arrays.
+        Designs not already in the evaluation cache are evaluated together (in parallel if n_workers > 1).
+        """
+        keyL = [tuple(self.get_varD(xArr).values()) for xArr in xL]
+
+        new_keyL = []
+        for key in keyL:
+            if key in self.evalD or key in new_keyL:
+                self.n_cache_hits += 1
+            else:
+                new_keyL.append( key )
+
+        varL = [dict(zip(self.var_nameL, key)) for key in new_keyL]
+        if self.pool is not None and len(varL) > 1:
+            outL = self.pool.map( _evaluate_in_worker, varL )
+        else:
+            outL = [evaluate_design( self.rocketObj, varD, self.output_nameL,
+                                     ThrustLbf=self.ThrustLbf, Pamb=self.Pamb ) for varD in varL]
+
+        for key, varD, outD in zip(new_keyL, varL, outL):
+            self.evalD[key] = outD
+            histD = dict( varD )
+            histD.update( outD )
+            histD['feasible'] = self.get_max_violation( outD ) <= 0.0
+            self.historyL.append( histD )
+
+        return [self.evalD[key] for key in keyL]
+
+    def get_max_violation(self, outD):
+        """Return largest constraint violation (relative to constraint value, <= 0 if feasible)."""
+        violation = -1.0
+        for name, op, value in self.constraintL:
+            violation = max( violation, -self.get_constraint_value(outD[name], op, value) )
+        return violation
+
+    def get_constraint_value(self, output, op, value):
+        """Return scaled constraint value (>= 0 when constraint is satisfied)."""
+        scale = max( abs(value), 1.0E-6 )
+        if op == '<=':
+            return (value - output) / scale
+        return (output - value) / scale
+
+    def get_funcs(self, outD):
+        """Return (scaled objective to minimize, array of scaled constraint values)."""
+        f = outD[self.objective] / self.obj_scale
+        if self.maximize:
+            f = -f
+        gArr = np.array( [self.get_constraint_value(outD[name], op, value)
+                          for name, op, value in self.constraintL] )
+        return f, gArr
+
+    def get_derivs(self, xArr):
+        """Return (f, gArr, gradient of f, jacobian of gArr) by forward differences."""
+        xL = [np.array(xArr)]
+        for i in range( len(xArr) ):
+            xp = np.array( xArr )
+            # step away from upper bound
+            if xp[i] + self.fd_step <= 1.0:
+                xp[i] += self.fd_step
+            else:
+                xp[i] -= self.fd_step
+            xL.append( xp )
+        outL = self.evaluate_list( xL )
+
+        f0, g0 = self.get_funcs( outL[0] )
+        dfArr = np.zeros( len(xArr) )
+        dgArr = np.zeros( (len(self.constraintL), len(xArr)) )
+        for i, outD in enumerate( outL[1:] ):
+            h = np.clip(xL[i+1][i], 0.0, 1.0) - np.clip(xArr[i], 0.0, 1.0)
+            f, g = self.get_funcs( outD )
+            dfArr[i] = (f - f0) / h
+            if len(g):
+                dgArr[:, i] = (g - g0) / h
+        return f0, g0, dfArr, dgArr
+
+    def optimize(self, x0D=None, max_iter=50, ftol=1.0E-6):
+        """
+        Run optimizer and return (optimum RocketThruster, evaluation history).
+        Starting design is x0D (index=name, value=value) or the current values of the thruster.
+
+        :param x0D: starting values of design variables (default is current value of thruster)
+        :param max_iter: maximum number of SLSQP iterations
+        :param ftol: SLSQP convergence tolerance on scaled objective
+        :type x0D: dict
+        :type max_iter: int
+        :type ftol: float
+        :return: (optimum RocketThruster, list of dict of design variables and outputs)
+        :rtype: tuple
+        """
+        from scipy import optimize # import only when needed (slow to import)
+
+        if x0D is None:
+            x0D = {}
+            for name in self.var_nameL:
+                try:
+                    value = get_output( self.rocketObj, name )
+                except Exception:
+                    value = None
+                if value is None:
+                    value = 0.5*(self.varLo(name) + self.varHi(name))
+                x0D[name] = value
+        x0 = np.clip( self.get_xArr( x0D ), 0.0, 1.0 )
+
+        if self.n_workers > 1:
+            import multiprocessing
+            self.pool = multiprocessing.Pool( self.n_workers, initializer=_init_worker,
+                            initargs=(ThrusterSpec.from_thruster( self.rocketObj ), self.output_nameL,
+                                      self.ThrustLbf, self.Pamb) )
+        try:
+            out0 = self.evaluate_list( [x0] )[0]
+            self.obj_scale = max( abs(out0[self.objective]), 1.0E-6 )
+
+            derivD = {} # index=tuple(xArr), value=(f, gArr, dfArr, dgArr)
+            def get_all( xArr ):
+                key = tuple( xArr )
+                if key not in derivD:
+                    derivD[key] = self.get_derivs( xArr )
+                return derivD[key]
+
+            consL = []
+            if self.constraintL:
+                consL.append( {'type':'ineq', 'fun':lambda x: get_all(x)[1], 'jac':lambda x: get_all(x)[3]} )
+
+            sol = optimize.minimize( lambda x: get_all(x)[0], x0, jac=lambda x: get_all(x)[2],
+                                     method='SLSQP', bounds=[(0.0, 1.0)]*len(x0), constraints=consL,
+                                     options={'maxiter':max_iter, 'ftol':ftol} )
+            if not sol.success:
+                self.warningL.append( 'WARNING... optimizer did not converge: %s'%sol.message )
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()
+                self.pool = None
+
+        # best feasible design in history (or least infeasible if none are feasible)
+        best_key = min( self.evalD.keys(), key=lambda k: self.get_rank( self.evalD[k] ) )
+        self.best_varD = dict( zip(self.var_nameL, best_key) )
+
+        R_opt = copy.deepcopy( self.rocketObj )
+        evaluate_design( R_opt, self.best_varD, self.output_nameL, ThrustLbf=self.ThrustLbf, Pamb=self.Pamb )
+        return R_opt, self.historyL
+
+    def get_rank(self, outD):
+        """Return sort key of outputs (feasible designs first, then by objective)."""
+        violation = self.get_max_violation( outD )
+        obj = outD[self.objective]
+        if self.maximize:
+            obj = -obj
+        if violation <= 0.0:
+            return (0.0, obj)
+        return (violation, obj)
+
+    def varLo(self, name):
+        return self.loArr[ self.var_nameL.index(name) ]
+
+    def varHi(self, name):
+        return self.hiArr[ self.var_nameL.index(name) ]
+
+    def get_summ_str(self):
+        """Return summary string of optimum design and evaluation counts."""
+        outD = self.evalD[ tuple(self.best_varD.values()) ]
+        sL = ['DesignOptimizer: %s %s = %g'%('maximize' if self.maximize else 'minimize',
+                                              self.objective, outD[self.objective])]
+        for name in self.var_nameL:
+            sL.append( '  %-14s = %-12g (%g to %g)'%(name, self.best_varD[name],
+                                                     self.varLo(name), self.varHi(name)) )
+        for name, op, value in self.constraintL:
+            sL.append( '  %-14s = %-12g (%s %g)'%(name, outD[name], op, value) )
+        sL.append( '  evaluations = %i, cache hits = %i'%(len(self.evalD), self.n_cache_hits) )
+        sL.extend( self.warningL )
+        return '\n'.join( sL )
+
+
+if __name__ == '__main__':
+    from rocketisp.geometry import Geometry
+    from rocketisp.efficiencies import Efficiencies
+    from rocketisp.stream_tubes import CoreStream
+    from rocketisp.rocket_isp import RocketThruster
+
+    geomObj = Geometry(Rthrt=1.0, CR=2.5, eps=40, pcentBell=80, LchmOvrDt=3.0)
+    effObj = Efficiencies()
+    effObj.set_const('ERE', 0.98)
+    coreObj = CoreStream( geomObj, effObj, oxName='N2O4', fuelName='MMH', MRcore=1.6,
+                          Pc=150, pcentFFC=10, Pamb=0.0)
+    R = RocketThruster(name='optimizer demo', coreObj=coreObj)
+
+    opt = DesignOptimizer( R, varD={'MRcore':(1.2, 2.4), 'eps':(10.0, 100.0), 'pcentFFC':(5.0, 20.0)},
+                           constraintL=[('Ltotal', '<=', 25.0), ('Twallgas', '<=', 3500.0)],
+                           ThrustLbf=500.0 )
+    R_opt, historyL = opt.optimize()
+    print( opt.get_summ_str() )
@@ -1,4 +1,5 @@
 from math import sqrt
+import numpy as np
 from rocketisp.model_summ import ModelSummary
 
 class Efficiency:
@@ -148,9 +149,60 @@ class Efficiencies:
             self.effD['Isp'].set_value( effERE * effNoz * self.effD['FFC'].value, '' )
         
         if not self.effD['IspPulsing'].is_const:
-            self.effD['IspPulsing'].set_value( self.effD['Isp'].value * self.effD['Pulse'].value, 
+            self.effD['IspPulsing'].set_value( self.effD['Isp'].value * self.effD['Pulse'].value,
                                                self['Pulse'].value_src )
 
+    def evaluate_arr(self, **effArrD):
+        """
+        Array version of evaluate. effArrD holds arrays of efficiency values
+        (index=eff name, e.g. ERE=ereArr, Div=divArr), any efficiency not in effArrD
+        uses its current value. A consolidated efficiency in effArrD (e.g. ERE) is
+        used in place of the product of its individual efficiencies.
+        The Efficiency objects are not changed.
+
+        Return dictionary of arrays of consolidated efficiencies (index=Noz, ERE, Isp, IspPulsing).
+        """
+        for name in effArrD.keys():
+            if name not in self.effD:
+                raise Exception('in Efficiencies, "%s" is not recognized as an efficiency'%name)
+
+        def get_value( name ):
+            if name in effArrD:
+                return np.asarray( effArrD[name], dtype=np.float64 )
+            return self.effD[name].value
+
+        def is_fixed( name ):
+            return name in effArrD or self.effD[name].is_const
+
+        if is_fixed('Isp'):
+            effNoz = get_value('Noz')
+            effERE = get_value('ERE')
+            effIsp = get_value('Isp')
+        else:
+            if is_fixed('Noz'):
+                effNoz = get_value('Noz')
+            else:
+                effNoz = 1.0
+                for name in self.nozzleL: # ['Div','Kin','BL','TP']
+                    effNoz = effNoz * get_value(name)
+
+            if is_fixed('ERE'):
+                effERE = get_value('ERE')
+            else:
+                effERE = 1.0
+                for name in self.chamberL: #  ['Mix','Em','Vap','HL']
+                    effERE = effERE * get_value(name)
+
+            effIsp = effERE * effNoz * get_value('FFC')
+
+        if is_fixed('IspPulsing'):
+            effIspPulsing = get_value('IspPulsing')
+        else:
+            effIspPulsing = effIsp * get_value('Pulse')
+
+        arrL = np.broadcast_arrays( effNoz, effERE, effIsp, effIspPulsing )
+        return dict( zip(['Noz', 'ERE', 'Isp', 'IspPulsing'], [np.array(arr, dtype=np.float64) for arr in arrL]) )
+
     def summ_print(self):
         """
         print to standard output, the current state of Efficiencies instance.
@@ -1,82 +1,142 @@
-
-import os, sys
+import warnings
+import weakref
 import importlib
+from importlib.util import find_spec
 from rocketisp.efficiency.get_elements import get_ox_fuel_groupname
 
 """
 Import the appropriate fracKin file from the subdirectory fracKinODK and call it.
 First look for group (e.g. CHO or CHNO) if not found use calc_All_fracKin.
+
+Kinetic modules are cached by element group name (at most one module per group).
+CEA objects are only held by weak reference, so discarded CEA objects do not
+accumulate in the cache.
 """
 
-here = os.path.abspath(os.path.dirname(__file__))
+KIN_PACKAGE = 'rocketisp.efficiency.fracKinODK'
+
+module_by_groupD = {} # index=group name (e.g. CHNO), value=kin_module
+group_by_propD = {}   # index=(oxName, fuelName), value=group name of kin_module
 
-kin_dir = os.path.join( here, 'fracKinODK' )
-if kin_dir not in sys.path[:2]:
-    sys.path.insert(0, kin_dir)
+# index=ceaObj (weak reference), value=(oxName, fuelName, kin_module)
+module_by_ceaObjD = weakref.WeakKeyDictionary()
+
+def get_kin_group_module( groupName ):
+    """
+    Return (groupName, kin_module) for element group name (e.g. CHNO).
+    If there is no model for groupName, return the "All" model.
+    """
+    try:
+        return groupName, module_by_groupD[ groupName ]
+    except KeyError:
+        pass
 
-module_by_idD = {} # index = id(ceaObj), value=kin_module
+    kin_module_name = '%s.calc_%s_fracKin'%(KIN_PACKAGE, groupName)
+    if find_spec( kin_module_name ) is None:
+        warnings.warn('no fracKin model for group "%s"... using group "All"'%groupName)
+        return get_kin_group_module( 'All' )
+
+    kin_module = importlib.import_module( kin_module_name )
+    module_by_groupD[ groupName ] = kin_module
+
+    return groupName, kin_module
 
 def get_kin_module( ceaObj ):
+    """Return fracKin module for the oxidizer and fuel of ceaObj."""
+
+    try:
+        oxName, fuelName, kin_module = module_by_ceaObjD[ ceaObj ]
+        if oxName == ceaObj.oxName and fuelName == ceaObj.fuelName:
+            return kin_module
+    except (KeyError, TypeError):
+        pass
 
-    groupName = get_ox_fuel_groupname( ceaObj.oxName, ceaObj.fuelName )
-    
+    prop_key = (ceaObj.oxName, ceaObj.fuelName)
     try:
-        kin_module_name = 'calc_%s_fracKin'%groupName
-        #print('group Name: "%s"'%groupName, '    kin_module_name=',kin_module_name)
-        kin_module = importlib.import_module(kin_module_name)
-    except:
-        print('WARNING... Import of group "%s" failed... using group "All"'%groupName)
-        kin_module_name = 'calc_All_fracKin'
-        print('group Name: "All"', '    kin_module_name=',kin_module_name)
-        kin_module = importlib.import_module(kin_module_name)
-    
-    # add kin_module to module_by_idD
-    module_by_idD[ id(ceaObj) ] = kin_module
-    
+        kin_module = module_by_groupD[ group_by_propD[prop_key] ]
+    except KeyError:
+        groupName, kin_module = get_kin_group_module( get_ox_fuel_groupname( *prop_key ) )
+        group_by_propD[ prop_key ] = groupName
+
+    try:
+        module_by_ceaObjD[ ceaObj ] = (ceaObj.oxName, ceaObj.fuelName, kin_module)
+    except TypeError:
+        pass # ceaObj does not support weak references
+
     return kin_module
 
+def preload_kin_models( *itemL ):
+    """
+    Import kinetic modules and load their model weights ahead of time.
+    Each item can be an element group name (e.g. "CHNO") or a CEA object.
+    Return list of the group names that were loaded.
+    """
+    loadedL = []
+    for item in itemL:
+        if isinstance(item, str):
+            groupName, kin_module = get_kin_group_module( item )
+        else:
+            kin_module = get_kin_module( item )
+            groupName = group_by_propD[ (item.oxName, item.fuelName) ]
+
+        if not kin_module.mlp_model.is_loaded():
+            kin_module.mlp_model.load()
+        if groupName not in loadedL:
+            loadedL.append( groupName )
+
+    return loadedL
+
+def get_cached_kin_groups():
+    """Return sorted list of element group names with imported kinetic modules."""
+    return sorted( module_by_groupD.keys() )
+
 
 def calc_IspODK(ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5):
-    
-    # if already have kin_module imported, use it... otherwise import it now
-    try:
-        kin_module = module_by_idD[ id(ceaObj) ]
-    except:
-        kin_module = get_kin_module( ceaObj )
-    
+
+    kin_module = get_kin_module( ceaObj )
+
     return kin_module.calc_IspODK(ceaObj, Pc=Pc, eps=eps, Rthrt=Rthrt, pcentBell=pcentBell, MR=MR)
 
 
 def calc_fracKin(ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5):
-    
-    # if already have kin_module imported, use it... otherwise import it now
-    try:
-        kin_module = module_by_idD[ id(ceaObj) ]
-    except:
-        kin_module = get_kin_module( ceaObj )
+
+    kin_module = get_kin_module( ceaObj )
 
     return kin_module.calc_fracKin(ceaObj, Pc=Pc, eps=eps, Rthrt=Rthrt, pcentBell=pcentBell, MR=MR)
 
 
+def calc_IspODK_arr(ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5):
+    """Array version of calc_IspODK (inputs are broadcast against each other)."""
+
+    kin_module = get_kin_module( ceaObj )
+
+    return kin_module.calc_IspODK_arr(ceaObj, Pc=Pc, eps=eps, Rthrt=Rthrt, pcentBell=pcentBell, MR=MR)
+
+
+def calc_fracKin_arr(ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5):
+    """Array version of calc_fracKin (inputs are broadcast against each other)."""
+
+    kin_module = get_kin_module( ceaObj )
+
+    return kin_module.calc_fracKin_arr(ceaObj, Pc=Pc, eps=eps, Rthrt=Rthrt, pcentBell=pcentBell, MR=MR)
+
+
 if __name__ == "__main__":
     from rocketcea.cea_obj import CEA_Obj
-    
+
     ceaObj = CEA_Obj(oxName='N2O4', fuelName='MMH')
-    
-    print('module_by_idD =',module_by_idD)
+
+    print('preloaded groups =', preload_kin_models( 'CHO', ceaObj ))
+    print('cached groups =', get_cached_kin_groups())
     print()
-    
+
     IspODK = calc_IspODK(ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5)
     print('IspODK = ', IspODK)
     print()
-    
+
     IspODK = calc_IspODK(ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5)
     fracKin = calc_fracKin(ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5)
     print('IspODK = ', IspODK, '   fracKin=',fracKin)
     print()
-    
-    print('module_by_idD =',module_by_idD)
-    
-
-    
 
+    print('cached groups =', get_cached_kin_groups())
@@ -1,7 +1,8 @@
 from math import cos, pi, log
-from scipy.interpolate import interp1d
+import numpy as np
 from rocketisp.nozzle.six_opt_parab import calcOptEntrance
 from rocketisp.nozzle.nozzle import bell_net_halfAngle
+from rocketisp.nozzle.quad_interp import QuadInterp
 
 """
 Fit Divergence Efficiency from running 6 common propellant combinations
@@ -45,30 +46,102 @@ def eff_div_eles(eps=25.0, pcBell=80.0):
     return effDiv
 
 
-def eff_div( eps=25.0, pcBell=80.0):
+def check_pcBell( pcBell, warningL=None ):
     """
-    Divergence Efficiency from running 6 common propellant combinations
+    Return pcBell clamped to the 60% to 120% range of the divergence efficiency fits.
+    If warningL is a list, a message is appended for an out of range pcBell.
     """
-        
     if pcBell<60.0 or pcBell>120.0:
-        print('WARNING... Divergence Efficiency %%Bell Range is 60%% to 120%%, %g was input'%pcBell)
-        pcBell = max(60, min(120, pcBell))
-        print('    ...Looking up Divergence Efficiency Values for %%Bell = %g'%pcBell)
+        if warningL is not None:
+            warningL.append( 'Divergence Efficiency %%Bell Range is 60%% to 120%%, %g was input (%g used)'%\
+                             (pcBell, max(60.0, min(120.0, pcBell))) )
+        pcBell = max(60.0, min(120.0, pcBell))
+    return pcBell
+
+def eff_div( eps=25.0, pcBell=80.0, warningL=None):
+    """
+    Divergence Efficiency from running 6 common propellant combinations.
+    
+    Uses the precomputed (eps, %Bell) surface, effDiv = A - B/eps - C/eps**0.5
+    (see divSurfaceL). pcBell is clamped to 60 to 120, if warningL is a list, 
+    an out of range message is appended to it.
+    """
+    pcBell = check_pcBell( pcBell, warningL=warningL )
+    
+    i = 0
+    while i < 3 and pcBell > divBreakL[i+1]:
+        i += 1
+    dp = pcBell - divBreakL[i]
+    
+    (a0,a1,a2), (b0,b1,b2), (c0,c1,c2) = divSurfaceL[i]
+    return (a0 + dp*(a1 + dp*a2)) - (b0 + dp*(b1 + dp*b2))/eps - (c0 + dp*(c1 + dp*c2))/eps**0.5
+
+def eff_div_arr( epsArr, pcBellArr, warningL=None):
+    """
+    Array version of eff_div, epsArr and pcBellArr are broadcast together.
+    pcBell values outside of 60 to 120 are clamped, if warningL is a list, 
+    one message giving the number of out of range values is appended to it.
+    """
+    epsArr, pcBellArr = np.broadcast_arrays( np.asarray(epsArr, dtype=np.float64),
+                                             np.asarray(pcBellArr, dtype=np.float64) )
+    n_out = np.count_nonzero( (pcBellArr < 60.0) | (pcBellArr > 120.0) )
+    if n_out and warningL is not None:
+        warningL.append( 'Divergence Efficiency %%Bell Range is 60%% to 120%%, %i values were clamped'%n_out )
+    pcBellArr = np.clip( pcBellArr, 60.0, 120.0 )
     
-    effL = [bf(eps) for bf in pcBellFuncL]
-    return interp1d( pcentBellL , effL, kind=2, fill_value="extrapolate")( pcBell )
+    iArr = np.clip( np.searchsorted( divBreakArr, pcBellArr, side='left' ) - 1, 0, 3 )
+    dp = pcBellArr - divBreakArr[iArr]
+    cArr = divSurfaceArr[iArr] # shape=(..., 3, 3)
+    
+    A, B, C = [cArr[...,j,0] + dp*(cArr[...,j,1] + dp*cArr[...,j,2]) for j in range(3)]
+    return A - B/epsArr - C/np.sqrt(epsArr)
 
 pcentBellL = [60., 70., 80., 90., 100., 120.]
 
 # curve fits of divergence efficiency for %Bell from 60 to 120 as function of area ratio.
-pcBell120 = lambda x: 0.9997896193436784 - 0.00836547101429648/x - 1.8072678278328226e-08/x**.5
-pcBell100 = lambda x: 0.9989509055092716 - 0.027302115360697286/x - 2.227978789532209e-08/x**.5
-pcBell90 = lambda x: 0.9971299043689117 - 0.03820495281446622/x - 2.591748813286344e-08/x**.5
-pcBell80 = lambda x: 0.9941974506864701 - 0.06403015875188575/x - 1.7996764332283723e-08/x**.5
-pcBell70 = lambda x: 0.9880774081200867 - 0.09006900924820571/x - 0.00018544403669973342/x**.5
-pcBell60 = lambda x: 0.9795420864904427 - 0.0981313348710805/x - 0.02104281165829153/x**.5
+#   effDiv = a - b/x - c/x**0.5  (coefficients are (a, b, c) for each %Bell in pcentBellL)
+pcBellCoefL = [(0.9795420864904427, 0.0981313348710805, 0.02104281165829153),
+               (0.9880774081200867, 0.09006900924820571, 0.00018544403669973342),
+               (0.9941974506864701, 0.06403015875188575, 1.7996764332283723e-08),
+               (0.9971299043689117, 0.03820495281446622, 2.591748813286344e-08),
+               (0.9989509055092716, 0.027302115360697286, 2.227978789532209e-08),
+               (0.9997896193436784, 0.00836547101429648, 1.8072678278328226e-08)]
+
+def make_pcBell_func( a, b, c ):
+    """Return curve fit function of area ratio, effDiv = a - b/x - c/x**0.5"""
+    return lambda x: a - b/x - c/x**.5
+
+pcBellFuncL = [make_pcBell_func(a, b, c) for (a, b, c) in pcBellCoefL]
+pcBell60, pcBell70, pcBell80, pcBell90, pcBell100, pcBell120 = pcBellFuncL
+
+def build_div_surface( xL=pcentBellL, coefL=pcBellCoefL ):
+    """
+    Return (divBreakL, divSurfaceL), the divergence efficiency surface effDiv = A - B/eps - C/eps**0.5
+    
+    The quadratic spline through the %Bell curve fits (same as scipy interp1d kind=2) is 
+    linear in the curve values, so A, B and C are quadratics in (pcBell - divBreakL[i]) 
+    on each spline interval i.  divSurfaceL holds [[A0,A1,A2], [B0,B1,B2], [C0,C1,C2]] 
+    for each interval.
+    """
+    qi = QuadInterp( xL )
+    abcArr = qi.invArr @ np.array( coefL, dtype=np.float64 ) # spline coefficients of a, b and c
+    
+    breakArr = np.unique( qi.tArr )
+    divSurfaceL = []
+    for i in range( len(breakArr) - 1 ):
+        # quadratic on interval i from spline values at start, middle and end of interval
+        dpArr = np.array( [0.0, 0.5, 1.0] ) * (breakArr[i+1] - breakArr[i])
+        valArr = qi.get_basis( breakArr[i] + dpArr ) @ abcArr # shape=(3 points, 3 of a,b,c)
+        polyArr = np.linalg.solve( np.vander( dpArr, 3, increasing=True ), valArr )
+        divSurfaceL.append( polyArr.T.tolist() )
+    
+    return breakArr.tolist(), divSurfaceL
+
+# Divergence efficiency surface, built once at import
+divBreakL, divSurfaceL = build_div_surface()
 
-pcBellFuncL = [pcBell60, pcBell70, pcBell80, pcBell90, pcBell100, pcBell120]
+divBreakArr = np.array( divBreakL )
+divSurfaceArr = np.array( divSurfaceL )
 
 if __name__ == "__main__": #Self Test
     import pylab
@@ -111,7 +184,8 @@ if __name__ == "__main__": #Self Test
     
     print('eff_div_eles(eps=25.0, pcBell=80.0) =', eff_div_eles(eps=25.0, pcBell=80.0))
     print('eff_div_eles(eps=10.0, pcBell=80.0) =', eff_div_eles(eps=10.0, pcBell=80.0))
-    print('eff_div( eps=25.0, pcBell=55.0) =', eff_div( eps=25.0, pcBell=55.0))
+    warningL = []
+    print('eff_div( eps=25.0, pcBell=55.0) =', eff_div( eps=25.0, pcBell=55.0, warningL=warningL), warningL)
     print('eff_div_cone_eps_bell( eps=25.0, pcBell=80.0, Rd=1.0) =', eff_div_cone_eps_bell( eps=25.0, pcBell=80.0, Rd=1.0))
     
     if do_show:
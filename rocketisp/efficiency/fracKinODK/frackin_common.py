@@ -0,0 +1,113 @@
+r"""
+Shared CEA input conditioning and evaluation for the fracKin kinetics models.
+
+Every calc_<group>_fracKin.py module in this folder holds an MLP model of
+fracKin (the fraction of the way from frozen Isp to equilibrium Isp, i.e.
+IspODK = IspODF + fracKin*(IspODE-IspODF)) for one element group.  The models
+differ only in their npz weights file and in the list of species whose chamber
+mass fractions are model inputs, so each module creates a FracKinModel
+and wraps its methods.
+
+For example::
+
+    fracKinModel = FracKinModel( os.path.join( here, 'calc_HO_fracKin.npz'), speciesL )
+    fracKin = fracKinModel.calc_fracKin(ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=6)
+"""
+import numpy as np
+from rocketisp.mlp_model import get_mlp_model
+
+def get_input_arrays( Pc, eps, Rthrt, pcentBell, MR ):
+    """Return broadcast shape and list of flat float arrays of Pc, eps, Rthrt, pcentBell, MR."""
+    arrL = np.broadcast_arrays( *[np.asarray(v, dtype=np.float64) for v in (Pc, eps, Rthrt, pcentBell, MR)] )
+    return arrL[0].shape, [a.ravel() for a in arrL]
+
+class FracKinModel(object):
+    """
+    fracKin MLP model of one element group.
+
+    :param npz_filename: path to npz file of model weights
+    :param speciesL: names of species whose chamber mass fractions are model inputs
+    :type npz_filename: str
+    :type speciesL: list
+    :return: FracKinModel object
+    :rtype: FracKinModel
+    """
+
+    def __init__(self, npz_filename, speciesL):
+        # weights are loaded on first use
+        self.mlp_model = get_mlp_model( npz_filename )
+        self.speciesL = speciesL
+
+    def get_cea_inputs(self, ceaObj, Pc=500, MR=1.5, eps=20):
+        """Return list of conditioned model inputs from CEA (gammaInit, TcCham, MolWt and species)."""
+
+        massWtD, masseFracD = ceaObj.get_SpeciesMassFractions( Pc=Pc, MR=MR, eps=eps,
+                                frozen=0, frozenAtThroat=0, min_fraction=0.000005)
+
+        _, _, TcCham, MolWt, gammaInit = ceaObj.get_IvacCstrTc_ChmMwGam( Pc=Pc, MR=MR, eps=eps)
+
+        inpL = [(gammaInit-1.1)/0.57, TcCham/7000.0, MolWt/30.0]
+        for sp in self.speciesL:
+            vL = masseFracD.get( sp, [0.,0.] )
+            inpL.append( vL[1] ) # chamber mass frac for species
+        return inpL
+
+    def calc_IspODK(self, ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5):
+        """Return kinetic Isp (IspODK) from fracKin model."""
+        return float( self.calc_IspODK_arr(ceaObj, Pc=Pc, eps=eps, Rthrt=Rthrt, pcentBell=pcentBell, MR=MR) )
+
+    def calc_fracKin(self, ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5):
+        """Return fracKin from model."""
+        return float( self.calc_fracKin_arr(ceaObj, Pc=Pc, eps=eps, Rthrt=Rthrt, pcentBell=pcentBell, MR=MR) )
+
+    def calc_IspODK_arr(self, ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5):
+        """Array version of calc_IspODK (inputs are broadcast against each other)."""
+
+        shape, (Pc, eps, Rthrt, pcentBell, MR) = get_input_arrays( Pc, eps, Rthrt, pcentBell, MR )
+        fracKin = self.calc_fracKin_arr(ceaObj, Pc=Pc, eps=eps, Rthrt=Rthrt, pcentBell=pcentBell, MR=MR)
+
+        IspODE = np.empty( len(Pc) )
+        IspODF = np.empty( len(Pc) )
+        ispD = {} # index=(Pc, MR, eps), value=(IspODE, IspODF)
+        for i in range( len(Pc) ):
+            key = (Pc[i], MR[i], eps[i])
+            if key not in ispD:
+                ispD[key] = (ceaObj.get_IvacCstrTc( Pc=Pc[i], MR=MR[i], eps=eps[i])[0],
+                             ceaObj.getFrozen_IvacCstrTc( Pc=Pc[i], MR=MR[i], eps=eps[i], frozenAtThroat=0)[0])
+            IspODE[i], IspODF[i] = ispD[key]
+
+        IspODK = IspODF + fracKin*(IspODE-IspODF)
+        return IspODK.reshape( shape )
+
+    def calc_fracKin_arr(self, ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=1.5):
+        """
+        Array version of calc_fracKin (inputs are broadcast against each other).
+        CEA inputs are found once for each unique (Pc, MR, eps) and the model
+        is evaluated for all points in a single pass.
+        """
+
+        shape, (Pc, eps, Rthrt, pcentBell, MR) = get_input_arrays( Pc, eps, Rthrt, pcentBell, MR )
+
+        # condition Pc, eps, Rthrt, pcentBell, then gammaInit, TcCham, MolWt and species from CEA
+        X = np.empty( (len(Pc), 7 + len(self.speciesL)) )
+        X[:,0] = np.log10(Pc)/4.0
+        X[:,1] = np.log10(eps)/3.0
+        X[:,2] = (2.0 + np.log10(Rthrt))/4.0
+        X[:,3] = (pcentBell - 60)/60.0
+
+        ceaD = {} # index=(Pc, MR, eps), value=list of conditioned CEA inputs
+        for i in range( len(Pc) ):
+            key = (Pc[i], MR[i], eps[i])
+            if key not in ceaD:
+                ceaD[key] = self.get_cea_inputs(ceaObj, Pc=Pc[i], MR=MR[i], eps=eps[i])
+            X[i,4:] = ceaD[key]
+
+        return self.predict_arr( X ).reshape( shape )
+
+    def predict(self, X):
+        """Return model output for last row of X."""
+        return self.predict_arr( X )[-1]
+
+    def predict_arr(self, X):
+        """Return 1D array of model outputs, one for each row of X."""
+        return np.clip( self.mlp_model.predict_arr( X ), 0.0, 1.0 )
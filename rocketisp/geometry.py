@@ -25,6 +25,17 @@ def maybe_show_ft( val ):
         s = ''
     return s
 
+# Geometry inputs that change the shape of the dimensionless nozzle contour
+NOZ_SHAPE_INPUT_L = ['CR', 'eps', 'pcentBell', 'LnozInp', 'RupThroat', 'RdwnThroat', 
+                     'RchmConv', 'cham_conv_deg']
+
+# Geometry inputs that only change the size of the nozzle contour (see Nozzle.set_abs_Rt)
+#  (if LnozInp is input, Rthrt also changes pcentBell and is shape-affecting)
+NOZ_SCALE_INPUT_L = ['Rthrt']
+
+# Geometry inputs that the nozzle contour does not use
+NOZ_UNUSED_INPUT_L = ['LchmOvrDt', 'LchmMin', 'LchamberInp']
+
 
 class Geometry:
     """
@@ -91,6 +102,8 @@ class Geometry:
         self.LchamberInp   = LchamberInp
         
         self.nozObj        = None # only instantiated if needed.
+        self.nozzle_build_count   = 0 # number of times nozzle contour was built
+        self.nozzle_rescale_count = 0 # number of times nozzle contour was rescaled to new Rthrt
         
         # get input descriptions and units from doc string
         self.inp_descD, self.inp_unitsD, self.is_inputD = get_desc_and_units( self.__doc__ )
@@ -98,15 +111,26 @@ class Geometry:
         self.evaluate()
         
     def reset_attr(self, name, value, re_evaluate=True):
-        """Resets Geometry object attribute by name if that attribute already exists."""
+        """
+        Resets Geometry object attribute by name if that attribute already exists.
+        Only a change to a shape-affecting input discards the nozzle contour, 
+        a change to Rthrt alone rescales the existing contour when it is next used.
+        """
         if hasattr( self, name ):
             setattr( self, name, value )
-            self.nozObj = None # may need to reevalute nozzle contour
+            if self.is_nozzle_shape_attr( name ):
+                self.nozObj = None # need to reevalute nozzle contour
         else:
             raise Exception('Attempting to set un-authorized Geometry attribute named "%s"'%name )
             
         if re_evaluate:
             self.evaluate()
+    
+    def is_nozzle_shape_attr(self, name):
+        """Return True if attribute "name" changes the shape of the dimensionless nozzle contour."""
+        if name in NOZ_SCALE_INPUT_L:
+            return self.LnozInp is not None
+        return name not in NOZ_UNUSED_INPUT_L
         
     def __call__(self, name):
         return getattr(self, name ) # let it raise exception if no name attr.
@@ -160,8 +184,11 @@ class Geometry:
         return self.Lcham / self.Rinj
     
     def getNozObj( self ):
-        """Create and return a Nozzle object."""
+        """Create and return a Nozzle object (rescale existing Nozzle if only Rthrt changed)."""
         if self.nozObj is not None:
+            if self.nozObj.Rt != self.Rthrt:
+                self.nozObj.set_abs_Rt( self.Rthrt )
+                self.nozzle_rescale_count += 1
             return self.nozObj
         
         noz = Nozzle(CR=self.CR, eps=self.eps, pcentBell=self.pcentBell,
@@ -170,6 +197,7 @@ class Geometry:
                      cham_conv_ang=self.cham_conv_deg, Rc=self.RchmConv,
                      theta=None, exitAng=None, forceCone=0, use_huzel_angles=False)
         self.nozObj = noz
+        self.nozzle_build_count += 1
         return noz
     
     def plot_geometry(self, title='Geometry', png_name='', pixel_wh=None,
@@ -9,8 +9,14 @@
     Golden section method for determining x that minimizes
     the user-supplied scalar function f(x).
     The minimum must be bracketed in (a,b).
+
+    x,fMin,nEval = brent_min(f,a,b,tol=1.0e-6,x_start=None)
+    Brent's method (parabolic interpolation with golden
+    section fallback) for x that minimizes f(x) in (a,b).
+    Optional x_start is a warm start guess of x.
+    nEval is the number of calls made to f(x).
 '''       
-from math import log, ceil
+from math import log, ceil, copysign
 
 def bracket(f, x1, h):
     c = 1.618033989 
@@ -61,10 +67,81 @@ def search(f, a, b, tol=1.0e-9):
     if f1 < f2: return x1,f1
     else: return x2,f2
 
+def brent_max(f, a, b, tol=1.0e-9, x_start=None, max_iter=100):
+    def fminus(x):
+        return -f(x)
+    xval, fval, nEval = brent_min(fminus, a, b, tol=tol, x_start=x_start, max_iter=max_iter)
+    return xval, -fval, nEval
+
+def brent_min(f, a, b, tol=1.0e-9, x_start=None, max_iter=100):
+    evalD = {} # index=x, value=f(x)... no point is evaluated twice
+    def feval(x):
+        try:
+            return evalD[x]
+        except KeyError:
+            fx = f(x)
+            evalD[x] = fx
+            return fx
+    
+    if a > b: a,b = b,a
+    C = 0.381966011
+    tol1 = 0.5*tol
+  # Start at warm start guess (if inside bracket) or golden section point
+    if x_start is not None and a < x_start < b:
+        x = x_start
+    else:
+        x = a + C*(b - a)
+    w = v = x
+    fx = fw = fv = feval(x)
+    d = e = 0.0
+  # Main loop
+    for i in range(max_iter):
+        xm = 0.5*(a + b)
+        if abs(x - xm) <= 2.0*tol1 - 0.5*(b - a): break
+        use_golden = True
+        if abs(e) > tol1:
+          # Try parabola through x, w and v
+            r = (x - w)*(fx - fv)
+            q = (x - v)*(fx - fw)
+            p = (x - v)*q - (x - w)*r
+            q = 2.0*(q - r)
+            if q > 0.0: p = -p
+            q = abs(q)
+            etemp = e; e = d
+            if abs(p) < abs(0.5*q*etemp) and q*(a - x) < p < q*(b - x):
+                d = p/q; u = x + d
+                if (u - a) < 2.0*tol1 or (b - u) < 2.0*tol1:
+                    d = copysign(tol1, xm - x)
+                use_golden = False
+        if use_golden:
+            if x >= xm: e = a - x
+            else: e = b - x
+            d = C*e
+        if abs(d) >= tol1: u = x + d
+        else: u = x + copysign(tol1, d)
+        fu = feval(u)
+      # Shrink bracket around best point
+        if fu <= fx:
+            if u >= x: a = x
+            else: b = x
+            v, w, x = w, x, u
+            fv, fw, fx = fw, fx, fu
+        else:
+            if u < x: a = u
+            else: b = u
+            if fu <= fw or w == x:
+                v, w = w, u
+                fv, fw = fw, fu
+            elif fu <= fv or v == x or v == w:
+                v = u; fv = fu
+    return x, fx, len(evalD)
+
 if __name__ == "__main__":
     
     def myfunc( x ):
         return (3.123-x)**2
         
     print( 'answer should be 3.123' )
-    print( search(myfunc,0.0,5.0,tol=1.0e-9) )
\ No newline at end of file
+    print( search(myfunc,0.0,5.0,tol=1.0e-9) )
+    print( 'brent_min (x, f, nEval)' )
+    print( brent_min(myfunc,0.0,5.0,tol=1.0e-9) )
\ No newline at end of file
@@ -0,0 +1,79 @@
+r"""
+Benchmark of the cold-start import time of RocketIsp.
+
+Each run imports the module in a fresh python process, so that nothing is
+already held in sys.modules.  The heavy packages (scipy.optimize,
+scipy.interpolate, rocketprops, matplotlib) should only be imported when a
+calculation needs them, and MLP model weights should only be loaded when a
+model is called, so they are reported if they show up at import time.
+
+From the command line::
+
+    python -m rocketisp.import_benchmark
+"""
+import os
+import sys
+import json
+import subprocess
+
+here = os.path.abspath(os.path.dirname(__file__))
+up_one = os.path.split( here )[0]  # folder that holds the rocketisp package
+
+# packages that should NOT be imported by "import rocketisp.rocket_isp"
+HEAVY_MODULE_L = ['scipy.optimize', 'scipy.interpolate', 'rocketprops.rocket_prop', 'matplotlib']
+
+# run in the fresh python process
+_child_src = '''
+import sys, time, json
+t_start = time.perf_counter()
+import %s
+t_import = time.perf_counter() - t_start
+
+from rocketisp.mlp_model import get_loaded_mlp_models
+json.dump( {'t_import':t_import,
+            'heavyL':[name for name in %r if name in sys.modules],
+            'n_modules':len(sys.modules),
+            'loaded_modelL':get_loaded_mlp_models()}, sys.stdout )
+'''
+
+def run_cold_import( module_name='rocketisp.rocket_isp' ):
+    """
+    Import module_name in a fresh python process and return a dictionary of
+    t_import (sec), heavyL (heavy modules imported), n_modules and loaded_modelL.
+    """
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join( [up_one] + [p for p in [env.get('PYTHONPATH', '')] if p] )
+
+    out = subprocess.check_output( [sys.executable, '-c', _child_src%(module_name, HEAVY_MODULE_L)],
+                                   env=env, universal_newlines=True )
+
+    # ignore anything printed by imported modules ahead of the json result
+    return json.loads( out[ out.rindex('{"t_import"'): ] )
+
+def get_cold_import_stats( module_name='rocketisp.rocket_isp', Nruns=5 ):
+    """
+    Return dictionary of cold-start import statistics over Nruns fresh processes.
+    (t_min, t_median and t_max are in seconds)
+    """
+    runL = [run_cold_import( module_name ) for _ in range(Nruns)]
+    tL = sorted( [D['t_import'] for D in runL] )
+
+    return {'module_name':module_name, 'Nruns':Nruns,
+            't_min':tL[0], 't_median':tL[ len(tL)//2 ], 't_max':tL[-1],
+            'heavyL':runL[-1]['heavyL'], 'n_modules':runL[-1]['n_modules'],
+            'loaded_modelL':runL[-1]['loaded_modelL']}
+
+def get_cold_import_str( statsD ):
+    """Return a summary string of the statistics from get_cold_import_stats."""
+    sL = ['cold import of %s (%i runs)'%(statsD['module_name'], statsD['Nruns']),
+          '   min=%.1f ms   median=%.1f ms   max=%.1f ms'%(1000.0*statsD['t_min'],
+                                   1000.0*statsD['t_median'], 1000.0*statsD['t_max']),
+          '   modules imported = %i'%statsD['n_modules'],
+          '   heavy modules imported = %s'%statsD['heavyL'],
+          '   MLP models loaded = %i'%len(statsD['loaded_modelL'])]
+    return '\n'.join( sL )
+
+
+if __name__ == '__main__':
+
+    print( get_cold_import_str( get_cold_import_stats( Nruns=5 ) ) )
@@ -374,9 +374,9 @@ class Injector:
             self.fdPinjFuel = self.dpFuelInp / self.coreObj.Pc
         
         # calc chamber sonic velocity
-        aODE = self.coreObj.ceaObj.get_SonicVelocities(Pc=self.coreObj.Pc, 
-                                                       MR=self.coreObj.MRcore,
-                                                       eps=self.geomObj.eps)[0]
+        aODE = self.coreObj.ceaObj.get_state(Pc=self.coreObj.Pc, 
+                                             MR=self.coreObj.MRcore,
+                                             eps=self.geomObj.eps).sonicVelL[0]
         # estimate effective sonic velocity in chamber
         self.sonicVel = aODE * 0.9
         
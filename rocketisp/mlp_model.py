@@ -0,0 +1,179 @@
+r"""
+Shared runtime for the multi-layer perceptron (MLP) surrogate models of RocketIsp.
+
+The MLP models (e.g. boundary layer loss, throat Cd and the fracKin kinetics
+models) are regression networks with relu hidden layers and an identity output
+layer.  The weights of each model are held in an npz file with the
+coefficient matrices in "c" and the intercept vectors in "i".
+
+Each npz file has one shared MLP_Model in the registry (see get_mlp_model).
+An MLP_Model loads its weights on first use (not at import), keeps them as
+contiguous arrays (with subnormal values flushed to zero, since they only slow
+the matrix multiply) and reuses its activation buffers from call
+to call.
+
+By default models run in float64.  set_mlp_float32(True) runs all models in
+float32 (faster for large batches, about 1.0E-6 relative error).
+
+MLP_Model buffers are not thread-safe; use processes (as for CEA) to run in parallel.
+
+For example::
+
+    from rocketisp.mlp_model import get_mlp_model
+
+    model = get_mlp_model( 'calc_full_Cd.npz' )
+    yArr = model.predict_arr( X ) # X.shape = (Npoints, Ninputs)
+"""
+import os
+import numpy as np
+
+# largest number of rows held in reusable activation buffers
+MAX_BUFFER_ROWS = 100000
+
+_dtype = np.float64 # data type used by all MLP models
+_modelD = {} # index=absolute path of npz file, value=MLP_Model
+
+class MLP_Model(object):
+    """
+    Multi-layer perceptron regression model with relu hidden layers and identity output.
+
+    :param npz_filename: path to npz file of weights ("c"=coefficients, "i"=intercepts)
+    :type npz_filename: str
+    :return: MLP_Model object
+    :rtype: MLP_Model
+    """
+
+    def __init__(self, npz_filename):
+        self.npz_filename = npz_filename
+
+        self.dtype = None       # data type of loaded weights (None = not loaded)
+        self.coefL = []         # coefficient matrices, shape=(Nin, Nout)
+        self.interceptL = []    # intercept vectors
+        self.bufL = []          # activation buffers, one per layer
+        self.n_loads = 0        # number of times weights were read from npz_filename
+
+    def __getstate__(self):
+        # weights are reloaded (lazily) after unpickling
+        stateD = self.__dict__.copy()
+        stateD['dtype'] = None
+        stateD['coefL'] = []
+        stateD['interceptL'] = []
+        stateD['bufL'] = []
+        return stateD
+
+    def is_loaded(self):
+        """Return True if weights have been loaded."""
+        return self.dtype is not None
+
+    def load(self, dtype=None):
+        """Read weights from npz file and prepare them for dtype (default is current MLP dtype)."""
+        if dtype is None:
+            dtype = _dtype
+
+        with np.load(self.npz_filename, allow_pickle=True) as data:
+            coefs_ = data['c']
+            intercepts_ = data['i']
+
+        tiny = np.finfo(dtype).tiny # smallest normal number
+        self.coefL = []
+        self.interceptL = []
+        for coef, intercept in zip(coefs_, intercepts_):
+            coef = np.array(coef, dtype=dtype)
+            coef[ np.abs(coef) < tiny ] = 0.0 # flush subnormal weights to zero
+            self.coefL.append( coef )
+            self.interceptL.append( np.ascontiguousarray( intercept, dtype=dtype ) )
+
+        self.dtype = dtype
+        self.bufL = []
+        self.n_loads += 1
+
+    @property
+    def n_inputs(self):
+        if not self.is_loaded():
+            self.load()
+        return self.coefL[0].shape[0]
+
+    def get_buffers(self, Nrows):
+        """Return list of activation arrays for Nrows (reused from call to call)."""
+        if Nrows > MAX_BUFFER_ROWS:
+            return [np.empty( (Nrows, coef.shape[1]), dtype=self.dtype ) for coef in self.coefL]
+
+        if not self.bufL or self.bufL[0].shape[0] < Nrows:
+            self.bufL = [np.empty( (Nrows, coef.shape[1]), dtype=self.dtype ) for coef in self.coefL]
+        return [buf[:Nrows] for buf in self.bufL]
+
+    def predict_arr(self, X):
+        """
+        Return 1D float64 array of model outputs, one for each row of X.
+        (the output is raw, any clipping or scaling is done by the calling model)
+        """
+        if self.dtype != _dtype:
+            self.load( _dtype )
+
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        bufL = self.get_buffers( X.shape[0] )
+        A = X
+        i_last = len(self.coefL) - 1
+        for i, (coef, intercept, buf) in enumerate( zip(self.coefL, self.interceptL, bufL) ):
+            np.dot(A, coef, out=buf)
+            buf += intercept
+            if i < i_last:
+                np.maximum(buf, 0.0, out=buf) # relu for hidden layers
+            A = buf
+
+        # identity output layer (copy out of reused buffer)
+        return A[:, -1].astype(np.float64)
+
+def get_mlp_model( npz_filename ):
+    """Return the shared MLP_Model for npz_filename (weights are loaded on first use)."""
+    npz_filename = os.path.abspath( npz_filename )
+    try:
+        return _modelD[npz_filename]
+    except KeyError:
+        model = MLP_Model( npz_filename )
+        _modelD[npz_filename] = model
+        return model
+
+def get_loaded_mlp_models():
+    """Return sorted list of npz file names of models with loaded weights."""
+    return sorted( [name for name, model in _modelD.items() if model.is_loaded()] )
+
+def set_mlp_float32( use_float32=True ):
+    """Run all MLP models in float32 (use_float32=True) or float64 (use_float32=False)."""
+    global _dtype
+    if use_float32:
+        _dtype = np.float32
+    else:
+        _dtype = np.float64
+
+def get_mlp_dtype():
+    """Return data type used by MLP models (numpy.float64 or numpy.float32)."""
+    return _dtype
+
+
+if __name__ == '__main__':
+    import time
+    here = os.path.abspath(os.path.dirname(__file__))
+
+    model = get_mlp_model( os.path.join(here, 'efficiency', 'calc_full_pcentLossBL.npz') )
+    print( 'loaded models:', get_loaded_mlp_models() )
+
+    X = np.random.rand( 10000, model.n_inputs )
+    for use_float32 in [False, True]:
+        set_mlp_float32( use_float32 )
+        model.predict_arr( X[:1] )
+
+        t0 = time.time()
+        for i in range(1000):
+            model.predict_arr( X[:1] )
+        t1 = time.time()
+        yArr = model.predict_arr( X )
+        t2 = time.time()
+
+        print( 'dtype=%s  single row: %.1f us/call,  %i rows: %.2f ms'%\
+               (get_mlp_dtype().__name__, 1000.0*(t1-t0), len(X), 1000.0*(t2-t1)) )
+    set_mlp_float32( False )
+    print( 'loaded models:', get_loaded_mlp_models() )
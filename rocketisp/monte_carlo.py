@@ -0,0 +1,268 @@
+r"""
+Monte Carlo uncertainty propagation for a RocketThruster.
+
+Distributions can be attached to the efficiencies in MC_EFF_INPUT_L and to
+Pc, MRcore, adjCstarODE and adjIspIdeal.  Each distribution is one of::
+
+    ('normal', mean, sigma)
+    ('uniform', low, high)
+    ('triangular', low, mode, high)
+    array of samples (length Nsamples)
+
+All samples are evaluated as array math in one pass, no thruster objects are
+built per sample.  Efficiency samples are combined by Efficiencies.evaluate_arr
+(the array version of Efficiencies.evaluate).  If neither Pc nor MRcore is
+sampled, every sample uses the CEA state of the base thruster.  Otherwise the
+CEA values are interpolated from a CEA_Table (see cea_table.py) that spans the
+sampled Pc and MRcore.  The results are calibrated to the base thruster, so a
+sample at the base inputs gives the base IspDel, FvacTotal, wdotTot and Fambient.
+
+Efficiencies without a distribution, CdThroat, the barrier (film cooling) effect
+on IspDel and flow rate, and the nozzle separation state are held at their
+base values.  Efficiency samples are clipped to the range 0 to 1.
+
+For example::
+
+    mcObj = R.run_monte_carlo( {'ERE':('normal', 0.98, 0.005), 'Pc':('uniform', 140.0, 160.0)} )
+    print( mcObj.get_percentiles('IspDel') )
+    mcObj.summ_print()
+"""
+import numpy as np
+from rocketisp.cea_table import CEA_Table
+
+MC_EFF_INPUT_L = ['ERE', 'Div', 'BL', 'Kin', 'Mix', 'Vap', 'Em', 'HL', 'TP']
+MC_CORE_INPUT_L = ['Pc', 'MRcore', 'adjCstarODE', 'adjIspIdeal']
+MC_INPUT_L = MC_EFF_INPUT_L + MC_CORE_INPUT_L
+
+MC_OUTPUT_L = ['IspDel', 'FvacTotal', 'Fambient', 'wdotTot', 'wdotOx', 'wdotFl', 'effIsp']
+
+DEFAULT_PERCENTILE_L = [1.0, 5.0, 50.0, 95.0, 99.0]
+
+def get_samples( dist, Nsamples, rng ):
+    """
+    Return array of Nsamples samples of distribution dist (see module docstring).
+
+    :param dist: distribution tuple (e.g. ('normal', 0.98, 0.005)) or array of samples
+    :param Nsamples: number of samples
+    :param rng: random number generator
+    :type dist: tuple
+    :type Nsamples: int
+    :type rng: numpy.random.Generator
+    :return: array of samples
+    :rtype: numpy.ndarray
+    """
+    if isinstance(dist, (tuple, list)) and dist and isinstance(dist[0], str):
+        kind, paramL = dist[0], [float(p) for p in dist[1:]]
+        if kind == 'normal' and len(paramL) == 2:
+            return rng.normal( paramL[0], paramL[1], Nsamples )
+        elif kind == 'uniform' and len(paramL) == 2:
+            return rng.uniform( paramL[0], paramL[1], Nsamples )
+        elif kind == 'triangular' and len(paramL) == 3:
+            return rng.triangular( paramL[0], paramL[1], paramL[2], Nsamples )
+        raise Exception('in MonteCarlo, distribution %s is not recognized'%repr(dist))
+
+    sampleArr = np.asarray( dist, dtype=np.float64 ).ravel()
+    if len(sampleArr) != Nsamples:
+        raise Exception('in MonteCarlo, array of samples must have %i values, not %i'%(Nsamples, len(sampleArr)))
+    return sampleArr
+
+
+class MonteCarlo(object):
+    """
+    Monte Carlo samples of thruster performance for distributions of efficiencies and core inputs.
+    rocketObj is not changed.
+
+    :param rocketObj: RocketThruster at base state
+    :param distD: distributions (index=input name in MC_INPUT_L, value=distribution, see module docstring)
+    :param Nsamples: number of samples (ignored if all distributions are arrays of samples)
+    :param seed: seed of random number generator (None=random seed)
+    :param ceaTable: CEA_Table for sampled Pc and MRcore (None=build table over sampled range)
+    :type rocketObj: RocketThruster
+    :type distD: dict
+    :type Nsamples: int
+    :type seed: int
+    :type ceaTable: CEA_Table
+    :return: MonteCarlo object
+    :rtype: MonteCarlo
+
+    :ivar sampleD: input samples (index=input name, value=array)
+    :ivar resultD: output samples (index=output name in MC_OUTPUT_L, value=array)
+    :ivar baseD: outputs of base thruster (index=output name)
+    :ivar warningL: list of warnings (e.g. clipped efficiency samples)
+    """
+
+    def __init__(self, rocketObj, distD, Nsamples=100000, seed=None, ceaTable=None):
+
+        coreObj = rocketObj.coreObj
+        geomObj = rocketObj.geomObj
+        effObj = coreObj.effObj
+        self.warningL = []
+
+        for name in distD.keys():
+            if name not in MC_INPUT_L:
+                raise Exception('in MonteCarlo, "%s" is not a recognized input'%name)
+
+        arrNsamples = [len(dist) for dist in distD.values() \
+                       if not (isinstance(dist, (tuple, list)) and dist and isinstance(dist[0], str))]
+        if arrNsamples:
+            Nsamples = arrNsamples[0]
+        self.Nsamples = Nsamples
+
+        rng = np.random.default_rng( seed )
+        self.sampleD = {}
+        for name, dist in distD.items():
+            self.sampleD[name] = get_samples( dist, Nsamples, rng )
+
+        # ........ efficiencies (samples of unused efficiencies have no effect)
+        effSampleD = {}
+        for name in MC_EFF_INPUT_L:
+            if name not in self.sampleD:
+                continue
+            sampleArr = self.sampleD[name]
+            n_clip = np.count_nonzero( (sampleArr < 0.0) | (sampleArr > 1.0) )
+            if n_clip:
+                self.warningL.append( '%i samples of eff%s clipped to range 0 to 1'%(n_clip, name) )
+            effSampleD[name] = np.clip( sampleArr, 0.0, 1.0 )
+
+            if effObj['Isp'].is_const or \
+               (name in effObj.nozzleL and effObj['Noz'].is_const) or \
+               (name in effObj.chamberL and effObj['ERE'].is_const):
+                self.warningL.append( 'eff%s is not used (a consolidated efficiency is constant)'%name )
+
+        effArrD = effObj.evaluate_arr( **effSampleD )
+        effNozArr, effEREArr = effArrD['Noz'], effArrD['ERE']
+
+        # ........ core inputs
+        def get_core_samples( name ):
+            if name in self.sampleD:
+                return self.sampleD[name]
+            return np.full( Nsamples, float( getattr(coreObj, name) ) )
+        PcArr = get_core_samples( 'Pc' )
+        MRArr = get_core_samples( 'MRcore' )
+        adjCstarArr = get_core_samples( 'adjCstarODE' )
+        adjIspArr = get_core_samples( 'adjIspIdeal' )
+        if np.any( PcArr <= 0.0 ) or np.any( MRArr <= 0.0 ):
+            raise Exception('in MonteCarlo, Pc and MRcore samples must be greater than zero')
+
+        # ........ ideal performance (base CEA state unless Pc or MRcore are sampled)
+        IspODE_base = coreObj.IspODE / coreObj.adjIspIdeal
+        cstarODE_base = coreObj.cstarODE / coreObj.adjCstarODE
+        if 'Pc' in self.sampleD or 'MRcore' in self.sampleD:
+            if ceaTable is None:
+                ceaTable = self.build_cea_table( coreObj, PcArr, MRArr )
+            self.ceaTable = ceaTable
+
+            # calibrate table to base CEA state
+            baseD = ceaTable.get_arrays( coreObj.Pc, coreObj.MRcore, geomObj.eps )
+            tableD = ceaTable.get_arrays( PcArr, MRArr, geomObj.eps )
+            IspODEArr = tableD['IspODE'] * (IspODE_base / baseD['IspODE'])
+            cstarODEArr = tableD['cstarODE'] * (cstarODE_base / baseD['cstarODE'])
+        else:
+            self.ceaTable = None
+            IspODEArr = np.full( Nsamples, IspODE_base )
+            cstarODEArr = np.full( Nsamples, cstarODE_base )
+        IspODEArr = IspODEArr * adjIspArr
+        cstarODEArr = cstarODEArr * adjCstarArr
+
+        # ........ same as CoreStream.evaluate without barrier, then calibrated to base thruster
+        if coreObj.add_barrier:
+            effFFC = 1.0
+            fracFFC = coreObj.barrierObj.pcentFFC / 100.0
+        else:
+            effFFC = effObj('FFC')
+            fracFFC = 0.0
+        gc_At = geomObj.At * coreObj.CdThroat * 32.174
+
+        def calc_core( effNoz, effERE, IspODE, cstarODE, Pc ):
+            effERE_core = effERE * effFFC
+            IspDel_core = effNoz * effERE_core * IspODE
+            wdotTot_core = Pc * gc_At / (cstarODE * effERE_core)
+            return IspDel_core, wdotTot_core
+
+        IspDel_c0, wdotTot_c0 = calc_core( effObj('Noz'), effObj('ERE'), coreObj.IspODE,
+                                           coreObj.cstarODE, coreObj.Pc )
+        IspArr, wdotArr = calc_core( effNozArr, effEREArr, IspODEArr, cstarODEArr, PcArr )
+        IspArr = IspArr * (coreObj.IspDel / IspDel_c0) # barrier effect held at base value
+        wdotArr = wdotArr * (coreObj.wdotTot / wdotTot_c0)
+        FvacArr = IspArr * wdotArr
+
+        if coreObj.Pamb < 0.000001:
+            FambArr = FvacArr
+        elif coreObj.noz_mode.startswith('Separated'):
+            FambArr = FvacArr * (coreObj.Fambient / coreObj.FvacTotal)
+            self.warningL.append( 'nozzle is separated, Fambient/FvacTotal held at base value' )
+        else:
+            # same as IspAmb = IspDel - cstarERE * Pamb * eps / Pc / 32.174
+            cstarEREArr = cstarODEArr * effEREArr
+            FambArr = FvacArr - wdotArr * cstarEREArr * coreObj.Pamb * geomObj.eps / PcArr / 32.174
+
+        MRthrusterArr = MRArr * (1.0 - fracFFC)
+        wdotOxArr = wdotArr * MRthrusterArr / (1.0 + MRthrusterArr)
+
+        self.resultD = {'IspDel':IspArr, 'FvacTotal':FvacArr, 'Fambient':FambArr, 'wdotTot':wdotArr,
+                        'wdotOx':wdotOxArr, 'wdotFl':wdotArr - wdotOxArr,
+                        'effIsp':IspArr / IspODEArr}
+        self.baseD = {'IspDel':coreObj.IspDel, 'FvacTotal':coreObj.FvacTotal, 'Fambient':coreObj.Fambient,
+                      'wdotTot':coreObj.wdotTot, 'wdotOx':coreObj.wdotOx, 'wdotFl':coreObj.wdotFl,
+                      'effIsp':coreObj.IspDel / coreObj.IspODE}
+
+    def build_cea_table(self, coreObj, PcArr, MRArr, NPc=6, NMR=13):
+        """Return CEA_Table that spans the Pc and MRcore samples at the eps of coreObj."""
+        def get_grid( arr, N ):
+            lo, hi = float(arr.min()), float(arr.max())
+            if hi <= lo * 1.000001:
+                return np.array( [lo * 0.999, lo * 1.001] ) # input is not sampled
+            return np.linspace( lo, hi, N )
+
+        eps = coreObj.geomObj.eps
+        return CEA_Table( coreObj.oxName, coreObj.fuelName, get_grid(PcArr, NPc), get_grid(MRArr, NMR),
+                          np.array( [eps / 1.001, eps * 1.001] ) )
+
+    def get_percentiles(self, name, percentileL=None):
+        """Return dictionary of percentiles of output name (index=percentile, e.g. 5.0)."""
+        if percentileL is None:
+            percentileL = DEFAULT_PERCENTILE_L
+        valueL = np.percentile( self.resultD[name], percentileL ).tolist()
+        return dict( zip(percentileL, valueL) )
+
+    def get_mean_std(self, name):
+        """Return (mean, standard deviation) of output name."""
+        return float( np.mean( self.resultD[name] ) ), float( np.std( self.resultD[name] ) )
+
+    def summ_print(self):
+        """Print percentiles of all outputs."""
+        print( self.get_summ_str() )
+
+    def get_summ_str(self, percentileL=None):
+        """Return string table of base value, mean, standard deviation and percentiles of all outputs."""
+        if percentileL is None:
+            percentileL = DEFAULT_PERCENTILE_L
+        sL = ['Monte Carlo, %i samples of %s'%(self.Nsamples, ', '.join( self.sampleD.keys() ))]
+        sL.append( '%10s %12s %12s %12s'%('output', 'base', 'mean', 'std dev') + \
+                   ''.join( ['%12s'%('%g%%'%p) for p in percentileL] ) )
+        for name in MC_OUTPUT_L:
+            mean, std = self.get_mean_std( name )
+            pD = self.get_percentiles( name, percentileL )
+            sL.append( '%10s %12g %12g %12g'%(name, self.baseD[name], mean, std) + \
+                       ''.join( ['%12g'%pD[p] for p in percentileL] ) )
+        for warning in self.warningL:
+            sL.append( 'WARNING: ' + warning )
+        return '\n'.join( sL )
+
+
+if __name__ == '__main__':
+    import time
+    from rocketisp.geometry import Geometry
+    from rocketisp.efficiencies import Efficiencies
+    from rocketisp.stream_tubes import CoreStream
+    from rocketisp.rocket_isp import RocketThruster
+
+    C = CoreStream( geomObj=Geometry(Rthrt=1.0, eps=40), effObj=Efficiencies(ERE=0.98),
+                    oxName='N2O4', fuelName='MMH', MRcore=1.6, Pc=150, pcentFFC=10, Pamb=5.0)
+    R = RocketThruster(name='Monte Carlo demo', coreObj=C)
+
+    t0 = time.time()
+    mcObj = R.run_monte_carlo( {'ERE':('normal', 0.98, 0.005), 'Div':('triangular', 0.985, 0.99, 0.995),
+                                'Pc':('normal', 150.0, 3.0), 'MRcore':('uniform', 1.55, 1.65)}, seed=0 )
+    print( '%i samples in %.2f sec'%(mcObj.Nsamples, time.time()-t0) )
+    mcObj.summ_print()
@@ -1,121 +1,211 @@
+r"""
+Find the range of mixture ratio (MR) over which vacuum IspODE is at least
+edge_frac times its peak value.
+
+MRrange starts at the stoichiometric MR and steps outward on both sides with
+geometrically growing steps until IspODE falls below edge_frac * peakIsp.
+The peak is refined with a parabola through the best three points, and
+each end of the range is then found by bracketed bisection (Illinois false
+position) on the edge_frac crossing.  Both sides are stepped together, so
+every round evaluates its CEA points as one batch (duplicate MRs are only
+run once).
+
+MRrange objects are cached by propellant pair, Pc, eps and edge_frac
+(see get_MRrange), so repeated plots do not repeat the search.
+
+For example::
+
+    from rocketisp.mr_range import get_MRrange
+
+    mrr = get_MRrange(ceaObj, Pc=500., eps=20., edge_frac=0.97)
+    mrlo, mrhi = mrr.get_mr_range()
+"""
+from rocketisp.cea_cache import canonical_value
+
+STEP_GROWTH = 2.0     # growth factor of bracketing steps
+MAX_ROUNDS = 60       # maximum rounds of bracketing or bisection
+ISP_TOL = 1.0E-4      # tolerance on IspODE / peakIsp at the ends of the range
 
 class MRrange:
-    
-    def __init__(self, ispObj, Pc=500., eps=20., 
+    """
+    Range of MR where vacuum IspODE >= edge_frac * peakIsp.
+
+    :param ispObj: CEA_Obj (or CachedCEA_Obj) of propellant pair
+    :param Pc: psia, chamber pressure
+    :param eps: nozzle area ratio
+    :param edge_frac: fraction of peak IspODE at the ends of the MR range
+    :type ispObj: CEA_Obj
+    :type Pc: float
+    :type eps: float
+    :type edge_frac: float
+    :return: MRrange object
+    :rtype: MRrange
+    """
+
+    def __init__(self, ispObj, Pc=500., eps=20.,
                  edge_frac=0.97):
-        
+
         self.Pc = Pc
         self.eps = eps
         self.edge_frac = edge_frac
         self.ispObj = ispObj
         self.MRstoic = self.ispObj.getMRforER( ERr=1.0 )
         self.MRstep = max( self.MRstoic/30.0, 0.01 )
-        #print('MRstoic=',self.MRstoic, '      MRstep =',self.MRstep)
 
-        IspVac = self.ispObj.get_Isp( Pc=Pc, MR=self.MRstoic, eps=eps)
-        self.dataL = [(self.MRstoic, IspVac)]
-        
-        self.peakIsp = IspVac
+        self.ispD = {} # index=MR, value=IspODE (every CEA point evaluated)
+        self.n_cea_calls = 0
+        self.peakIsp = 0.0
         self.peakMR  = self.MRstoic
-        
-        self.mr_min = self.MRstoic - self.MRstep
-        self.mr_max = self.MRstoic + self.MRstep
-        
-        self.IspAtMRmin = self.add_mr( self.mr_min )
-        self.IspAtMRmax = self.add_mr( self.mr_max )
-        
-        for _ in range(1000):
-            mr = self.mr_min - self.MRstep
-            if mr <= 0.0:
+
+        self.add_mr_list( [self.MRstoic - self.MRstep, self.MRstoic, self.MRstoic + self.MRstep] )
+
+        # step outward (both sides in each round) until below edge_frac of peak
+        lastL = [self.MRstoic - self.MRstep, self.MRstoic + self.MRstep]
+        stepL = [-STEP_GROWTH*self.MRstep, STEP_GROWTH*self.MRstep]
+        is_openL = [True, True]
+        for _ in range(MAX_ROUNDS):
+            mrL = []
+            for i in (0,1):
+                if is_openL[i] and self.ispD[ lastL[i] ] < self.edge_frac * self.peakIsp:
+                    is_openL[i] = False
+                if is_openL[i] and lastL[i] + stepL[i] <= 0.0:
+                    if lastL[i] < 0.001*self.MRstoic:
+                        is_openL[i] = False # Isp never drops to edge_frac on fuel rich side
+                    else:
+                        stepL[i] = -0.5 * lastL[i] # halve MR towards zero
+                if is_openL[i]:
+                    lastL[i] += stepL[i]
+                    stepL[i] *= STEP_GROWTH
+                    mrL.append( lastL[i] )
+            if not mrL:
                 break
-            IspVac = self.add_mr( mr )
-            if IspVac / self.peakIsp < self.edge_frac:
+            self.add_mr_list( mrL )
+
+        self.refine_peak()
+        IspCutoff = self.edge_frac * self.peakIsp
+
+        # bracket the crossing of IspCutoff on each side of the peak
+        mrSortedL = sorted( self.ispD.keys() )
+        bracketL = []
+        i_peak = mrSortedL.index( self.peakMR )
+        lo_inside = mrSortedL[i_peak]
+        for mr in reversed( mrSortedL[:i_peak] ):
+            if self.ispD[mr] < IspCutoff:
+                bracketL.append( [mr, lo_inside] ) # [outside, inside]
                 break
-        #print('Min MR=',self.mr_min,'   IspAtMRmin=', self.IspAtMRmin)
-
-        # find MR max
-        for _ in range(1000):
-            mr = self.mr_max + self.MRstep
-            IspVac = self.add_mr( mr )
-            
-            if IspVac / self.peakIsp < self.edge_frac:
+            lo_inside = mr
+        else:
+            bracketL.append( None ) # lowest MR is still above cutoff
+        hi_inside = mrSortedL[i_peak]
+        for mr in mrSortedL[i_peak+1:]:
+            if self.ispD[mr] < IspCutoff:
+                bracketL.append( [mr, hi_inside] )
                 break
-        #print('Max MR=',self.mr_max,'   IspAtMRmax=', self.IspAtMRmax)
-        #print('Peak MR=',self.peakMR,'   peakIsp=', self.peakIsp)
-        
-        self.dataL.sort() # sort in MR order
-        
-        # prune list to single overhang values on each end.
-        new_dataL = []
-        IspCutoff = self.edge_frac * self.peakIsp
-        def is_keeper( i ):
-            if i==0:
-                mrp1, Ispp1 = self.dataL[i+1]
-                if Ispp1 >= IspCutoff:
-                    return True
-                    
-            elif i==len( self.dataL ) - 1:
-                mrm1, Ispm1 = self.dataL[i-1]
-                if Ispm1 >= IspCutoff:
-                    return True
-            else:
-                mr, Isp = self.dataL[i]
-                if Isp >= IspCutoff:
-                    return True
-                mrp1, Ispp1 = self.dataL[i+1]
-                if Ispp1 >= IspCutoff:
-                    return True
-                mrm1, Ispm1 = self.dataL[i-1]
-                if Ispm1 >= IspCutoff:
-                    return True
-            return False
-            
-        for i,(mr, IspVac) in enumerate(self.dataL):
-            if is_keeper( i ):
-                new_dataL.append( (mr, IspVac) )
-        
-        # approximate MR of both ends with linear interpolation
-        mr1, Is1 = new_dataL[0]
-        mr2, Is2 = new_dataL[1]
-        mr = mr1 + (mr2-mr1)*(IspCutoff-Is1)/(Is2-Is1)
-        new_dataL[0] = (mr, self.ispObj.get_Isp( Pc=self.Pc, MR=mr, eps=self.eps))
-        
-        mr1, Is1 = new_dataL[-2]
-        mr2, Is2 = new_dataL[-1]
-        mr = mr1 + (mr2-mr1)*(IspCutoff-Is1)/(Is2-Is1)
-        new_dataL[-1] = (mr, self.ispObj.get_Isp( Pc=self.Pc, MR=mr, eps=self.eps))
-
-        
-        # set dataL to just the keepers
-        self.dataL = new_dataL
-    
+            hi_inside = mr
+        else:
+            bracketL.append( None )
+
+        # bisect both crossings together (Illinois false position)
+        self.mr_min, self.mr_max = mrSortedL[0], mrSortedL[-1]
+        endL = [self.mr_min, self.mr_max]
+        sideL = [0, 1]
+        fD = {} # index=side, value=[f_outside, f_inside, side kept last round] (Illinois)
+        for i in sideL:
+            if bracketL[i] is not None:
+                fD[i] = [self.ispD[ bracketL[i][0] ] - IspCutoff, self.ispD[ bracketL[i][1] ] - IspCutoff, None]
+
+        for _ in range(MAX_ROUNDS):
+            mrL = []
+            for i in fD.keys():
+                (mr_out, mr_in), (f_out, f_in, _) = bracketL[i], fD[i]
+                mr = mr_in - f_in * (mr_out - mr_in) / (f_out - f_in)
+                if not min(mr_out, mr_in) < mr < max(mr_out, mr_in):
+                    mr = 0.5*(mr_out + mr_in)
+                mrL.append( mr )
+                endL[i] = mr
+            if not mrL:
+                break
+
+            for i, mr, IspODE in zip( list( fD.keys() ), mrL, self.add_mr_list( mrL ) ):
+                f_out, f_in, kept = fD[i]
+                f = IspODE - IspCutoff
+                if abs(f) <= ISP_TOL * self.peakIsp:
+                    del fD[i]
+                elif f < 0.0:
+                    bracketL[i][0] = mr
+                    fD[i] = [f, f_in*0.5 if kept=='in' else f_in, 'in']
+                else:
+                    bracketL[i][1] = mr
+                    fD[i] = [f_out*0.5 if kept=='out' else f_out, f, 'out']
+
+        self.mr_min, self.mr_max = endL
+        self.IspAtMRmin = self.ispD[ self.mr_min ]
+        self.IspAtMRmax = self.ispD[ self.mr_max ]
+
+        # dataL is (MR, IspODE) of evaluated points in range, in MR order
+        self.dataL = [(mr, self.ispD[mr]) for mr in sorted( self.ispD.keys() ) \
+                      if self.mr_min <= mr <= self.mr_max]
+
     def get_mr_range(self):
         return self.dataL[0][0], self.dataL[-1][0]
-    
+
     def get_mr_list(self):
         return [mr for mr,_ in self.dataL]
-        
+
+    def add_mr_list(self, mrL):
+        """Evaluate IspODE at all new MR values in mrL as one batch, return list of IspODE."""
+        mrL = [float(mr) for mr in mrL]
+        for mr in mrL:
+            if mr not in self.ispD:
+                self.ispD[mr] = self.ispObj.get_Isp( Pc=self.Pc, MR=mr, eps=self.eps)
+                self.n_cea_calls += 1
+
+                if self.ispD[mr] > self.peakIsp:
+                    self.peakIsp = self.ispD[mr]
+                    self.peakMR = mr
+
+        return [self.ispD[mr] for mr in mrL]
+
     def add_mr(self, mr):
-        
-        IspVac = self.ispObj.get_Isp( Pc=self.Pc, MR=mr, eps=self.eps)
-        if mr<self.mr_min:
-            self.mr_min = mr
-            self.IspAtMRmin = IspVac
-        if mr>self.mr_max:
-            self.mr_max = mr
-            self.IspAtMRmax = IspVac
-        
-        if IspVac > self.peakIsp:
-            self.peakIsp = IspVac
-            self.peakMR = mr
-            
-        self.dataL.append( (mr, IspVac) )
-            
-        return IspVac
-
-if __name__ == "__main__":    
+        return self.add_mr_list( [mr] )[0]
+
+    def refine_peak(self):
+        """Evaluate IspODE at vertex of parabola through peak point and its neighbors."""
+        mrSortedL = sorted( self.ispD.keys() )
+        i = mrSortedL.index( self.peakMR )
+        if i==0 or i==len(mrSortedL)-1:
+            return
+
+        (x1, x2, x3) = mrSortedL[i-1:i+2]
+        (y1, y2, y3) = [self.ispD[x] for x in (x1, x2, x3)]
+        denom = (x2-x1)*(y2-y3) - (x2-x3)*(y2-y1)
+        if denom == 0.0:
+            return
+        mr = x2 - 0.5*( (x2-x1)**2*(y2-y3) - (x2-x3)**2*(y2-y1) ) / denom
+        if x1 < mr < x3:
+            self.add_mr( mr )
+
+# index=(oxName, fuelName, fac_CR, Pc, eps, edge_frac), value=MRrange
+mr_range_cacheD = {}
+
+def get_MRrange( ispObj, Pc=500., eps=20., edge_frac=0.97 ):
+    """Return cached MRrange for propellant pair of ispObj at Pc, eps and edge_frac."""
+    key = (ispObj.oxName, ispObj.fuelName, canonical_value( getattr(ispObj, 'fac_CR', None) ),
+           canonical_value(Pc), canonical_value(eps), canonical_value(edge_frac))
+    try:
+        return mr_range_cacheD[key]
+    except KeyError:
+        mrr = MRrange( ispObj, Pc=Pc, eps=eps, edge_frac=edge_frac )
+        mr_range_cacheD[key] = mrr
+        return mrr
+
+def clear_MRrange_cache():
+    """Remove all cached MRrange objects."""
+    mr_range_cacheD.clear()
+
+if __name__ == "__main__":
     from rocketcea.cea_obj import CEA_Obj
-    
+
     #ispObj = ispObj = CEA_Obj( oxName='LOX', fuelName='LH2')
     ispObj = ispObj = CEA_Obj( oxName='N2O4', fuelName='MMH')
     #ispObj = ispObj = CEA_Obj( oxName='N2O4', fuelName='N2H4')
@@ -125,5 +215,5 @@ if __name__ == "__main__":
     for mr,IspVac in mrr.dataL:
         print( 'MR=%6.2f  Isp=%8.3f'%(mr, IspVac), '%9.5f'%(IspVac/mrr.peakIsp,) )
 
-
-    print('MR List:', mrr.get_mr_list())
\ No newline at end of file
+    print('MR List:', mrr.get_mr_list())
+    print('CEA calls:', mrr.n_cea_calls)
@@ -1,4 +1,3 @@
-from scipy.interpolate import interp1d
 from math import log
 
 # upstream radius / throat radius
@@ -20,6 +19,7 @@ def get_Cd( Rup=1.5, gamma=1.25 ):
     cd_300 =   0.998188849337407 - 0.0005288719430737602*log(gamma)
     
     cdL = [ cd_075, cd_100, cd_150, cd_200, cd_250, cd_300]
+    from scipy.interpolate import interp1d # import only when needed (slow to import)
     return interp1d( RupL , cdL, kind=2, fill_value="extrapolate")( Rup )
 
 
@@ -1,42 +1,73 @@
-from scipy.interpolate import interp1d
+import numpy as np
+from rocketisp.nozzle.quad_interp import QuadInterp, calc_basis_scalar
 
 def getHuzelThetaAlpha( eps=20.0, pcBell=80.0 ):
     """For backward compatibility"""
     return getHuzelEntranceExitAngles( eps=eps, pcBell=pcBell )
 
-def getHuzelEntranceExitAngles( eps=20.0, pcBell=80.0 ):
+def getHuzelEntranceExitAngles( eps=20.0, pcBell=80.0, warningL=None ):
     """
     Return the entrance and exit angle of an optimum parabolic nozzle
     based on the chart from Huzel and Huang.
+    
+    eps is clamped to 5 to 50 and pcBell to 60 to 100, if warningL is a list,
+    out of range messages are appended to it.
     """
     
     if eps<5.0 or eps>50.0:
-        print('WARNING... Huzel Area Ratio Range is 5 to 50, %g was input'%eps)
+        if warningL is not None:
+            warningL.append( 'Huzel Area Ratio Range is 5 to 50, %g was input (%g used)'%(eps, max(5, min(50, eps))) )
         eps = max(5, min(50, eps))
-        print('    ...Looking up Huzel Values for Area Ratio = %g'%eps)
         
     if pcBell<60.0 or pcBell>100.0:
-        print('WARNING... Huzel %%Bell Range is 60%% to 100%%, %g was input'%pcBell)
+        if warningL is not None:
+            warningL.append( 'Huzel %%Bell Range is 60%% to 100%%, %g was input (%g used)'%\
+                             (pcBell, max(60, min(100, pcBell))) )
         pcBell = max(60, min(100, pcBell))
-        print('    ...Looking up Huzel Values for %%Bell = %g'%pcBell)
-    
-    ent_vs_pcbL = []
-    exit_vs_pcbL = []
     
     # using curve fits for smoother result.
-    for entFunc in entFuncL:
-        ent_vs_pcbL.append( entFunc(eps) )
-    
-    for exitFunc in exitFuncL:
-        exit_vs_pcbL.append( exitFunc(eps) )
+    ent_vs_pcbL = [entFunc(eps) for entFunc in entFuncL]
+    exit_vs_pcbL = [exitFunc(eps) for exitFunc in exitFuncL]
     
-    entAng = my_interp( pcBell, pcentBellL, ent_vs_pcbL )
-    exitAng = my_interp( pcBell, pcentBellL, exit_vs_pcbL )
+    # interpolate in %Bell (same as my_interp)
+    j, N = calc_basis_scalar( pcentBellInterp.tL, pcentBellInterp.n, pcBell )
+    entAng, exitAng = 0.0, 0.0
+    for r in range(3):
+        wL = pcentBellInterp.invL[j-2+r] # spline coefficient = sum of wL * values
+        entAng += N[r] * sum( [w*v for w,v in zip(wL, ent_vs_pcbL)] )
+        exitAng += N[r] * sum( [w*v for w,v in zip(wL, exit_vs_pcbL)] )
     
     return float(entAng), float(exitAng)
 
+def getHuzelEntranceExitAngles_arr( epsArr, pcBellArr, warningL=None ):
+    """
+    Array version of getHuzelEntranceExitAngles, epsArr and pcBellArr are broadcast together.
+    Return arrays of entrance and exit angles (deg).
+    Out of range values are clamped, if warningL is a list, one message giving
+    the number of clamped values is appended to it.
+    """
+    epsArr, pcBellArr = np.broadcast_arrays( np.asarray(epsArr, dtype=np.float64),
+                                             np.asarray(pcBellArr, dtype=np.float64) )
+    n_out = np.count_nonzero( (epsArr < 5.0) | (epsArr > 50.0) | (pcBellArr < 60.0) | (pcBellArr > 100.0) )
+    if n_out and warningL is not None:
+        warningL.append( 'Huzel Range is Area Ratio 5 to 50, %%Bell 60%% to 100%%, %i values were clamped'%n_out )
+    shape = epsArr.shape
+    epsArr = np.clip( epsArr, 5.0, 50.0 ).ravel()
+    
+    # using curve fits for smoother result (row for each %Bell, column for each eps)
+    ent_vs_pcbArr = np.array( [entFunc(epsArr) for entFunc in entFuncL] )
+    exit_vs_pcbArr = np.array( [exitFunc(epsArr) for exitFunc in exitFuncL] )
+    
+    # interpolate in %Bell (same as my_interp)
+    wpcbArr = pcentBellInterp.get_weights( pcBellArr.ravel() )
+    entArr = np.einsum( 'mi,im->m', wpcbArr, ent_vs_pcbArr ).reshape( shape )
+    exitArr = np.einsum( 'mi,im->m', wpcbArr, exit_vs_pcbArr ).reshape( shape )
+    
+    return entArr, exitArr
+
 
 pcentBellL = [60., 70., 80., 90., 100.]
+pcentBellInterp = QuadInterp( pcentBellL ) # precomputed %Bell interpolant
 
 # curve fits of digitized data
 # ================== ENTRANCE ANGLE ==============
@@ -110,6 +141,7 @@ def my_interp( xval, xL, yL ):
     if xval > xL[-1]:
         return yL[-1]
     
+    from scipy.interpolate import interp1d # import only when needed (slow to import)
     return interp1d( xL , yL, kind=2, fill_value="extrapolate")(xval)
     
 
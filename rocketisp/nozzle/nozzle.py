@@ -1,4 +1,6 @@
 from math import *
+from collections import OrderedDict
+import numpy as np
 from rocketisp.InterpProp_scipy import InterpProp
 from rocketisp.nozzle.six_opt_parab import getOptEntranceExitAngles
 from rocketisp.nozzle.huzel_data import getHuzelEntranceExitAngles
@@ -55,10 +57,12 @@ class Nozzle:
         self.CR        = CR
         
         self.Nsegs = Nsegs
+        self.warningL = [] # e.g. eps or pcentBell outside of Huzel data range
         
         if theta is None or exitAng is None:
             if use_huzel_angles:
-                self.theta, self.exitAng = getHuzelEntranceExitAngles(eps=eps, pcBell=pcentBell)
+                self.theta, self.exitAng = getHuzelEntranceExitAngles(eps=eps, pcBell=pcentBell,
+                                                                      warningL=self.warningL)
             else:
                 self.theta, self.exitAng = getOptEntranceExitAngles(eps=eps, pcentBell=pcentBell)
         else:
@@ -68,16 +72,26 @@ class Nozzle:
         self.forceCone = forceCone # force contour to be conical
         
         # contour is dimensionless... r=r/Rt,  z=z/Rt
-        self.zContour,self.rContour,self.imaCone,self.angCone,self.i_throat = \
-            ref_nozzle( Rup=Rup,  Rd=Rd, eps=eps, theta=self.theta, 
+        #  (identical contour inputs share a cached RefContour)
+        self.refContour = get_ref_contour( Rup=Rup,  Rd=Rd, eps=eps, theta=self.theta, 
             alphaExit=self.exitAng, pcBell=pcentBell, Nsegs=self.Nsegs, 
             cham_conv_ang=cham_conv_ang, Rc=Rc, CR=CR,
             forceCone=forceCone )
+        self.warningL.extend( self.refContour.warningL )
+        
+        self.zContour = list( self.refContour.zL )
+        self.rContour = list( self.refContour.rL )
+        self.imaCone  = self.refContour.imaCone
+        self.angCone  = self.refContour.angCone
+        self.i_throat = self.refContour.i_throat
 
         self.set_abs_Rt( Rt )
         
     def set_abs_Rt(self, Rt ):
-        """Use throat radius to create an absolute contour from the dimensionless contour."""
+        """
+        Use throat radius to create an absolute contour from the dimensionless contour.
+        The contour arrays and the interpolators of the dimensionless contour are scaled by Rt.
+        """
         
         self.Rt = Rt
         self.zExit = self.zContour[-1] * Rt # absolute units
@@ -86,38 +100,41 @@ class Nozzle:
         
         self.Acham = self.At * self.CR
         self.Rcham = sqrt( self.Acham / pi )
-                
+        
+        ref = self.refContour
+        
         # make a z and r contour in absolute unites (scaled by Rt)
-        self.abs_zContour = [z*Rt for z in self.zContour]
-        self.abs_rContour = [r*Rt for r in self.rContour]
-        # ............. create interpolators for nozzle contour .........
-        self.epsContour = [r**2 for r in self.rContour]
+        self.abs_zContourArr = ref.zArr * Rt
+        self.abs_rContourArr = ref.rArr * Rt
+        self.abs_zContour = self.abs_zContourArr.tolist()
+        self.abs_rContour = self.abs_rContourArr.tolist()
+        self.epsContour = list( ref.epsL )
         
         # make contour interpolators
         #  ...NOTE... Z,R and area are in ABSOLUTE  UNITS .....
-        self.z2r_terp    = InterpProp( self.abs_zContour, self.abs_rContour )
-        self.z2area_terp    = InterpProp( self.abs_zContour, [pi*r**2 for r in self.abs_rContour] )
+        self.z2r_terp    = ref.z2r_terp.get_scaled( Rt, Rt )
+        self.z2area_terp = ref.z2_eps_terp.get_scaled( Rt, self.At )
         
-        # NOTICE sqrt of eps for interpolators
-        self.z2_eps_terp  = InterpProp( self.abs_zContour, self.epsContour )
-        self.z2_logeps_terp  = InterpProp( self.abs_zContour, [log(e) for e in self.epsContour] )
-        #self.z2_logarea_terp = InterpProp( self.abs_zContour, [log(self.At*e) for e in self.epsContour] )
+        self.z2_eps_terp    = ref.z2_eps_terp.get_scaled( Rt, 1.0 )
+        self.z2_logeps_terp = ref.z2_logeps_terp.get_scaled( Rt, 1.0 )
         
-        # NOTICE sqrt of eps for interpolators
         # make interpolators for convergent and divergent sections of nozzle
-        self.conv_logeps2z_terp = InterpProp( [log(e) for e in self.epsContour[:self.i_throat+1]],  
-                                              self.abs_zContour[:self.i_throat+1], extrapOK=False )
-        self.div_logeps2z_terp  = InterpProp( [log(e) for e in self.epsContour[self.i_throat:]],    
-                                              self.abs_zContour[self.i_throat:], extrapOK=False )
+        self.conv_logeps2z_terp = ref.conv_logeps2z_terp.get_scaled( 1.0, Rt )
+        self.div_logeps2z_terp  = ref.div_logeps2z_terp.get_scaled( 1.0, Rt )
     
     def get_eps_from_z(self, z):
+        """Return area ratio at z (z can be a float or an array of stations)."""
         # interpolation can fall below 1.0 if not careful
-        return max(1.0, self.z2_eps_terp( z ))
+        if type(z) is float or np.ndim(z) == 0:
+            return max(1.0, self.z2_eps_terp( z ))
+        return np.maximum(1.0, self.z2_eps_terp( z ))
         
     def get_area_from_z(self, z):
+        """Return area at z (z can be a float or an array of stations)."""
         return self.z2area_terp( z )
         
     def get_dadz_from_z(self, z):
+        """Return d(area)/dz at z (z can be a float or an array of stations)."""
         return self.z2area_terp.deriv( z )
     
     def get_conv_zL_epsL(self):
@@ -139,11 +156,13 @@ class Nozzle:
         return self.abs_zContour[self.i_throat+1:], self.epsContour[self.i_throat+1:]
     
     def get_z_from_div_eps(self, eps):
-        log_eps = log(eps)
+        """Return divergent section z at area ratio eps (eps can be a float or an array)."""
+        log_eps = np.log(eps)
         return self.div_logeps2z_terp( log_eps )
     
     def get_z_from_conv_eps(self, eps):
-        log_eps = log(eps)
+        """Return convergent section z at area ratio eps (eps can be a float or an array)."""
+        log_eps = np.log(eps)
         return self.conv_logeps2z_terp( log_eps )
     
     def get_z_from_eps_for_gas(self, gas, eps):
@@ -240,17 +259,51 @@ def bell_net_halfAngle( Rd=1.0, eps=16., pcBell=80., theta=30. ):
     angCone = atan( (rE-rT)/(zE-zT) ) * 180.0 / pi
     return angCone
 
-def ref_nozzle( Rup=2.0,  Rd=1.0, eps=16., theta=30., 
-    alphaExit=10., pcBell=80., Nsegs=30, forceCone=0, 
-    cham_conv_ang=30.0, Rc=1.0, CR=2.5 ):
-    '''DIMENSIONLESS Parabolic Nozzle Contour (Rthroat = 1.0)'''
+def calc_cone_angle( Rd, rE, zE ):
+    """
+    Return cone half angle (deg) of the line from nozzle exit (zE, rE) that is
+    tangent to the downstream throat radius Rd (dimensionless, Rt=1).
+    The tangent point at angle a satisfies zE*sin(a) + (1+Rd-rE)*cos(a) = Rd.
+    If that tangent point is not upstream of the exit (e.g. eps very close to 1), 
+    bisect the range of cone angles.
+    """
+    Rt = 1.0
+    angConeMin = atan( (rE-Rt)/zE ) * 180.0 / pi # solve for cone angle
+    angConeMax = atan( rE/zE ) * 180.0 / pi
     
+    A = zE
+    B = Rt + Rd - rE
+    R = sqrt( A**2 + B**2 )
+    if R > Rd:
+        angCone = ( asin( Rd / R ) - atan2( B, A ) ) * 180.0 / pi
+        if angConeMin <= angCone <= angConeMax and Rd * sinDeg(angCone) < zE:
+            return angCone
+
+    for i in range(20):
+        angCone = (angConeMin + angConeMax) / 2.0
+        zT = Rd * sinDeg(angCone)
+        rT = Rt + Rd*(1.-cosDeg(angCone))
+        angConeTest = atan( (rE-rT)/(zE-zT) ) * 180.0 / pi
+        if angConeTest<angCone:
+            angConeMax = angCone
+        else:
+            angConeMin = angCone
+    return angCone
+
+def ref_nozzle_arr( Rup=2.0,  Rd=1.0, eps=16., theta=30., 
+    alphaExit=10., pcBell=80., Nsegs=30, forceCone=0, 
+    cham_conv_ang=30.0, Rc=1.0, CR=2.5, warningL=None ):
+    """
+    DIMENSIONLESS Parabolic Nozzle Contour (Rthroat = 1.0) as numpy arrays.
+    Any contour points out of sequence are reported in warningL.
+
+    Return zArr, rArr, imaCone, angCone, i_throat
+    """
     Rt=1.0  # ONLY allow dimensionless contour
 
     if eps <= 1.00001:
         eps = 1.00001
-        
-        
+
     zT = Rd * sinDeg(theta)
     rT = Rt + Rd*(1.-cosDeg(theta))
 
@@ -260,55 +313,30 @@ def ref_nozzle( Rup=2.0,  Rd=1.0, eps=16., theta=30.,
     
     angCone = atan( (rE-rT)/(zE-zT) ) * 180.0 / pi
     
-    
     if theta>angCone and theta>alphaExit and not forceCone:
         zQ = (rE + zT*tanDeg(theta) - rT - zE*tanDeg(alphaExit)) / \
              (tanDeg(theta)-tanDeg(alphaExit))
         rQ = rT + (zQ-zT)*tanDeg(theta)
         imaCone = 0
     else: # can't make a parabola, so make a cone
-        angConeMin = atan( (rE-Rt)/zE ) * 180.0 / pi # solve for cone angle
-        angConeMax = atan( rE/zE ) * 180.0 / pi
-        for i in range(20):
-            angCone = (angConeMin + angConeMax) / 2.0
-            zT = Rd * sinDeg(angCone)
-            rT = Rt + Rd*(1.-cosDeg(angCone))
-            angConeTest = atan( (rE-rT)/(zE-zT) ) * 180.0 / pi
-            if angConeTest<angCone:
-                angConeMax = angCone
-            else:
-                angConeMin = angCone
-            zQ = zT + (zE-zT)/2.
-            rQ = rT + (rE-rT)/2.
+        angCone = calc_cone_angle( Rd, rE, zE )
+        zT = Rd * sinDeg(angCone)
+        rT = Rt + Rd*(1.-cosDeg(angCone))
+        zQ = zT + (zE-zT)/2.
+        rQ = rT + (rE-rT)/2.
         imaCone = 1
 
-    
-    z1L = []
-    r1L = []
-    z2L = []
-    r2L = []
-    NsegP1 = Nsegs+1
-    for i in range(1, NsegP1):
-        z1L.append( zT + float(i) * (zQ-zT) / NsegP1 )
-        r1L.append( rT + float(i) * (rQ-rT) / NsegP1 )
-        z2L.append( zQ + float(i) * (zE-zQ) / NsegP1 )
-        r2L.append( rQ + float(i) * (rE-rQ) / NsegP1 )
-
-    # ......... start countour at tangent point (zT, rT) .........
-    rContour = [rT]
-    zContour = [zT]
-            
-    # this approach is more efficient, than the obvious, brute-force approach.
+    # ......... skewed parabola (or cone) from tangent point (zT, rT) to exit .........
+    # each point is on the line between matching points of the lines T-Q and Q-E
     #    (see parabola_v1.py for brute-force approach)
-    # ...works for both parabola and cone using (z1L, r1L, z2L, r2L)
-    for i in range(Nsegs):
-        rContour.append( r1L[i] + float(i+1) * (r2L[i]-r1L[i]) / NsegP1 )
-        zContour.append( z1L[i] + float(i+1) * (z2L[i]-z1L[i]) / NsegP1 )
-    
-    # append portion past tangent point (zT, rT)
-    rContour.append( rE )
-    zContour.append( zE )
-
+    NsegP1 = Nsegs+1
+    iArr = np.arange(1, NsegP1, dtype=np.float64)
+    z1Arr = zT + iArr * (zQ-zT) / NsegP1
+    r1Arr = rT + iArr * (rQ-rT) / NsegP1
+    z2Arr = zQ + iArr * (zE-zQ) / NsegP1
+    r2Arr = rQ + iArr * (rE-rQ) / NsegP1
+    zParabArr = z1Arr + iArr * (z2Arr-z1Arr) / NsegP1
+    rParabArr = r1Arr + iArr * (r2Arr-r1Arr) / NsegP1
 
     # ........ set integer angle steps .........
     idang = int(5)
@@ -322,8 +350,6 @@ def ref_nozzle( Rup=2.0,  Rd=1.0, eps=16., theta=30.,
     htSeg = Rchm - Rup*(1.0-cosA) - Rc*(1.0-cosA) - Rt # ht of linear segment
     if htSeg < 0.0:
         # radii are too big for CR... reduce radii
-        htSeg = 0.1 * (Rchm - Rt) # let linear segment be 10% of ht 
-        
         hr = 0.9 * (Rchm - Rt) / 2.0 # make radii equal
         Rup = hr / (1.0-cosA)
         Rc  = Rup
@@ -332,75 +358,217 @@ def ref_nozzle( Rup=2.0,  Rd=1.0, eps=16., theta=30.,
     wdSeg = htSeg / tanA
     
     zstart_conv = -( (Rc + Rup) * sinA + wdSeg )
-    zconvL = []
-    rconvL = []
-    
-    ang = 0
-    while ang < cham_conv_ang-1:
-        zconvL.append( zstart_conv + Rc*sinDeg(ang) )
-        rconvL.append( Rchm - Rc*(1.-cosDeg(ang)) )
-        ang += idang
-
-    zconvL.append( zstart_conv + Rc*sinDeg(cham_conv_ang) )
-    rconvL.append( Rchm - Rc*(1.-cosDeg(cham_conv_ang)) )
+
+    # integer angle steps below cham_conv_ang-1, then cham_conv_ang
+    angConvArr = np.append( np.arange(0, cham_conv_ang-1, idang, dtype=np.float64), cham_conv_ang )
+    zconvArr = zstart_conv + Rc*np.sin( angConvArr*pi/180.0 )
+    rconvArr = Rchm - Rc*(1.-np.cos( angConvArr*pi/180.0 ))
     
     # make a short linear section
-    zconvL.append( zconvL[-1] + wdSeg/2.0 )
-    rconvL.append( rconvL[-1] - htSeg/2.0 )
-
-    #print( 'zconvL:', zconvL)
-    #print( 'rconvL:', rconvL)
+    zconvArr = np.append( zconvArr, zconvArr[-1] + wdSeg/2.0 )
+    rconvArr = np.append( rconvArr, rconvArr[-1] - htSeg/2.0 )
 
     # ......... create throat section (Rup and Rd) .........
-    zthrtL = []
-    rthrtL = []
     if imaCone:
         throat_angle = angCone
     else:
         throat_angle = theta
         
     angStart = -cham_conv_ang
-    angL = [angStart]
     iang = round( angStart )
     if abs( iang - angStart ) < float(idang) / 2.0:
         iang += idang
-    angL.extend( [i for i in range(iang, 0, idang) ] ) # note zero is omitted
-    for ang in angL:
-        zthrtL.append( Rup*sinDeg(ang)*Rt )
-        rthrtL.append( (1.0 + Rup*(1.-cosDeg(ang)))*Rt )
-
-    i_throat = len( zthrtL ) + len(zconvL) # save index of throat position
-    # start at throat
-    ang = 0.0
-    while ang<throat_angle: # omit tangent point. (i.e. use "<" instead of "<=")
-        zthrtL.append( Rd*sinDeg(ang)*Rt )
-        rthrtL.append( (1.0 + Rd*(1.-cosDeg(ang)))*Rt )
-        ang += idang
-
-    #print( '\nzthrtL:', zthrtL)
-    #print( 'rthrtL:', rthrtL)
+    # note zero is omitted
+    angUpArr = np.append( angStart, np.arange(iang, 0, idang, dtype=np.float64) ) * pi/180.0
+    
+    # start at throat, omit tangent point. (i.e. angles < throat_angle)
+    angDownArr = np.arange(0, throat_angle, idang, dtype=np.float64) * pi/180.0
+
+    zthrtArr = np.concatenate( (Rup*np.sin(angUpArr)*Rt, Rd*np.sin(angDownArr)*Rt) )
+    rthrtArr = np.concatenate( ((1.0 + Rup*(1.-np.cos(angUpArr)))*Rt, 
+                                (1.0 + Rd*(1.-np.cos(angDownArr)))*Rt) )
+
+    i_throat = len( angUpArr ) + len( zconvArr ) # save index of throat position
 
     # ......... connect all the pieces .........
-    rContour = rconvL + rthrtL + rContour
-    zContour = zconvL + zthrtL + zContour
+    zArr = np.concatenate( (zconvArr, zthrtArr, [zT], zParabArr[:Nsegs], [zE]) )
+    rArr = np.concatenate( (rconvArr, rthrtArr, [rT], rParabArr[:Nsegs], [rE]) )
+    
+    # R decreases up to throat and increases after it, Z always increases.
+    if warningL is not None:
+        dzArr = np.diff( zArr )
+        drArr = np.diff( rArr )
+        drArr[:i_throat] = -drArr[:i_throat]
+        for i in np.nonzero( drArr <= 0.0 )[0] + 1:
+            warningL.append( 'R out of sequence at i=%i, R[i-1]=%g, R[i]=%g '%(i,rArr[i-1], rArr[i] ))
+        for i in np.nonzero( dzArr <= 0.0 )[0] + 1:
+            warningL.append( 'Z out of sequence at i=%i, Z[i-1]=%g, Z[i]=%g '%(i,zArr[i-1], zArr[i] ))
+    
+    return zArr, rArr, imaCone, angCone, i_throat
+
+def ref_nozzle( Rup=2.0,  Rd=1.0, eps=16., theta=30., 
+    alphaExit=10., pcBell=80., Nsegs=30, forceCone=0, 
+    cham_conv_ang=30.0, Rc=1.0, CR=2.5, warningL=None ):
+    '''DIMENSIONLESS Parabolic Nozzle Contour (Rthroat = 1.0)'''
+    
+    zArr, rArr, imaCone, angCone, i_throat = \
+        ref_nozzle_arr( Rup=Rup, Rd=Rd, eps=eps, theta=theta, alphaExit=alphaExit, 
+                        pcBell=pcBell, Nsegs=Nsegs, forceCone=forceCone, 
+                        cham_conv_ang=cham_conv_ang, Rc=Rc, CR=CR, warningL=warningL )
+    
+    return zArr.tolist(), rArr.tolist(), imaCone, angCone, i_throat
+
+class RefContour(object):
+    """
+    Dimensionless (Rt=1) nozzle contour and its interpolators.
+    Held in the contour cache and shared by all Nozzle objects with the same
+    contour inputs, so its arrays are read-only.
+
+    :param zArr: dimensionless axial positions (z/Rt)
+    :param rArr: dimensionless radii (r/Rt)
+    :param imaCone: flag, 1 if contour is conical
+    :param angCone: deg, half angle of cone (or net half angle of bell)
+    :param i_throat: index of throat in zArr, rArr
+    :param warningL: list of warnings made while creating the contour
+    :type zArr: numpy.ndarray
+    :type rArr: numpy.ndarray
+    :type imaCone: int
+    :type angCone: float
+    :type i_throat: int
+    :type warningL: list
+    :return: RefContour object
+    :rtype: RefContour
+    """
+
+    def __init__(self, zArr, rArr, imaCone, angCone, i_throat, warningL):
+        self.imaCone  = imaCone
+        self.angCone  = angCone
+        self.i_throat = i_throat
+        self.warningL = warningL
+        
+        self.zArr      = zArr
+        self.rArr      = rArr
+        self.epsArr    = rArr**2
+        self.logepsArr = np.log( self.epsArr )
+        for arr in [self.zArr, self.rArr, self.epsArr, self.logepsArr]:
+            arr.flags.writeable = False
+        
+        self.zL   = zArr.tolist()
+        self.rL   = rArr.tolist()
+        self.epsL = self.epsArr.tolist()
+        
+        # dimensionless interpolators, Nozzle scales them with Rt
+        self.z2r_terp       = InterpProp( self.zArr, self.rArr )
+        self.z2_eps_terp    = InterpProp( self.zArr, self.epsArr )
+        self.z2_logeps_terp = InterpProp( self.zArr, self.logepsArr )
+        self.conv_logeps2z_terp = InterpProp( self.logepsArr[:i_throat+1],  
+                                              self.zArr[:i_throat+1], extrapOK=False )
+        self.div_logeps2z_terp  = InterpProp( self.logepsArr[i_throat:],    
+                                              self.zArr[i_throat:], extrapOK=False )
+
+class RefContourCache(object):
+    """
+    Least-recently-used cache of RefContour objects with hit/miss counters.
+
+    :param maxsize: maximum number of contours held in cache
+    :type maxsize: int
+    :return: RefContourCache object
+    :rtype: RefContourCache
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.contourD = OrderedDict() # index=key tuple, value=RefContour
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len( self.contourD )
+
+    def get(self, key):
+        """Return cached RefContour for key or None if not in cache."""
+        try:
+            refContour = self.contourD[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.contourD.move_to_end( key )
+        self.hits += 1
+        return refContour
+
+    def set(self, key, refContour):
+        """Save RefContour to cache, discarding the least recently used contour(s) if full."""
+        self.contourD[key] = refContour
+        self.contourD.move_to_end( key )
+        while len(self.contourD) > self.maxsize:
+            self.contourD.popitem( last=False )
+
+    def set_maxsize(self, maxsize):
+        """Change the maximum number of contours held in cache."""
+        self.maxsize = max(1, int(maxsize))
+        while len(self.contourD) > self.maxsize:
+            self.contourD.popitem( last=False )
+
+    def clear(self):
+        """Empty the cache and reset the hit/miss counters."""
+        self.contourD.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        """Return dictionary of cache statistics."""
+        n_calls = self.hits + self.misses
+        if n_calls > 0:
+            hit_rate = float(self.hits) / n_calls
+        else:
+            hit_rate = 0.0
+        return {'hits':self.hits, 'misses':self.misses, 'size':len(self.contourD),
+                'maxsize':self.maxsize, 'hit_rate':hit_rate}
+
+# one cache shared by all Nozzle objects
+CONTOUR_CACHE = RefContourCache()
+
+def get_contour_cache_stats():
+    """Return dictionary of hits, misses, size, maxsize and hit_rate of the shared contour cache."""
+    return CONTOUR_CACHE.get_stats()
+
+def clear_contour_cache():
+    """Empty the shared contour cache and reset its hit/miss counters."""
+    CONTOUR_CACHE.clear()
+
+def set_contour_cache_size( maxsize ):
+    """Set the maximum number of contours held in the shared contour cache."""
+    CONTOUR_CACHE.set_maxsize( maxsize )
+
+def get_ref_contour( Rup=2.0,  Rd=1.0, eps=16., theta=30., 
+    alphaExit=10., pcBell=80., Nsegs=30, forceCone=0, 
+    cham_conv_ang=30.0, Rc=1.0, CR=2.5 ):
+    """
+    Return the RefContour for the contour inputs from the shared contour cache,
+    creating it with ref_nozzle_arr if it is not already in the cache.
+    Floating point inputs are canonicalized to 12 significant figures.
+    """
+    if eps <= 1.00001:
+        eps = 1.00001
     
-    #print( 'i_throat=%i,  R at i_throat=%g'%(i_throat, rContour[i_throat]) )
-    for i in range(1, i_throat+1):
-        if rContour[i-1] <= rContour[i]:
-            print( 'R out of sequence at i=%i, R[i-1]=%g, R[i]=%g '%(i,rContour[i-1], rContour[i] ))
-            
-        if zContour[i-1] >= zContour[i]:
-            print( 'Z out of sequence at i=%i, Z[i-1]=%g, Z[i]=%g '%(i,zContour[i-1], zContour[i] ))
+    def canon( value ):
+        return float( '%.12g'%value )
     
-    for i in range(i_throat+1, len(rContour)):
-        if rContour[i-1] >= rContour[i]:
-            print( 'R out of sequence at i=%i, R[i-1]=%g, R[i]=%g '%(i,rContour[i-1], rContour[i] ))
-            
-        if zContour[i-1] >= zContour[i]:
-            print( 'Z out of sequence at i=%i, Z[i-1]=%g, Z[i]=%g '%(i,zContour[i-1], zContour[i] ))
+    key = tuple( [canon(v) for v in (Rup, Rd, eps, theta, alphaExit, pcBell, cham_conv_ang, Rc, CR)] ) +\
+          ( int(Nsegs), bool(forceCone) )
     
+    refContour = CONTOUR_CACHE.get( key )
+    if refContour is None:
+        warningL = []
+        zArr, rArr, imaCone, angCone, i_throat = \
+            ref_nozzle_arr( Rup=Rup,  Rd=Rd, eps=eps, theta=theta, alphaExit=alphaExit, 
+                            pcBell=pcBell, Nsegs=Nsegs, forceCone=forceCone, 
+                            cham_conv_ang=cham_conv_ang, Rc=Rc, CR=CR, warningL=warningL )
+        refContour = RefContour( zArr, rArr, imaCone, angCone, i_throat, warningL )
+        CONTOUR_CACHE.set( key, refContour )
     
-    return zContour,rContour,imaCone,angCone,i_throat
+    return refContour
        
 
 if __name__ == "__main__": #Self Test
@@ -0,0 +1,182 @@
+r"""
+Precomputed quadratic spline interpolation on a fixed set of points.
+
+QuadInterp gives the same result as scipy.interpolate.interp1d(xL, yL, kind=2)
+for x inside xL, and clamps x outside of xL to the end values (as my_interp in
+six_opt_parab.py and huzel_data.py does).  The spline coefficients of the data are
+found once (numpy only), so an evaluation only sums the 3 quadratic B-spline
+basis functions that are non-zero at x.
+
+QuadInterp2D is the tensor product of two QuadInterp, i.e. the same result as
+interpolating each row of a table in y and then interpolating those values in x.
+Each evaluation sums 3 x 3 basis function products.
+
+Both have a fast scalar path (python floats) and an array path (numpy arrays
+of any shape, broadcast together).
+
+For example::
+
+    qi = QuadInterp( [60., 70., 80., 90., 100.], yL )
+    y = qi.eval_scalar( 75.0 )
+    yArr = qi( pcentBellArr )  # same as interp1d(xL, yL, kind=2)(pcentBellArr)
+"""
+import numpy as np
+
+def calc_basis_scalar( t, n, x ):
+    """
+    Return (j, [N0, N1, N2]) for knots t and n basis functions, where N0, N1, N2
+    are the values of the quadratic B-spline basis functions j-2, j-1, j at x.
+    x outside of the knots is clamped.
+    """
+    x = min( max(x, t[0]), t[-1] )
+    j = 2
+    while j < n-1 and x >= t[j+1]:
+        j += 1
+
+    # Cox-de Boor recursion
+    N = [1.0, 0.0, 0.0]
+    left = [0.0, x - t[j], x - t[j-1]]
+    right = [0.0, t[j+1] - x, t[j+2] - x]
+    for r in (1,2):
+        saved = 0.0
+        for s in range(r):
+            temp = N[s] / (right[s+1] + left[r-s])
+            N[s] = saved + right[s+1] * temp
+            saved = left[r-s] * temp
+        N[r] = saved
+    return j, N
+
+def calc_basis_arr( tArr, n, xArr ):
+    """Array version of calc_basis_scalar, return (jArr, [N0Arr, N1Arr, N2Arr])."""
+    x = np.clip( np.asarray(xArr, dtype=np.float64), tArr[0], tArr[-1] )
+    j = np.clip( np.searchsorted(tArr, x, side='right') - 1, 2, n-1 )
+
+    N = [np.ones_like(x), np.zeros_like(x), np.zeros_like(x)]
+    left = [None, x - tArr[j], x - tArr[j-1]]
+    right = [None, tArr[j+1] - x, tArr[j+2] - x]
+    for r in (1,2):
+        saved = np.zeros_like(x)
+        for s in range(r):
+            temp = N[s] / (right[s+1] + left[r-s])
+            N[s] = saved + right[s+1] * temp
+            saved = left[r-s] * temp
+        N[r] = saved
+    return j, N
+
+class QuadInterp(object):
+    """
+    Quadratic spline interpolation of yL at points xL (x outside of xL is clamped).
+
+    :param xL: increasing interpolation points (at least 3)
+    :param yL: values at xL (None=only use get_weights)
+    :type xL: list
+    :type yL: list
+    :return: QuadInterp object
+    :rtype: QuadInterp
+    """
+
+    def __init__(self, xL, yL=None):
+        self.xArr = np.array( xL, dtype=np.float64 )
+        self.n = n = len( self.xArr )
+        if n < 3 or np.any( np.diff(self.xArr) <= 0.0 ):
+            raise Exception('in QuadInterp, xL must have at least 3 increasing values')
+
+        # same knots as scipy make_interp_spline (used by interp1d kind=2),
+        # interior knots are at midpoints of the interior points
+        x = self.xArr
+        self.tArr = np.concatenate( ([x[0]]*3, 0.5*(x[1:n-2] + x[2:n-1]), [x[-1]]*3) )
+        self.tL = self.tArr.tolist()
+
+        # spline coefficients of data yL = invArr @ yL
+        self.invArr = np.linalg.inv( self.get_basis( x ) )
+        self.invL = self.invArr.tolist()
+
+        if yL is not None:
+            self.coefArr = self.invArr @ np.asarray(yL, dtype=np.float64)
+            self.coefL = self.coefArr.tolist()
+
+    def get_basis(self, xArr):
+        """Return array of quadratic B-spline basis values, shape=(len(xArr), len(xL))."""
+        xArr = np.atleast_1d( np.asarray(xArr, dtype=np.float64) ).ravel()
+        j, N = calc_basis_arr( self.tArr, self.n, xArr )
+
+        basisArr = np.zeros( (len(xArr), self.n) )
+        rowArr = np.arange( len(xArr) )
+        for s in range(3):
+            basisArr[rowArr, j-2+s] = N[s]
+        return basisArr
+
+    def get_weights(self, xArr):
+        """
+        Return interpolation weights, shape=(len(xArr), len(xL)), so that the
+        interpolated value of any data yL is get_weights(xArr) @ yL.
+        """
+        return self.get_basis( xArr ) @ self.invArr
+
+    def eval_scalar(self, x):
+        """Return interpolated value at x (python float)."""
+        j, N = calc_basis_scalar( self.tL, self.n, x )
+        c = self.coefL
+        return N[0]*c[j-2] + N[1]*c[j-1] + N[2]*c[j]
+
+    def __call__(self, xArr):
+        """Return array of interpolated values at xArr (same shape as xArr)."""
+        j, N = calc_basis_arr( self.tArr, self.n, xArr )
+        c = self.coefArr
+        return N[0]*c[j-2] + N[1]*c[j-1] + N[2]*c[j]
+
+class QuadInterp2D(object):
+    """
+    Tensor product quadratic spline interpolation of a table zArr at points xL, yL
+    (same as interpolating each row of zArr in y, then those values in x).
+    x and y outside of xL and yL are clamped.
+
+    :param xL: increasing interpolation points of table rows (at least 3)
+    :param yL: increasing interpolation points of table columns (at least 3)
+    :param zArr: table values, shape=(len(xL), len(yL))
+    :type xL: list
+    :type yL: list
+    :type zArr: numpy.ndarray
+    :return: QuadInterp2D object
+    :rtype: QuadInterp2D
+    """
+
+    def __init__(self, xL, yL, zArr):
+        self.xInterp = QuadInterp( xL )
+        self.yInterp = QuadInterp( yL )
+
+        zArr = np.asarray( zArr, dtype=np.float64 )
+        if zArr.shape != (len(xL), len(yL)):
+            raise Exception('in QuadInterp2D, table shape must be (%i, %i)'%(len(xL), len(yL)))
+
+        self.coefArr = self.xInterp.invArr @ zArr @ self.yInterp.invArr.T
+        self.coefL = self.coefArr.tolist()
+
+    def eval_scalar(self, x, y):
+        """Return interpolated value at (x, y) (python float)."""
+        i, Nx = calc_basis_scalar( self.xInterp.tL, self.xInterp.n, x )
+        j, Ny = calc_basis_scalar( self.yInterp.tL, self.yInterp.n, y )
+        z = 0.0
+        for r in range(3):
+            row = self.coefL[i-2+r]
+            z += Nx[r] * (Ny[0]*row[j-2] + Ny[1]*row[j-1] + Ny[2]*row[j])
+        return z
+
+    def __call__(self, xArr, yArr):
+        """Return array of interpolated values at xArr, yArr (broadcast together)."""
+        xArr, yArr = np.broadcast_arrays( np.asarray(xArr, dtype=np.float64),
+                                          np.asarray(yArr, dtype=np.float64) )
+        i, Nx = calc_basis_arr( self.xInterp.tArr, self.xInterp.n, xArr )
+        j, Ny = calc_basis_arr( self.yInterp.tArr, self.yInterp.n, yArr )
+        c = self.coefArr
+        z = np.zeros( xArr.shape )
+        for r in range(3):
+            for s in range(3):
+                z += Nx[r] * Ny[s] * c[i-2+r, j-2+s]
+        return z
+
+
+if __name__ == "__main__":
+    qi = QuadInterp( [60.0, 70.0, 80.0, 90.0, 100.0, 120.0], [0.98, 0.988, 0.994, 0.997, 0.999, 0.9998] )
+    for x in [55.0, 60.0, 65.0, 75.0, 110.0, 120.0, 125.0]:
+        print( 'x=%6.1f  y=%.10f  y_arr=%.10f'%(x, qi.eval_scalar(x), qi(x)) )
@@ -1,10 +1,14 @@
 from math import log10
-from scipy.interpolate import interp1d
+import numpy as np
+from rocketisp.nozzle.quad_interp import QuadInterp2D
 
 """
 Digitized data from running 6 common propellant combinations
 with given eps, %Bell with the NCO option to find optimum entrance
 and exit angles for parabolic nozzle..
+
+The tables are precomputed as bivariate quadratic interpolants in 
+(log10(eps), pcentBell) that accept numpy arrays (see quad_interp.py).
 """
 
 def getOptEntranceExitAngles(eps=20.0, pcentBell=80.0):
@@ -17,38 +21,34 @@ def getOptEntranceExitAngles(eps=20.0, pcentBell=80.0):
            calcOptExit(eps=eps, pcentBell=pcentBell)
    
    
+def getOptEntranceExitAngles_arr(epsArr, pcentBellArr):
+    """
+    Array version of getOptEntranceExitAngles, epsArr and pcentBellArr are broadcast together.
+    Return arrays of entrance and exit angles (deg).
+    """
+    return calcOptEntrance_arr(epsArr, pcentBellArr), calcOptExit_arr(epsArr, pcentBellArr)
+   
 def calcOptExit(eps=20.0, pcentBell=80.0):
     """
     Return the exit angle of an optimum parabolic nozzle
     based on running optimum parabolic nozzle for 6 common propellant combinations
     """
-    
-    exit_vs_pcbL = []
-            
-    leps = log10(eps)
-    for i in range( len(pcentBellL) ):
-        exit_vs_pcbL.append( my_interp( leps, log10_epsL, exitAngLL[i] ) )
+    return exitAngInterp.eval_scalar( pcentBell, log10(eps) )
 
-    exitAng = my_interp( pcentBell, pcentBellL, exit_vs_pcbL )
-    
-    return float(exitAng)
-   
+def calcOptExit_arr(epsArr, pcentBellArr):
+    """Array version of calcOptExit, epsArr and pcentBellArr are broadcast together."""
+    return exitAngInterp( pcentBellArr, np.log10(epsArr) )
 
 def calcOptEntrance(eps=20.0, pcentBell=80.0):
     """
     Return the entrance angle of an optimum parabolic nozzle
     based on running optimum parabolic nozzle for 6 common propellant combinations
     """
+    return entranceAngInterp.eval_scalar( pcentBell, log10(eps) )
 
-    entrance_vs_pcbL = []
-    
-    leps = log10(eps)
-    for i in range( len(pcentBellL) ):
-        entrance_vs_pcbL.append( my_interp( leps, log10_epsL, entranceAngLL[i] ) )
-
-    entranceAng = my_interp( pcentBell, pcentBellL, entrance_vs_pcbL )
-    
-    return float(entranceAng)
+def calcOptEntrance_arr(epsArr, pcentBellArr):
+    """Array version of calcOptEntrance, epsArr and pcentBellArr are broadcast together."""
+    return entranceAngInterp( pcentBellArr, np.log10(epsArr) )
 
 pcentBellL = [60.0, 70.0, 80.0, 90.0, 100.0, 110.0, 120.0]
 epsL       = [2.0, 3.0, 4.0, 6.0, 8.0, 12.0, 16.0, 32.0, 64.0, 128.0, 254.0, 512.0]
@@ -94,6 +94,10 @@ exitAngLL.append( [13.26566231196382, 9.665184051022285, 7.720242081765482, 5.71
 # exit angle for %Bell = 120
 exitAngLL.append( [10.988423990106986, 7.781031684792526, 6.059876205104874, 4.300772361862246, 3.452980528594279, 2.707462070998648, 2.4246071430417278, 2.2316262309137516, 2.1309079746768824, 2.1309079746768824, 2.1309079746768824, 2.1309079746768824] )
 
+# precomputed interpolants of the tables in (pcentBell, log10(eps)), values outside of tables are clamped
+# (same as interpolating each %Bell row in log10(eps) and then those values in %Bell with my_interp)
+entranceAngInterp = QuadInterp2D( pcentBellL, log10_epsL, entranceAngLL )
+exitAngInterp = QuadInterp2D( pcentBellL, log10_epsL, exitAngLL )
 
 def my_interp( xval, xL, yL ):
 
@@ -102,6 +106,7 @@ def my_interp( xval, xL, yL ):
     if xval > xL[-1]:
         return yL[-1]
     
+    from scipy.interpolate import interp1d # import only when needed (slow to import)
     return interp1d( xL , yL, kind=2, fill_value="extrapolate")(xval)
     
     # ??? fill_value with tuple crashed ???
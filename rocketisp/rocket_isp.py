@@ -35,26 +35,25 @@ __email__ = "cet@appliedpython.com"
 __status__ = "4 - Beta" # "3 - Alpha", "4 - Beta", "5 - Production/Stable"
 
 from math import pi
-from scipy import optimize
 import numpy as np
 import io
 import base64
 
-from rocketprops.rocket_prop import get_prop
-from rocketprops.unit_conv_data import get_value # for any units conversions
 from rocketisp.efficiency.eff_pulsing import eff_pulse
 from rocketisp.efficiency.eff_divergence import eff_div
 from rocketisp.efficiency.effBL_NASA_SP8120 import eff_bl_NASA, regen_corrected_bl
 
 from rocketisp.efficiency.calc_full_pcentLossBL import calc_pcentLossBL
-from rocketisp.efficiency.calc_noz_kinetics import calc_IspODK
+from rocketisp.efficiency.calc_noz_kinetics import calc_IspODK, calc_IspODK_arr
 
 #from rocketisp.nozzle.cd_throat import get_Cd
 from rocketisp.nozzle.calc_full_Cd import calc_Cd
 from rocketisp.stream_tubes import CoreStream
 from rocketisp.efficiencies import Efficiencies
-from rocketisp.goldSearch import search_max, search_min
-from rocketisp.mr_range import MRrange
+from rocketisp.goldSearch import brent_max
+from rocketisp.mr_range import get_MRrange
+from rocketisp.batch_eval import evaluate_batch, precompute_mlp_models
+from rocketisp.stage_tracker import StageTracker, get_counts_str
 from rocketisp.cast import max_precision_float_str
 from rocketisp.HTML_supt import getHead, getFooter
 from rocketisp.HTMLTags import TABLE, TR, TD, SPAN
@@ -132,13 +131,15 @@ class RocketThruster(object):
         return getattr(self, name ) # let it raise exception if no name attr.
 
     def __init__(self, name='RocketIsp Thruster',
-                 coreObj=CoreStream(), injObj=None, noz_regen_eps=1.0, 
+                 coreObj=None, injObj=None, noz_regen_eps=1.0, 
                  pulse_sec=float('inf'), pulse_quality=0.8,
                  isRegenCham=False, calc_CdThroat=True):
         """
         Calculate delivered thrust chamber Isp by simplified JANNAF method.
         """
         self.name          = name
+        if coreObj is None:
+            coreObj = CoreStream()
         self.coreObj       = coreObj
         self.geomObj       = coreObj.geomObj
         self.injObj        = injObj
@@ -151,7 +152,11 @@ class RocketThruster(object):
         self.isRegenCham    = isRegenCham   
 
         self.calc_CdThroat  = calc_CdThroat
+        self.n_evals_mr_search = 0 # number of evaluations used by last set_mr_to_max_ispdel
+        self.is_convergedArr = None # convergence of each thrust level of last scale_Rt_to_Thrust_batch
+        self.batch_warningL = []    # list of warnings of last scale_Rt_to_Thrust_batch
         
+        self.stages = StageTracker() # skips efficiency models if their inputs are unchanged
                 
         self.calc_all_eff()
     
@@ -174,26 +179,59 @@ class RocketThruster(object):
     
     def set_eps_to_equal_pexit(self, Pexit_psia=14.7):
         """
-        Iterate on Area Ratio to find desired Pexit
+        Set Area Ratio to give desired Pexit (uses CEA to solve for eps directly)
+        
+        :param Pexit_psia: psia, desired nozzle exit pressure
+        :type Pexit_psia: float
+        :return: area ratio that gives Pexit_psia
+        :rtype: float
+        """
+        eps_opt = self.get_eps_at_pexit( Pexit_psia=Pexit_psia )
+        
+        self.coreObj.geomObj.reset_attr('eps', eps_opt, re_evaluate=True)
+        self.calc_all_eff()
+        
+        return eps_opt
+    
+    def get_eps_at_pexit(self, Pexit_psia=14.7):
+        """
+        Return the Area Ratio that gives desired Pexit at current Pc and MRcore.
+        (RocketThruster is not changed)
+        
+        :param Pexit_psia: psia, desired nozzle exit pressure
+        :type Pexit_psia: float
+        :return: area ratio that gives Pexit_psia
+        :rtype: float
+        """
+        return float( self.get_eps_at_pexit_arr( [Pexit_psia] )[0] )
+    
+    def get_eps_at_pexit_arr(self, Pexit_psiaArr):
+        """
+        Return array of the Area Ratios that give each desired Pexit at current Pc and MRcore.
+        (RocketThruster is not changed... each unique Pc/Pexit runs CEA once)
+        
+        :param Pexit_psiaArr: psia, list or array of desired nozzle exit pressures
+        :type Pexit_psiaArr: numpy.ndarray
+        :return: area ratio for each value in Pexit_psiaArr
+        :rtype: numpy.ndarray
         """
         ceaObj = self.coreObj.ceaObj
+        Pc = self.coreObj.Pc
         MR = self.coreObj.MRcore
-        eps = self.coreObj.geomObj.eps
         
-        eps_min = 2.0
-        eps_max = 200.0
+        PexitArr = np.asarray( Pexit_psiaArr, dtype=np.float64 )
+        PcOvPeArr = Pc / PexitArr
         
-        def get_diff_sq( eps ):
+        # nozzle exit pressure must be below throat pressure
+        PcOvPt = ceaObj.get_PcOvPe( Pc=Pc, MR=MR, eps=1.0 )
+        if np.any( PcOvPeArr <= PcOvPt ):
+            raise Exception('in get_eps_at_pexit, Pexit must be less than throat pressure (%g psia)'%(Pc/PcOvPt))
         
-            Pexit = self.coreObj.Pc / ceaObj.get_PcOvPe( Pc=self.coreObj.Pc, MR=MR, eps=eps)
-            return (Pexit - Pexit_psia)**2
-
-            
-        eps_opt, diff_min  = search_min(get_diff_sq, eps_min, eps_max, tol=1.0E-9)
-        self.coreObj.geomObj.reset_attr('eps', eps_opt, re_evaluate=True)
-        self.calc_all_eff()
+        epsD = {} # index=PcOvPe, value=eps
+        for PcOvPe in set( PcOvPeArr.ravel().tolist() ):
+            epsD[PcOvPe] = ceaObj.get_eps_at_PcOvPe( Pc=Pc, MR=MR, PcOvPe=PcOvPe )
         
-        return eps_opt
+        return np.array( [epsD[PcOvPe] for PcOvPe in PcOvPeArr.ravel().tolist()] ).reshape( PexitArr.shape )
     
     def set_MRthruster(self, MRthruster=1.6):
         """
@@ -204,30 +242,63 @@ class RocketThruster(object):
         self.calc_all_eff()
         
     
-    def set_mr_to_max_ispdel(self):
+    def set_mr_to_max_ispdel(self, MRstart=None, MRlo=None, MRhi=None, tol=0.01):
         """
         Iterate on MRcore to find the peak Isp
-        """
-        # get MR for equivalence ratio = 1
-        MRstart = self.coreObj.ceaObj.getMRforER( ERr=1.0 )
         
-        MRlo = MRstart / 3.0
-        MRhi = MRstart * 3.0
+        :param MRstart: warm start guess of peak MRcore (e.g. peak MRcore of a nearby design)
+        :param MRlo: lower limit of MRcore search (default is MRstoic/3, or MRstart/1.5 with MRstart)
+        :param MRhi: upper limit of MRcore search (default is MRstoic*3, or MRstart*1.5 with MRstart)
+        :param tol: tolerance on MRcore at peak Isp
+        :type MRstart: float
+        :type MRlo: float
+        :type MRhi: float
+        :type tol: float
+        :return: MRcore at peak Isp (number of evaluations is saved in self.n_evals_mr_search)
+        :rtype: float
+        """
+        if MRstart is None:
+            # get MR for equivalence ratio = 1
+            MRstoic = self.coreObj.ceaObj.getMRforER( ERr=1.0 )
+            if MRlo is None:
+                MRlo = MRstoic / 3.0
+            if MRhi is None:
+                MRhi = MRstoic * 3.0
+        else:
+            # warm start allows a tighter bracket
+            if MRlo is None:
+                MRlo = MRstart / 1.5
+            if MRhi is None:
+                MRhi = MRstart * 1.5
         
         def get_ispdel( MR ):
             self.coreObj.reset_attr('MRcore', MR, re_evaluate=True)
             self.calc_all_eff()
             return self.coreObj.IspDel
             
-        MRcore_opt, IspMax  = search_max(get_ispdel, MRlo, MRhi, tol=0.01)
+        MRcore_opt, IspMax, n_evals  = brent_max(get_ispdel, MRlo, MRhi, tol=tol, x_start=MRstart)
+        
+        # if peak is on the edge of a user or warm start bracket, widen the bracket and search again.
+        for _ in range(10):
+            if MRcore_opt - MRlo <= tol and MRlo > tol:
+                MRlo, MRhi = MRlo / 2.0, MRlo + tol
+            elif MRhi - MRcore_opt <= tol:
+                MRlo, MRhi = MRhi - tol, MRhi * 2.0
+            else:
+                break
+            MRcore_opt, IspMax, n = brent_max(get_ispdel, MRlo, MRhi, tol=tol, x_start=MRcore_opt)
+            n_evals += n
+        
         #print('MRcore_opt=%g, IspMax=%g sec'%(MRcore_opt, IspMax) )
-        # use MRcore_opt to reset everything
-        self.coreObj.reset_attr('MRcore', MRcore_opt, re_evaluate=True)
-        self.calc_all_eff()
+        self.n_evals_mr_search = n_evals
+        
+        # use MRcore_opt to reset everything (unless last evaluation was at MRcore_opt)
+        if self.coreObj.MRcore != MRcore_opt:
+            self.coreObj.reset_attr('MRcore', MRcore_opt, re_evaluate=True)
+            self.calc_all_eff()
         
         return MRcore_opt
 
-    
     def scale_Rt_to_Thrust(self, ThrustLbf=500.0, Pamb=0.0, use_scipy=False):
         """
         Adjust throat size in order to get total thrust at specified ambient pressure exactly
@@ -258,6 +329,7 @@ class RocketThruster(object):
             Rt_min = Rt_guess/1.4
             Rt_max = Rt_guess*1.4
             
+            from scipy import optimize # import only when needed (slow to import)
             sol = optimize.root_scalar(f_diff, x0=Rt_guess, bracket=[Rt_min, Rt_max], 
                                        xtol=ThrustLbf/1.0E8, method='brentq')
             #print('sol.root=%g, sol.iterations=%g, sol.function_calls=%g'%(sol.root, sol.iterations, sol.function_calls))
@@ -280,20 +352,116 @@ class RocketThruster(object):
         self.coreObj.reset_attr( 'Pamb', Pamb_save, re_evaluate=True)
         
     
+    def scale_Rt_to_Thrust_batch(self, ThrustLbfL, Pamb=0.0, max_iter=10):
+        """
+        Return array of throat radii that give each total thrust in ThrustLbfL at ambient pressure Pamb.
+        All thrust levels are iterated together. CEA results (fixed Pc, MRcore, eps) are
+        calculated once and the Rthrt dependent models (Cd, BL and Kin) are evaluated
+        for all thrust levels in one array pass per iteration.
+        Rthrt and Pamb of the RocketThruster are unchanged by the batch.
+        
+        Convergence of each thrust level is saved in self.is_convergedArr (boolean array),
+        a warning is added to self.batch_warningL if any thrust level is not converged 
+        after max_iter iterations.
+
+        :param ThrustLbfL: lbf, list or array of desired thrust at specified ambient pressure (Pamb)
+        :param Pamb: psia, ambient pressure
+        :param max_iter: maximum number of iterations
+        :type ThrustLbfL: list
+        :type Pamb: float
+        :type max_iter: int
+        :return: inch, throat radius for each thrust in ThrustLbfL
+        :rtype: numpy.ndarray
+        """
+        ThrustArr = np.atleast_1d( np.asarray(ThrustLbfL, dtype=np.float64) )
+        Npts = len( ThrustArr )
+        xtolArr = ThrustArr / 1.0E8
+        
+        Rthrt_save = self.geomObj.Rthrt
+        Pamb_save = self.coreObj.Pamb
+        self.coreObj.reset_attr( 'Pamb', Pamb, re_evaluate=True)
+        self.calc_all_eff()
+        
+        # thrust is nearly proportional to throat area
+        RtArr = self.geomObj.Rthrt * (ThrustArr / self.coreObj.Fambient)**0.5
+        TcODEArr = np.full( Npts, self.coreObj.TcODE )
+        is_doneArr = np.zeros( Npts, dtype=bool )
+        
+        barrierObj = self.coreObj.barrierObj
+        geomObj = self.geomObj
+        
+        for _ in range( max_iter ):
+            iL = np.flatnonzero( ~is_doneArr )
+            precompute_mlp_models( self, {'Rthrt':RtArr[iL]}, len(iL), TcODEArr[iL] )
+            
+            if self.coreObj.add_barrier and barrierObj is not None:
+                # barrier MR depends on chamber geometry, so get it at each Rthrt before barrier kinetics.
+                MRbarrierL = []
+                for i in iL:
+                    geomObj.reset_attr( 'Rthrt', float(RtArr[i]), re_evaluate=True)
+                    barrierObj.calc_entrainment()
+                    MRbarrierL.append( barrierObj.MRbarrier )
+                
+                IspODKArr = calc_IspODK_arr( self.coreObj.ceaObj, Pc=self.coreObj.Pc, eps=geomObj.eps, 
+                                             Rthrt=RtArr[iL], pcentBell=geomObj.pcentBell, MR=MRbarrierL )
+                keyL = [(self.coreObj.Pc, geomObj.eps, float(RtArr[i]), geomObj.pcentBell, MRb) \
+                        for i, MRb in zip(iL, MRbarrierL)]
+                barrierObj.stages.set_precomputed( 'IspODK_b', keyL, IspODKArr.tolist() )
+            
+            for i in iL:
+                self.geomObj.reset_attr( 'Rthrt', float(RtArr[i]), re_evaluate=True)
+                self.calc_all_eff()
+                
+                Fambient = self.coreObj.Fambient
+                if abs(ThrustArr[i] - Fambient) < xtolArr[i]:
+                    is_doneArr[i] = True
+                else:
+                    RtArr[i] *= (ThrustArr[i] / Fambient)**0.5
+            
+            if is_doneArr.all():
+                break
+        
+        self.stages.clear_precomputed()
+        if barrierObj is not None:
+            barrierObj.stages.clear_precomputed()
+        self.geomObj.reset_attr( 'Rthrt', Rthrt_save, re_evaluate=True)
+        self.coreObj.reset_attr( 'Pamb', Pamb_save, re_evaluate=True)
+        self.calc_all_eff()
+        
+        self.is_convergedArr = is_doneArr
+        self.batch_warningL = []
+        if not is_doneArr.all():
+            self.batch_warningL.append( '%i of %i thrust levels not converged in scale_Rt_to_Thrust_batch (see is_convergedArr)'%\
+                                        (Npts - np.count_nonzero(is_doneArr), Npts) )
+        return RtArr
+    
     def calc_all_eff(self):
         """
         Looks at the efficiency object (effObj) and calculates those efficiencies
         that have not been set as constants by the user.
+        Returns True if any value was changed (and coreObj was re-evaluated).
         
         see: self.calc_CdThroat or effObj['XXX'].is_const for individual efficiencies
         """
         DOREVAL = False
         made_a_change = False
         effObj = self.coreObj.effObj
+        geomObj = self.geomObj
+        coreObj = self.coreObj
+        
+        # efficiency models need current ideal performance (e.g. TcODE, IspODE)
+        # (only recalculated if Pc, MRcore, eps, etc. have changed)
+        coreObj.calc_cea_perf_params()
         
         if self.calc_CdThroat:
             #CdThroat = get_Cd( RWTU=self.geomObj.RupThroat, gamma=self.coreObj.gammaChm )
-            CdThroat = calc_Cd( Pc=self.coreObj.Pc, Rthrt=self.geomObj.Rthrt, RWTU=self.geomObj.RupThroat )
+            key = (coreObj.Pc, geomObj.Rthrt, geomObj.RupThroat)
+            is_clean, CdThroat = self.stages.get('Cd', key)
+            if not is_clean:
+                CdThroat = self.stages.get_precomputed('Cd', key)
+                if CdThroat is None:
+                    CdThroat = calc_Cd( Pc=coreObj.Pc, Rthrt=geomObj.Rthrt, RWTU=geomObj.RupThroat )
+                self.stages.set('Cd', key, CdThroat)
             
             self.coreObj.reset_CdThroat( CdThroat, method_name='MLP fit', re_evaluate=DOREVAL)
             made_a_change = True
@@ -308,14 +476,22 @@ class RocketThruster(object):
         #if self.calc_effDiv:
         if not effObj['Div'].is_const:
             
-            # AVAIL_EFF_MODEL_D['Div'] = ['simple fit', 'MLP fit']
-            if selected_eff_modelD['Div'] == 'simple fit':            
-                effDiv = eff_div( eps=self.geomObj.eps, pcBell=self.geomObj.pcentBell)
-                msg = selected_eff_modelD['Div'] + ' eps=%g, %%bell=%g'%(self.geomObj.eps, self.geomObj.pcentBell)
-                
-            elif selected_eff_modelD['Div'] == 'MLP fit':            
-                raise Exception('MLP fit not yet implemented for eff Div')
-            
+            key = (selected_eff_modelD['Div'], geomObj.eps, geomObj.pcentBell)
+            is_clean, result = self.stages.get('Div', key)
+            if not is_clean:
+                # AVAIL_EFF_MODEL_D['Div'] = ['simple fit', 'MLP fit']
+                if selected_eff_modelD['Div'] == 'simple fit':            
+                    warningL = [] # out of range %bell is clamped
+                    effDiv = eff_div( eps=geomObj.eps, pcBell=geomObj.pcentBell, warningL=warningL)
+                    msg = selected_eff_modelD['Div'] + ' eps=%g, %%bell=%g'%(geomObj.eps, geomObj.pcentBell)
+                    if warningL:
+                        msg += ' (clamped to %bell=60-120)'
+                    
+                elif selected_eff_modelD['Div'] == 'MLP fit':            
+                    raise Exception('MLP fit not yet implemented for eff Div')
+                result = (effDiv, msg)
+                self.stages.set('Div', key, result)
+            effDiv, msg = result
                 
             self.coreObj.effObj.set_value( 'Div', effDiv, value_src=msg, re_evaluate=DOREVAL)
             made_a_change = True
@@ -323,34 +499,52 @@ class RocketThruster(object):
         #if self.calc_effBL:
         if not effObj['BL'].is_const:
             
-            # AVAIL_EFF_MODEL_D['BL'] = ['MLP fit', 'NASA-SP8120']
-            if selected_eff_modelD['BL'] == 'NASA-SP8120':
-                effBL = eff_bl_NASA( Dt=self.geomObj.Rthrt*2.0, Pc=self.coreObj.Pc, eps=self.geomObj.eps)
-            elif selected_eff_modelD['BL'] == 'MLP fit':
+            key = (selected_eff_modelD['BL'], coreObj.Pc, geomObj.eps, geomObj.Rthrt, geomObj.pcentBell, 
+                   coreObj.TcODE, self.noz_regen_eps)
+            is_clean, result = self.stages.get('BL', key)
+            if not is_clean:
+                # AVAIL_EFF_MODEL_D['BL'] = ['MLP fit', 'NASA-SP8120']
+                if selected_eff_modelD['BL'] == 'NASA-SP8120':
+                    effBL = eff_bl_NASA( Dt=geomObj.Rthrt*2.0, Pc=coreObj.Pc, eps=geomObj.eps)
+                elif selected_eff_modelD['BL'] == 'MLP fit':
+                    
+                    pclossBL = self.stages.get_precomputed('pcentLossBL', (coreObj.Pc, geomObj.eps, 
+                                            geomObj.Rthrt, geomObj.pcentBell, coreObj.TcODE) )
+                    if pclossBL is None:
+                        pclossBL = calc_pcentLossBL( Pc=coreObj.Pc, eps=geomObj.eps, 
+                                                     Rthrt=geomObj.Rthrt, pcentBell=geomObj.pcentBell, 
+                                                     TcCham=coreObj.TcODE )
+                                                
+                    effBL = (100.0 - pclossBL)/100.0
                 
-                pclossBL = calc_pcentLossBL( Pc=self.coreObj.Pc, eps=self.geomObj.eps, 
-                                             Rthrt=self.geomObj.Rthrt, pcentBell=self.geomObj.pcentBell, 
-                                             TcCham=self.coreObj.TcODE )
-                                            
-                effBL = (100.0 - pclossBL)/100.0
-            
-            msg = selected_eff_modelD['BL']
-            
-            if self.noz_regen_eps > 1.0:
-                msg += 'regen-corrected'
-                effBL = regen_corrected_bl( eff_bl=effBL, eps=self.geomObj.eps, noz_regen_eps=self.noz_regen_eps )
+                msg = selected_eff_modelD['BL']
+                
+                if self.noz_regen_eps > 1.0:
+                    msg += 'regen-corrected'
+                    effBL = regen_corrected_bl( eff_bl=effBL, eps=geomObj.eps, noz_regen_eps=self.noz_regen_eps )
+                result = (effBL, msg)
+                self.stages.set('BL', key, result)
+            effBL, msg = result
                 
             self.coreObj.effObj.set_value( 'BL', effBL, value_src=msg, re_evaluate=DOREVAL)
             made_a_change = True
         
         #if self.calc_effKin:
         if not effObj['Kin'].is_const:
-            IspODK = calc_IspODK(self.coreObj.ceaObj, Pc=self.coreObj.Pc, eps=self.geomObj.eps, 
-                                 Rthrt=self.geomObj.Rthrt, pcentBell=self.geomObj.pcentBell, 
-                                 MR=self.coreObj.MRcore)
-                        
-            # coreObj has made IspODE calc already
-            effKin = IspODK / self.coreObj.IspODE
+            key = (coreObj.ceaObj.cache_prefix, coreObj.Pc, geomObj.eps, geomObj.Rthrt, geomObj.pcentBell, 
+                   coreObj.MRcore, coreObj.IspODE)
+            is_clean, effKin = self.stages.get('Kin', key)
+            if not is_clean:
+                IspODK = self.stages.get_precomputed('IspODK', (coreObj.Pc, geomObj.eps, 
+                                            geomObj.Rthrt, geomObj.pcentBell, coreObj.MRcore) )
+                if IspODK is None:
+                    IspODK = calc_IspODK(coreObj.ceaObj, Pc=coreObj.Pc, eps=geomObj.eps, 
+                                         Rthrt=geomObj.Rthrt, pcentBell=geomObj.pcentBell, 
+                                         MR=coreObj.MRcore)
+                            
+                # coreObj has made IspODE calc already
+                effKin = IspODK / coreObj.IspODE
+                self.stages.set('Kin', key, effKin)
             msg = selected_eff_modelD['Kin']
             
             self.coreObj.effObj.set_value( 'Kin', effKin, value_src=msg, re_evaluate=DOREVAL)
@@ -383,7 +577,84 @@ class RocketThruster(object):
         # after all updates, re_evaluate
         if made_a_change:
             self.coreObj.evaluate()
+        return made_a_change
+    
+    def get_stage_counts(self):
+        """
+        Return dictionary of how many times each tracked calculation stage was 
+        computed or skipped (index=stage name, value=(computed, skipped)).
+        The nozzle contour is "skipped" when it is only rescaled to a new Rthrt.
+        """
+        countD = self.stages.get_counts()
+        countD.update( self.coreObj.stages.get_counts() )
+        if self.coreObj.barrierObj is not None:
+            countD.update( self.coreObj.barrierObj.stages.get_counts() )
         
+        geomObj = self.geomObj
+        if geomObj.nozzle_build_count or geomObj.nozzle_rescale_count:
+            countD['nozzle_contour'] = (geomObj.nozzle_build_count, geomObj.nozzle_rescale_count)
+        return countD
+    
+    def get_stage_counts_str(self):
+        """Return string table of how many times each calculation stage was computed or skipped."""
+        return get_counts_str( self.get_stage_counts() )
+    
+    def evaluate_batch(self, inputs=None, **inputArrD):
+        """
+        Evaluate thruster at each point of the input arrays and return a numpy
+        structured array of inputs, outputs and efficiencies (see batch_eval.py).
+        The thruster is returned to its original state after the batch.
+
+        :param inputs: structured array or dictionary of input arrays (e.g. MRcore, Pc, eps, Rthrt)
+        :param inputArrD: input arrays given by keyword (e.g. MRcore=np.linspace(1.4, 2.2, 20))
+        :type inputs: numpy.ndarray
+        :type inputArrD: numpy.ndarray
+        :return: structured array of results, one row per point
+        :rtype: numpy.ndarray
+        """
+        return evaluate_batch( self, inputs=inputs, **inputArrD )
+
+    def get_sensitivity(self, input_nameL=None, output_nameL=None, rel_step=0.001, n_workers=None):
+        """
+        Return Sensitivity object holding d(output)/d(input) by central finite differences
+        (default outputs are IspDel, FvacTotal, wdotTot and Fambient for all numeric inputs,
+        see sensitivity.py). The thruster is not changed.
+
+        :param input_nameL: list of input names (e.g. Rthrt, MRcore, effDiv)
+        :param output_nameL: list of output names (e.g. IspDel)
+        :param rel_step: finite difference step as fraction of input value
+        :param n_workers: number of worker processes (default is number of cores, 1=no parallel)
+        :type input_nameL: list
+        :type output_nameL: list
+        :type rel_step: float
+        :type n_workers: int
+        :return: Sensitivity object (e.g. sensObj.jacD['IspDel']['Rthrt'])
+        :rtype: Sensitivity
+        """
+        from rocketisp.sensitivity import Sensitivity # sensitivity.py imports this module
+        return Sensitivity( self, input_nameL=input_nameL, output_nameL=output_nameL,
+                            rel_step=rel_step, n_workers=n_workers )
+
+    def run_monte_carlo(self, distD, Nsamples=100000, seed=None, ceaTable=None):
+        """
+        Return MonteCarlo object holding samples of IspDel, thrust and flow rates for
+        distributions of efficiencies, Pc, MRcore, adjCstarODE and adjIspIdeal
+        (see monte_carlo.py). The thruster is not changed.
+
+        :param distD: distributions (e.g. {'ERE':('normal', 0.98, 0.005), 'Pc':('uniform', 140., 160.)})
+        :param Nsamples: number of samples
+        :param seed: seed of random number generator (None=random seed)
+        :param ceaTable: CEA_Table for sampled Pc and MRcore (None=build table over sampled range)
+        :type distD: dict
+        :type Nsamples: int
+        :type seed: int
+        :type ceaTable: CEA_Table
+        :return: MonteCarlo object (e.g. mcObj.get_percentiles('IspDel'))
+        :rtype: MonteCarlo
+        """
+        from rocketisp.monte_carlo import MonteCarlo
+        return MonteCarlo( self, distD, Nsamples=Nsamples, seed=seed, ceaTable=ceaTable )
+
         
     def summ_print(self):
         """
@@ -422,38 +693,21 @@ class RocketThruster(object):
             w,h = pixel_wh
             fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(w/100.0, h/100.0), dpi=100)
         
-        mrr = MRrange(self.coreObj.ceaObj, Pc=self.coreObj.Pc, eps=self.geomObj.eps,
-                      edge_frac=edge_frac)
+        mrr = get_MRrange(self.coreObj.ceaObj, Pc=self.coreObj.Pc, eps=self.geomObj.eps,
+                          edge_frac=edge_frac)
         mrlo, mrhi = mrr.get_mr_range()
         
-        ispodeL  = [] # list of IspODE  (one-dimensional equilibrium)
-        ispodkL  = [] # list of IspODK  (one-dimensional kinetic)
-        ispdel_coreL = [] # list of Isp Core delivered
-        ispdelL = [] # list of Isp thruster delivered
-        ispdel_ambL = [] # list of IspAmb thruster delivered
-        ispodfL  = [] # list of IspODF  (frozen)
-        
-        
         mrcoreL  = np.linspace(mrlo, mrhi, Npts) # array of MRcore  (core stream tube mixture ratio)
-        mrthrusterL = []
         
-        MRsave = self.coreObj.MRcore
+        resultArr = self.evaluate_batch( MRcore=mrcoreL )
         
-        for mr in mrcoreL:
-            self.coreObj.reset_attr( 'MRcore', mr, re_evaluate=True)
-            self.calc_all_eff()
-
-            ispodeL.append( self.coreObj.IspODE )
-            ispodkL.append( self.coreObj.IspODK )
-            ispodfL.append( self.coreObj.IspODF )
-            
-            ispdel_coreL.append( self.coreObj.IspDel_core )
-            ispdelL.append( self.coreObj.IspDel )
-            ispdel_ambL.append( self.coreObj.IspAmb )
-            mrthrusterL.append( self.coreObj.MRthruster )
-            
-        self.coreObj.reset_attr( 'MRcore', MRsave, re_evaluate=True)
-        self.calc_all_eff()
+        ispodeL  = resultArr['IspODE'] # IspODE  (one-dimensional equilibrium)
+        ispodkL  = resultArr['IspODK'] # IspODK  (one-dimensional kinetic)
+        ispodfL  = resultArr['IspODF'] # IspODF  (frozen)
+        ispdel_coreL = resultArr['IspDel_core'] # Isp Core delivered
+        ispdelL = resultArr['IspDel'] # Isp thruster delivered
+        ispdel_ambL = list( resultArr['IspAmb'] ) # IspAmb thruster delivered
+        mrthrusterL = resultArr['MRthruster']
         
         plt.plot( mrcoreL, ispodeL, label='IspODE', color=colorsL[0] )
         plt.plot( mrcoreL, ispodkL, label='IspODK', color=colorsL[1] )
@@ -532,16 +786,16 @@ class RocketThruster(object):
             w,h = pixel_wh
             fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(w/100.0, h/100.0), dpi=100)
         
-        mrr = MRrange(self.coreObj.ceaObj, Pc=self.coreObj.Pc, eps=self.geomObj.eps,
-                      edge_frac=edge_frac)
+        mrr = get_MRrange(self.coreObj.ceaObj, Pc=self.coreObj.Pc, eps=self.geomObj.eps,
+                          edge_frac=edge_frac)
         mrlo, mrhi = mrr.get_mr_range()
         
         mrcoreL  = np.linspace(mrlo, mrhi, Npts) # array of MRcore  (core stream tube mixture ratio)
-        mrthrusterL = []
         
-        MRsave = self.coreObj.MRcore
+        effObj = self.coreObj.effObj
+        resultArr = self.evaluate_batch( MRcore=mrcoreL )
         
-        eff_ispL = []
+        eff_ispL = list( resultArr['effIsp'] )
         eff_ereL = []
         eff_nozL = []
         
@@ -553,31 +807,19 @@ class RocketThruster(object):
         eff_emL  = []
         eff_vapL = []
         
-        effObj = self.coreObj.effObj
-        
-        for mr in mrcoreL:
-            self.coreObj.reset_attr( 'MRcore', mr, re_evaluate=True)
-            self.calc_all_eff()
+        if not effObj.effD['Isp'].is_const:
+            eff_nozL = list( resultArr['effNoz'] )
+            eff_ereL = list( resultArr['effERE'] )
             
-            if not effObj.effD['Isp'].is_const:
-                eff_nozL.append( effObj['Noz'].value )
-                eff_ereL.append( effObj['ERE'].value )
-                
-            if not effObj.effD['Noz'].is_const:
-                eff_kinL.append( effObj['Kin'].value )
-                eff_divL.append( effObj['Div'].value )
-                eff_blL.append(  effObj['BL'].value )
-                
-            if not effObj.effD['ERE'].is_const:
-                eff_mixL.append( effObj['Mix'].value )
-                eff_emL.append(  effObj['Em'].value )
-                eff_vapL.append( effObj['Vap'].value )
+        if not effObj.effD['Noz'].is_const:
+            eff_kinL = list( resultArr['effKin'] )
+            eff_divL = list( resultArr['effDiv'] )
+            eff_blL  = list( resultArr['effBL'] )
             
-            eff_ispL.append( effObj.effD['Isp'].value )
-            mrthrusterL.append( self.coreObj.MRthruster )
-            
-        self.coreObj.reset_attr( 'MRcore', MRsave, re_evaluate=True)
-        self.calc_all_eff()
+        if not effObj.effD['ERE'].is_const:
+            eff_mixL = list( resultArr['effMix'] )
+            eff_emL  = list( resultArr['effEm'] )
+            eff_vapL = list( resultArr['effVap'] )
         
         if eff_ereL:
             plt.plot( mrcoreL, eff_ereL, linewidth=3, label='effERE', color=colorsL[0] )
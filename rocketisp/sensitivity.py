@@ -0,0 +1,287 @@
+r"""
+Sensitivity (Jacobian) of delivered performance to the inputs of a RocketThruster.
+
+Sensitivity calculates d(output)/d(input) by central finite differences for
+every numeric input of Geometry, CoreStream (including BarrierStream pcentFFC
+and ko), Injector, RocketThruster and for each efficiency that enters the
+overall Isp efficiency (see get_sensitivity_inputs).  Default outputs are
+IspDel, FvacTotal, wdotTot and Fambient, but any output of
+design_optimizer.get_output can be used.
+
+All probes start from one base thruster built from a ThrusterSpec (see
+thruster_spec.py).  After each probe the perturbed input is set back to its
+base value, so the next probe only recomputes the stages whose inputs changed
+(e.g. a probe of Rthrt re-runs the throat Cd, boundary layer and kinetic models
+but not CEA).  The probes are independent, so they are split among a pool of
+worker processes if n_workers > 1, each worker holding its own base thruster.
+
+An efficiency probe holds that efficiency constant at the perturbed value
+(i.e. the efficiency model is bypassed for that probe).
+
+For example::
+
+    sensObj = R.get_sensitivity()
+    print( sensObj.jacD['IspDel']['Rthrt'] ) # sec/inch
+    sensObj.summ_print()
+"""
+import os
+import numpy as np
+from rocketisp.batch_eval import GEOMETRY_INPUT_L, CORE_INPUT_L, BARRIER_INPUT_L
+from rocketisp.design_optimizer import INJECTOR_INPUT_L, evaluate_design, get_output, set_design_vars
+from rocketisp.thruster_spec import ThrusterSpec
+
+SENSITIVITY_OUTPUT_L = ['IspDel', 'FvacTotal', 'wdotTot', 'Fambient']
+
+def get_eff_input_names( effObj ):
+    """
+    Return list of efficiency names that enter the overall Isp efficiency
+    (e.g. ERE replaces Mix, Em, Vap and HL if ERE is constant).
+    """
+    if effObj['Isp'].is_const:
+        return ['Isp']
+    nameL = ['Noz'] if effObj['Noz'].is_const else list( effObj.nozzleL )
+    nameL.extend( ['ERE'] if effObj['ERE'].is_const else list( effObj.chamberL ) )
+    return nameL
+
+def get_sensitivity_inputs( rocketObj ):
+    """
+    Return list of numeric input names of rocketObj for sensitivity calculations.
+    Inputs that are None or not in use are skipped (e.g. LchamberInp=None,
+    CdThroat when calc_CdThroat=True or pulse inputs when pulse_sec=inf).
+    Efficiencies are named "eff" + name (e.g. "effDiv").
+    """
+    coreObj = rocketObj.coreObj
+    nameL = list( GEOMETRY_INPUT_L ) + [name for name in CORE_INPUT_L \
+                                        if name != 'CdThroat' or not rocketObj.calc_CdThroat]
+    if coreObj.barrierObj is not None:
+        nameL.extend( BARRIER_INPUT_L )
+    if rocketObj.injObj is not None:
+        nameL.extend( INJECTOR_INPUT_L )
+    if rocketObj.noz_regen_eps > 1.0:
+        nameL.append( 'noz_regen_eps' ) # 1.0 means no regen nozzle
+    if np.isfinite( rocketObj.pulse_sec ):
+        nameL.extend( ['pulse_sec', 'pulse_quality'] ) # only used when pulsing
+
+    def is_numeric( value ):
+        return isinstance(value, (int, float, np.number)) and not isinstance(value, bool) \
+               and np.isfinite( value )
+
+    nameL = [name for name in nameL if is_numeric( get_output(rocketObj, name) )]
+    nameL.extend( ['eff'+name for name in get_eff_input_names( coreObj.effObj )] )
+    return nameL
+
+def set_input( rocketObj, name, value ):
+    """Set input name (a design variable or "eff" + efficiency name) of rocketObj without evaluating."""
+    if name.startswith('eff'):
+        rocketObj.coreObj.effObj[ name[3:] ].set_const( value )
+    else:
+        set_design_vars( rocketObj, {name:value} )
+
+# ........ worker process support (each worker holds its own base thruster)
+_worker_stateD = {}
+
+def _init_worker( spec, output_nameL ):
+    R = spec.build()
+    effStateD = dict( [(e.name, (e.value, e.value_src, e.is_const)) for e in R.coreObj.effObj.effD.values()] )
+    _worker_stateD['args'] = (R, effStateD, output_nameL)
+
+def _evaluate_probes( probeL ):
+    """
+    Return list of output tuples (in order of output_nameL) for list of probes (input name, value)
+    and dictionary of stage counts (index=stage name, value=(computed, skipped)).
+    A probe with input name None evaluates the base thruster.
+    Each perturbed input is returned to its base value after its probe.
+    """
+    R, effStateD, output_nameL = _worker_stateD['args']
+    startD = R.get_stage_counts()
+
+    rowL = []
+    for name, value in probeL:
+        if name is None:
+            base_value = None
+        elif name.startswith('eff'):
+            base_value = effStateD[ name[3:] ]
+        else:
+            base_value = get_output( R, name )
+
+        try:
+            if name is not None:
+                set_input( R, name, value )
+            outD = evaluate_design( R, {}, output_nameL )
+            rowL.append( tuple( [outD[out_name] for out_name in output_nameL] ) )
+        except Exception:
+            rowL.append( tuple( [np.nan] * len(output_nameL) ) ) # e.g. input out of model range
+
+        # return input to base value (re-evaluated by next probe)
+        if name is None:
+            pass
+        elif name.startswith('eff'):
+            e = R.coreObj.effObj[ name[3:] ]
+            e.value, e.value_src, e.is_const = base_value
+        else:
+            set_design_vars( R, {name:base_value} )
+
+    # stage counts (computed, skipped) of this list of probes
+    countD = {}
+    for stage, (n_computed, n_skipped) in R.get_stage_counts().items():
+        n0_computed, n0_skipped = startD.get(stage, (0, 0))
+        countD[stage] = (n_computed - n0_computed, n_skipped - n0_skipped)
+    return rowL, countD
+
+
+class Sensitivity(object):
+    """
+    Sensitivity of thruster outputs to thruster inputs by central finite differences.
+    rocketObj is not changed.
+
+    :param rocketObj: RocketThruster at base state
+    :param input_nameL: list of input names (default is all numeric inputs, see get_sensitivity_inputs)
+    :param output_nameL: list of output names (default is SENSITIVITY_OUTPUT_L)
+    :param rel_step: finite difference step as fraction of input value (absolute step if input is 0)
+    :param n_workers: number of worker processes (default is number of cores, 1=no parallel)
+    :type rocketObj: RocketThruster
+    :type input_nameL: list
+    :type output_nameL: list
+    :type rel_step: float
+    :type n_workers: int
+    :return: Sensitivity object
+    :rtype: Sensitivity
+
+    :ivar jacD: derivatives (index=output name, value=dict index=input name, value=d(output)/d(input))
+    :ivar baseD: outputs at base state (index=output name)
+    :ivar inputD: inputs at base state (index=input name)
+    :ivar stage_countD: calculation stages (computed, skipped) over all probes (see RocketThruster.get_stage_counts)
+    :ivar warningL: list of warnings (e.g. inputs where only a one-sided difference was possible)
+    """
+
+    def __init__(self, rocketObj, input_nameL=None, output_nameL=None, rel_step=0.001, n_workers=None):
+
+        if input_nameL is None:
+            input_nameL = get_sensitivity_inputs( rocketObj )
+        if output_nameL is None:
+            output_nameL = list( SENSITIVITY_OUTPUT_L )
+        self.input_nameL = list( input_nameL )
+        self.output_nameL = list( output_nameL )
+        self.rel_step = rel_step
+        self.warningL = []
+
+        self.inputD = {}
+        self.stepD = {}
+        for name in self.input_nameL:
+            try:
+                value = float( get_output( rocketObj, name ) )
+            except Exception:
+                raise Exception('in Sensitivity, "%s" is not a recognized input'%name)
+            self.inputD[name] = value
+            self.stepD[name] = rel_step * abs(value) if value != 0.0 else rel_step
+
+        # probe list is base state, then (+step, -step) for each input
+        probeL = [(None, None)]
+        for name in self.input_nameL:
+            probeL.append( (name, self.inputD[name] + self.stepD[name]) )
+            probeL.append( (name, self.inputD[name] - self.stepD[name]) )
+        self.n_evaluations = len( probeL )
+
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_workers = max(1, min(n_workers, len(probeL)))
+
+        init_args = (ThrusterSpec.from_thruster( rocketObj ), self.output_nameL)
+        if n_workers > 1:
+            import multiprocessing
+            chunksize = max(1, len(probeL) // (4*n_workers))
+            chunkL = [probeL[i:i+chunksize] for i in range(0, len(probeL), chunksize)]
+            pool = multiprocessing.Pool( n_workers, initializer=_init_worker, initargs=init_args )
+            try:
+                resultL = pool.map( _evaluate_probes, chunkL, chunksize=1 )
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            _init_worker( *init_args )
+            try:
+                resultL = [_evaluate_probes( probeL )]
+            finally:
+                _worker_stateD.clear()
+
+        rowL = []
+        self.stage_countD = {} # index=stage name, value=(computed, skipped) summed over all probes
+        for chunk_rowL, countD in resultL:
+            rowL.extend( chunk_rowL )
+            for stage, (n_computed, n_skipped) in countD.items():
+                c, s = self.stage_countD.get(stage, (0, 0))
+                self.stage_countD[stage] = (c + n_computed, s + n_skipped)
+
+        outArr = np.array( rowL, dtype=np.float64 )
+        self.baseD = dict( zip(self.output_nameL, outArr[0].tolist()) )
+        if np.any( np.isnan( outArr[0] ) ):
+            raise Exception('in Sensitivity, base state could not be evaluated')
+
+        # central difference if both probes evaluated, otherwise one-sided difference from base
+        self.jacD = dict( [(out_name, {}) for out_name in self.output_nameL] )
+        for i, name in enumerate( self.input_nameL ):
+            upArr, dnArr = outArr[2*i+1], outArr[2*i+2]
+            h = self.stepD[name]
+            if not np.any( np.isnan(upArr) ) and not np.any( np.isnan(dnArr) ):
+                dArr = (upArr - dnArr) / (2.0*h)
+            elif not np.any( np.isnan(upArr) ):
+                dArr = (upArr - outArr[0]) / h
+                self.warningL.append( 'one-sided (+) difference used for "%s"'%name )
+            elif not np.any( np.isnan(dnArr) ):
+                dArr = (outArr[0] - dnArr) / h
+                self.warningL.append( 'one-sided (-) difference used for "%s"'%name )
+            else:
+                dArr = np.full( len(self.output_nameL), np.nan )
+                self.warningL.append( 'could not evaluate derivatives for "%s"'%name )
+
+            for out_name, deriv in zip( self.output_nameL, dArr.tolist() ):
+                self.jacD[out_name][name] = deriv
+
+    def get_jacobian_arr(self):
+        """Return Jacobian array, shape (number of outputs, number of inputs), in order of output_nameL, input_nameL."""
+        return np.array( [[self.jacD[out_name][name] for name in self.input_nameL] \
+                          for out_name in self.output_nameL] )
+
+    def get_normalized(self, out_name, name):
+        """Return normalized sensitivity (percent change in output per percent change in input)."""
+        if self.baseD[out_name] == 0.0:
+            return np.nan
+        return self.jacD[out_name][name] * self.inputD[name] / self.baseD[out_name]
+
+    def summ_print(self):
+        """Print normalized sensitivities of all outputs to all inputs."""
+        print( self.get_summ_str() )
+
+    def get_summ_str(self):
+        """Return string table of normalized sensitivities (%output / %input)."""
+        sL = ['Normalized Sensitivity (%output / %input)']
+        sL.append( '%14s %12s'%('input', 'value') + ''.join( ['%12s'%out_name for out_name in self.output_nameL] ) )
+        for name in self.input_nameL:
+            s = '%14s %12g'%(name, self.inputD[name])
+            s += ''.join( ['%12.5f'%self.get_normalized(out_name, name) for out_name in self.output_nameL] )
+            sL.append( s )
+        for warning in self.warningL:
+            sL.append( 'WARNING: ' + warning )
+        return '\n'.join( sL )
+
+
+if __name__ == '__main__':
+    import time
+    from rocketisp.geometry import Geometry
+    from rocketisp.efficiencies import Efficiencies
+    from rocketisp.stream_tubes import CoreStream
+    from rocketisp.injector import Injector
+    from rocketisp.rocket_isp import RocketThruster
+    from rocketisp.stage_tracker import get_counts_str
+
+    C = CoreStream( geomObj=Geometry(Rthrt=1.0, eps=40), effObj=Efficiencies(ERE=0.98),
+                    oxName='N2O4', fuelName='MMH', MRcore=1.6, Pc=150, pcentFFC=10, Pamb=5.0)
+    R = RocketThruster(name='sensitivity demo', coreObj=C)
+
+    t0 = time.time()
+    sensObj = R.get_sensitivity()
+    print( '%i inputs, %i evaluations in %.2f sec'%(len(sensObj.input_nameL), sensObj.n_evaluations, time.time()-t0) )
+    sensObj.summ_print()
+
+    print( 'd(IspDel)/d(Rthrt) = %g sec/inch'%sensObj.jacD['IspDel']['Rthrt'] )
+    print( get_counts_str( sensObj.stage_countD ) )
@@ -0,0 +1,94 @@
+r"""
+Dependency tracking for the calculation stages of RocketIsp objects.
+
+Each expensive stage of a calculation (for example the CEA stage of CoreStream
+or the boundary layer model of RocketThruster) declares the inputs it depends
+on as a tuple "key".  If the key has not changed since the stage last ran, the
+stage is clean and its saved result is reused.  If any input in the key has
+changed, the stage is dirty and is recomputed.
+
+Comparing input keys (instead of setting dirty flags in every reset_attr) means
+that inputs changed by any route (reset_attr, setattr, batch evaluation, etc.)
+invalidate exactly the stages that depend on them.  For example, a change in
+Rthrt changes the keys of the Cd, BL and Kin stages, but not the key of the CEA
+stage, so IspODE, cstarODE and PcOvPe are not recomputed.
+"""
+
+class StageTracker(object):
+    """
+    Holds the input key and result of the last run of each named stage,
+    along with counts of how many times each stage was computed or skipped.
+    """
+
+    def __init__(self):
+        self.keyD = {}      # index=stage name, value=input key of last run
+        self.resultD = {}   # index=stage name, value=result of last run
+        self.computedD = {} # index=stage name, value=number of times computed
+        self.skippedD = {}  # index=stage name, value=number of times skipped
+        
+        # values of models evaluated ahead of time for many inputs (e.g. by evaluate_batch)
+        self.precomputedD = {} # index=model name, value=dict(index=input key, value=model value)
+
+    def get(self, stage, key):
+        """
+        Return (True, saved result) if the stage is clean for key, otherwise (False, None).
+        """
+        if stage in self.keyD and self.keyD[stage] == key:
+            self.skippedD[stage] = self.skippedD.get(stage, 0) + 1
+            return True, self.resultD[stage]
+        return False, None
+
+    def set(self, stage, key, result=None):
+        """Save the input key and result of a stage that was just computed."""
+        self.keyD[stage] = key
+        self.resultD[stage] = result
+        self.computedD[stage] = self.computedD.get(stage, 0) + 1
+
+    def invalidate(self, stage=None):
+        """Mark stage (or all stages if stage is None) dirty."""
+        if stage is None:
+            self.keyD.clear()
+            self.resultD.clear()
+        else:
+            self.keyD.pop( stage, None )
+            self.resultD.pop( stage, None )
+
+    def set_precomputed(self, name, keyL, valueL):
+        """Save model values (valueL) that were evaluated ahead of time for the inputs in keyL."""
+        self.precomputedD[name] = dict( zip(keyL, valueL) )
+    
+    def get_precomputed(self, name, key):
+        """Return precomputed model value for input key (None if not precomputed)."""
+        try:
+            return self.precomputedD[name][key]
+        except KeyError:
+            return None
+    
+    def clear_precomputed(self):
+        """Discard all precomputed model values."""
+        self.precomputedD.clear()
+
+    def reset_counts(self):
+        """Set all computed and skipped counts to zero."""
+        self.computedD.clear()
+        self.skippedD.clear()
+
+    def get_counts(self, prefix=''):
+        """
+        Return dictionary of counts (index=prefix + stage name, value=(computed, skipped)).
+        """
+        countD = {}
+        for stage in set( list(self.computedD.keys()) + list(self.skippedD.keys()) ):
+            countD[prefix + stage] = (self.computedD.get(stage, 0), self.skippedD.get(stage, 0))
+        return countD
+
+    def get_counts_str(self, prefix=''):
+        """Return string table of computed and skipped counts."""
+        return get_counts_str( self.get_counts( prefix=prefix ) )
+
+def get_counts_str( countD ):
+    """Return string table of countD (index=stage name, value=(computed, skipped))."""
+    sL = ['%-20s %9s %9s'%('stage', 'computed', 'skipped')]
+    for stage in sorted( countD.keys() ):
+        sL.append( '%-20s %9i %9i'%(stage, countD[stage][0], countD[stage][1]) )
+    return '\n'.join( sL )
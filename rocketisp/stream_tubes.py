@@ -1,17 +1,19 @@
 from math import pi
 import os
+import numpy as np
 from rocketisp.model_summ import ModelSummary
 from rocketisp.parse_docstring import get_desc_and_units
 
 
 if 'READTHEDOCS' not in os.environ:
-    from rocketcea.cea_obj import CEA_Obj
     from rocketcea.separated_Cf import sepNozzleCf
 else:
-    from rocketisp.mock.cea_obj import CEA_Obj
     from rocketisp.mock.separated_Cf import sepNozzleCf
 
-from rocketisp.efficiency.calc_noz_kinetics import calc_IspODK
+from rocketisp.cea_cache import CachedCEA_Obj
+from rocketisp.stage_tracker import StageTracker
+
+from rocketisp.efficiency.calc_noz_kinetics import calc_IspODK, calc_IspODK_arr
 from rocketisp.efficiencies import Efficiencies
 from rocketisp.geometry import Geometry
 
@@ -28,28 +30,84 @@ def shapeFactor( WentrOvWcool ):
         # curve fit of COMBUSTION EFFECTS ON FILM COOLING manual figure 5 subsonic curve
         return (0.962+(0.299*WentrOvWcool))/(1+(0.67*WentrOvWcool)+(-0.06*WentrOvWcool**2))
 
+def shapeFactor_arr( WentrOvWcool ):
+    """Array version of shapeFactor."""
+    WentrOvWcool = np.asarray( WentrOvWcool, dtype=np.float64 )
+    W = np.minimum( WentrOvWcool, 1.4 ) # curve fit is only used up to 1.4
+    fitArr = (0.962+(0.299*W))/(1+(0.67*W)+(-0.06*W**2))
+    return np.where( WentrOvWcool > 1.4, 1.0 / 1.32,
+                     np.where( WentrOvWcool < 0.06, 1.0 / (1.0 + WentrOvWcool), fitArr ) )
+
+def calc_entrainment_arr( LprimeOvRcham, MRcore, pcentFFC, ko ):
+    """
+    Estimate entrained core flow into film cooled stream tube (inputs are broadcast against each other).
+    Return arrays (WentrOvWcool, effnessFC, MRbarrier, MRwall), see BarrierStream.calc_entrainment
+    """
+    ko = np.asarray( ko, dtype=np.float64 )
+    
+    # an approximation for equation 27 in COMBUSTION EFFECTS ON FILM COOLING, page 20
+    fracEntr = 2.0*(LprimeOvRcham*ko) - (LprimeOvRcham*ko)**2
+    
+    fracFFC = np.asarray( pcentFFC, dtype=np.float64 ) / 100.0
+    MReng = MRcore * (1.0 - fracFFC)
+    
+    # use a ref. flow rate of 1.0... will generate ratios from ref flow rate
+    wdotCoreInj = 1.0 # a ref flow rate
+    wdotFuelCoreInj = wdotCoreInj / (1.0 + MRcore)
+    wdotOxCoreInj = wdotCoreInj - wdotFuelCoreInj
+    wdotFuelTot = MReng * wdotOxCoreInj
+    
+    wdotFFC = fracFFC * wdotFuelTot # relative to ref wdotCoreInj
+    wdotEntr = fracEntr * wdotCoreInj
+    
+    WentrOvWcool = wdotEntr / wdotFFC
+
+    # shape factor comes from a curve fit of COMBUSTION EFFECTS ON FILM COOLING Figure 5, page 88
+    SFact = shapeFactor_arr( WentrOvWcool )
+    
+    # effectiveness come from equation 17 in COMBUSTION EFFECTS ON FILM COOLING, page 15
+    effnessFC = 1.0/(SFact * (1.0 + WentrOvWcool))
+    
+    wdotFuelEntr = wdotFuelCoreInj * fracEntr
+    wdotOxEntr = wdotOxCoreInj * fracEntr
+    
+    MRbarrier = wdotOxEntr / (wdotFuelEntr + wdotFFC)
+    
+    # using eqn (2) on page 7 (pdf 21) of COMBUSTION EFFECTS ON FILM COOLING
+    # film cooling effectiveness is always equal to the
+    # mass fraction of the injected film coolant gas within the gas mixture directly
+    # adjacent to the wall.
+    massfracOxWall = (1.0 - effnessFC) * MRbarrier / (1.0 + MRbarrier)
+    MRwall = massfracOxWall / (1.0 - massfracOxWall)
+    
+    return WentrOvWcool, effnessFC, MRbarrier, MRwall
+
 def solve_At_split( MRc, MRb, ffc, cstar_c, cstar_b ):
     """
     Given MRcore, MRbarrier, fracFFC, cstar_c and cstar_b, solve the throat area split
     between the core and barrier.
+    
+    Flow rate through each throat area fraction is proportional to fAt/cstar, so the
+    engine mixture ratio is a linear-fractional function of fAtc,
+    MReng = (p*MRc + q*MRb) / (p + q) with p = fAtc/(cstar_c*(MRc+1)) and q = (1-fAtc)/(cstar_b*(MRb+1)),
+    which gives fAtc = b / (a + b) with a = (MRc-MReng)/(cstar_c*(MRc+1)) and b = (MReng-MRb)/(cstar_b*(MRb+1)).
     """
     MReng = MRc * (1.0 - ffc)
-    fAtc_min = 0.0
-    fAtc_max = 1.0
-    ccm = cstar_c * (MRc + 1.0)
-    cbm = cstar_b * (MRb + 1.0)
-    for _ in range(40):
-        fAtc = (fAtc_min + fAtc_max)/2.0
-        
-        Atc = fAtc
-        Atb = 1.0 - fAtc
-        mre = (Atc*MRc/ccm + Atb*MRb/cbm) / (Atc/ccm + Atb/cbm)
-        
-        if mre < MReng:
-            fAtc_min = fAtc
-        else:
-            fAtc_max = fAtc
-    return (fAtc_min + fAtc_max)/2.0
+    a = (MRc - MReng) / (cstar_c * (MRc + 1.0))
+    b = (MReng - MRb) / (cstar_b * (MRb + 1.0))
+    if a + b == 0.0:
+        return 0.0 # MRc == MRb == MReng, any split works
+    return min(1.0, max(0.0, b / (a + b)))
+
+def solve_At_split_arr( MRc, MRb, ffc, cstar_c, cstar_b ):
+    """Array version of solve_At_split (inputs are broadcast against each other)."""
+    MRc, MRb, ffc, cstar_c, cstar_b = [np.asarray(v, dtype=np.float64) for v in (MRc, MRb, ffc, cstar_c, cstar_b)]
+    MReng = MRc * (1.0 - ffc)
+    a = (MRc - MReng) / (cstar_c * (MRc + 1.0))
+    b = (MReng - MRb) / (cstar_b * (MRb + 1.0))
+    denom = a + b
+    is_zero = denom == 0.0
+    return np.where( is_zero, 0.0, np.clip( b / np.where(is_zero, 1.0, denom), 0.0, 1.0 ) )
         
 
 class BarrierStream:
@@ -92,6 +150,9 @@ class BarrierStream:
         self.pcentFFC = pcentFFC
         self.ko        = ko
         self.warningL  = [] # list of any evaluate warnings
+        self.n_table_lookups = 0 # number of barrier CEA values taken from core stream ceaTable
+        
+        self.stages = StageTracker() # skips CEA and kinetics calcs if their inputs are unchanged
         
         self.evaluate()
         
@@ -108,80 +169,33 @@ class BarrierStream:
         """
         
         self.warningL  = []
-        
-        # figure out entrainment fraction and MRbarrier based on geometry and pcentFFC
-        LprimeOvRcham = self.geomObj.Lcham / self.geomObj.Rinj
-        
-        # an approximation for equation 27 in COMBUSTION EFFECTS ON FILM COOLING, page 20
-        fracEntr = 2.0*(LprimeOvRcham*self.ko) - (LprimeOvRcham*self.ko)**2
-        
-        fracFFC = self.pcentFFC / 100.0
-        MReng = self.coreObj.MRcore * (1.0 - fracFFC)
-        
-        # use a ref. flow rate of 1.0... will generate ratios from ref flow rate
-        wdotCoreInj = 1.0 # a ref flow rate
-        wdotFuelCoreInj = wdotCoreInj / (1.0 + self.coreObj.MRcore)
-        wdotOxCoreInj = wdotCoreInj - wdotFuelCoreInj
-        wdotFuelTot = MReng * wdotOxCoreInj
-        
-        wdotFFC = fracFFC * wdotFuelTot # relative to ref wdotCoreInj
-        wdotEntr = fracEntr * wdotCoreInj
-        
-        self.WentrOvWcool = wdotEntr / wdotFFC
-    
-        # shape factor comes from a curve fit of COMBUSTION EFFECTS ON FILM COOLING Figure 5, page 88
-        SFact = shapeFactor(self.WentrOvWcool)
-        
-        # effectiveness come from equation 17 in COMBUSTION EFFECTS ON FILM COOLING, page 15
-        self.effnessFC = 1.0/(SFact * (1.0 + self.WentrOvWcool))
-        
-        #wdotFuelEntr = wdotFuelTot * (fracEntr - (fracEntr * fracFFC))
-        wdotFuelEntr = wdotFuelCoreInj * fracEntr
-        wdotOxEntr = wdotOxCoreInj * fracEntr
-        
-        self.MRbarrier = wdotOxEntr / (wdotFuelEntr + wdotFFC)
-
-        #print('self.WentrOvWcool=%g'%self.WentrOvWcool,'    fracEntr=%g'%fracEntr, 
-        #      '   MRcore=%g'%self.coreObj.MRcore, '    effnessFC=%g'%self.effnessFC, 
-        #      '   MRbarrier=%g'%self.MRbarrier, '   MReng=%g'%MReng)
-
-        
-        # using eqn (2) on page 7 (pdf 21) of COMBUSTION EFFECTS ON FILM COOLING
-        # film cooling effectiveness is always equal to the
-        # mass fraction of the injected film coolant gas within the gas mixture directly
-        # adjacent to the wall.
-        massfracOxWall = (1.0 - self.effnessFC) * self.MRbarrier / (1.0 + self.MRbarrier)
-        self.MRwall = massfracOxWall / (1.0 - massfracOxWall)
-        
-        self.Twallgas = self.ceaObj.get_Tcomb( Pc=self.coreObj.Pc, MR=self.MRwall)
-        
-        # ........... calc ideal performance parameters
-        self.IspODE_b, self.cstarODE_b, self.TcODE_b, self.MWchm_b, self.gammaChm_b = \
-                self.ceaObj.get_IvacCstrTc_ChmMwGam( Pc=self.coreObj.Pc, MR=self.MRbarrier, 
-                                                     eps=self.geomObj.eps)
-        
-        self.cstarODE_b *= self.coreObj.adjCstarODE
-        self.IspODE_b *= self.coreObj.adjIspIdeal
-        
-        self.IspODF_b,_,_ = self.ceaObj.getFrozen_IvacCstrTc( Pc=self.coreObj.Pc, MR=self.MRbarrier, 
-                                                            eps=self.geomObj.eps)
-        self.IspODF_b *= self.coreObj.adjIspIdeal
-        
-        if self.IspODF_b < 10.0: # there's an error in frozen low MR CEA, so estimate from core 
-            self.warningL.append( 'WARNING... CEA failed frozen Isp for MR=%g'%self.MRbarrier  )
-            
-            self.IspODF_b = self.IspODE_b * (self.coreObj.IspODF / self.coreObj.IspODE)
-            
-            self.IspODK_b = self.IspODF_b + self.coreObj.fracKin*(self.IspODE_b - self.IspODF_b)
-            self.warningL.append( '           Estimated IspODF_b = %g sec'%self.IspODF_b  )
-        
-        else:
-            # use user effKin to set IspODK
-            self.IspODK_b = calc_IspODK(self.ceaObj, Pc=self.coreObj.Pc, eps=self.geomObj.eps, 
-                                        Rthrt=self.geomObj.Rthrt, 
-                                        pcentBell=self.geomObj.pcentBell, 
-                                        MR=self.MRbarrier)
-            self.IspODK_b *= self.coreObj.adjIspIdeal
+        self.calc_entrainment()
+        
+        # ........... calc ideal and kinetic performance parameters (skip if inputs unchanged)
+        # (CEA results do not depend on Rthrt, so throat sizing only re-runs the kinetics model)
+        self.ceaObj = self.coreObj.ceaObj
+        key = (self.ceaObj.cache_prefix, self.coreObj.Pc, self.MRwall, self.MRbarrier, 
+               self.geomObj.eps, self.coreObj.adjCstarODE, self.coreObj.adjIspIdeal,
+               id(self.coreObj.ceaTable))
+        is_clean, result = self.stages.get('barrier_thermo', key)
+        if not is_clean:
+            result = self.calc_thermo()
+            self.stages.set('barrier_thermo', key, result)
+        
+        self.Twallgas, self.IspODE_b, self.cstarODE_b, self.TcODE_b, self.MWchm_b, self.gammaChm_b,\
+            IspODF_b, warningL = result
+        self.warningL.extend( warningL )
+        
+        key = (self.ceaObj.cache_prefix, self.coreObj.Pc, self.MRbarrier, self.geomObj.eps, 
+               self.geomObj.Rthrt, self.geomObj.pcentBell, self.coreObj.adjIspIdeal,
+               self.coreObj.IspODF, self.coreObj.IspODE, self.coreObj.fracKin, IspODF_b)
+        is_clean, result = self.stages.get('barrier_kin', key)
+        if not is_clean:
+            result = self.calc_kinetics( IspODF_b )
+            self.stages.set('barrier_kin', key, result)
+        
+        self.IspODF_b, self.IspODK_b, warningL = result
+        self.warningL.extend( warningL )
         
         try:
             self.fracKin_b = (self.IspODK_b - self.IspODF_b) / (self.IspODE_b - self.IspODF_b)
@@ -213,6 +227,161 @@ class BarrierStream:
         self.cstarERE_b = self.cstarODE_b * self.effERE_b
         
     
+    def calc_entrainment(self):
+        """
+        Estimate entrained core flow into film cooled stream tube and set
+        WentrOvWcool, effnessFC, MRbarrier and MRwall.
+        """
+        # figure out entrainment fraction and MRbarrier based on geometry and pcentFFC
+        LprimeOvRcham = self.geomObj.Lcham / self.geomObj.Rinj
+        
+        resultL = calc_entrainment_arr( LprimeOvRcham, self.coreObj.MRcore, self.pcentFFC, self.ko )
+        self.WentrOvWcool, self.effnessFC, self.MRbarrier, self.MRwall = [float(v) for v in resultL]
+    
+    def get_cea_values(self, MR, frozen=True):
+        """
+        Return (IspODE, IspODF, cstarODE, TcODE, MWchm, gammaChm) at core Pc and eps for MR,
+        from the core stream CEA_Table if in fast lookup mode and MR is in table range,
+        otherwise from CEA (IspODF is None if frozen is False and not in table).
+        Ideal adjustments are NOT applied.
+        """
+        Pc = self.coreObj.Pc
+        eps = self.geomObj.eps
+        ceaTable = self.coreObj.ceaTable
+        if ceaTable is not None and ceaTable.is_in_range(Pc, MR, eps):
+            self.n_table_lookups += 1
+            return ceaTable( Pc, MR, eps )[:6]
+        
+        state = self.ceaObj.get_state( Pc=Pc, MR=MR, eps=eps, frozen=frozen)
+        return state.IspODE, state.IspODF, state.cstarODE, state.TcODE, state.MWchm, state.gammaChm
+    
+    def calc_thermo(self):
+        """
+        Run CEA (or CEA_Table lookup) for barrier stream tube.
+        Return (Twallgas, IspODE_b, cstarODE_b, TcODE_b, MWchm_b, gammaChm_b, IspODF_b, warningL)
+        """
+        warningL = []
+        
+        Twallgas = self.get_cea_values( self.MRwall, frozen=False )[3]
+        
+        # ........... calc ideal performance parameters
+        IspODE_b, IspODF_b, cstarODE_b, TcODE_b, MWchm_b, gammaChm_b = self.get_cea_values( self.MRbarrier )
+        
+        cstarODE_b *= self.coreObj.adjCstarODE
+        IspODE_b *= self.coreObj.adjIspIdeal
+        
+        IspODF_b = IspODF_b * self.coreObj.adjIspIdeal
+        
+        return (Twallgas, IspODE_b, cstarODE_b, TcODE_b, MWchm_b, gammaChm_b,
+                IspODF_b, warningL)
+    
+    def calc_kinetics(self, IspODF_b):
+        """
+        Run kinetics model for barrier stream tube (IspODF_b is the frozen Isp from calc_thermo).
+        Return (IspODF_b, IspODK_b, warningL)
+        """
+        warningL = []
+        
+        if IspODF_b < 10.0: # there's an error in frozen low MR CEA, so estimate from core 
+            warningL.append( 'WARNING... CEA failed frozen Isp for MR=%g'%self.MRbarrier  )
+            
+            IspODF_b = self.IspODE_b * (self.coreObj.IspODF / self.coreObj.IspODE)
+            
+            IspODK_b = IspODF_b + self.coreObj.fracKin*(self.IspODE_b - IspODF_b)
+            warningL.append( '           Estimated IspODF_b = %g sec'%IspODF_b  )
+        
+        else:
+            # use user effKin to set IspODK (unless precomputed, e.g. by scale_Rt_to_Thrust_batch)
+            IspODK_b = self.stages.get_precomputed('IspODK_b', (self.coreObj.Pc, self.geomObj.eps, 
+                                    self.geomObj.Rthrt, self.geomObj.pcentBell, self.MRbarrier) )
+            if IspODK_b is None:
+                IspODK_b = calc_IspODK(self.ceaObj, Pc=self.coreObj.Pc, eps=self.geomObj.eps, 
+                                       Rthrt=self.geomObj.Rthrt, 
+                                       pcentBell=self.geomObj.pcentBell, 
+                                       MR=self.MRbarrier)
+            IspODK_b *= self.coreObj.adjIspIdeal
+        
+        return (IspODF_b, IspODK_b, warningL)
+    
+    def evaluate_arr(self, pcentFFC=None, ko=None):
+        """
+        Array version of evaluate for arrays of pcentFFC and ko (broadcast against each other).
+        The core stream and efficiencies are held at their current values and
+        the attributes of BarrierStream are not changed.
+        CEA is only run once for each unique MRbarrier and MRwall.
+        
+        Return dictionary of arrays (index=name): pcentFFC, ko, WentrOvWcool, effnessFC,
+        MRbarrier, MRwall, Twallgas, IspODE_b, IspODF_b, IspODK_b, cstarODE_b, effKin_b,
+        effIsp_b, IspDel_b, cstarERE_b and warningL (list of warnings)
+        """
+        if pcentFFC is None:
+            pcentFFC = self.pcentFFC
+        if ko is None:
+            ko = self.ko
+        pcentFFC, ko = np.broadcast_arrays( np.asarray(pcentFFC, dtype=np.float64), 
+                                            np.asarray(ko, dtype=np.float64) )
+        pcentFFC, ko = pcentFFC.ravel(), ko.ravel()
+        
+        warningL = []
+        coreObj = self.coreObj
+        Pc = coreObj.Pc
+        eps = self.geomObj.eps
+        LprimeOvRcham = self.geomObj.Lcham / self.geomObj.Rinj
+        WentrOvWcool, effnessFC, MRbarrier, MRwall = calc_entrainment_arr( LprimeOvRcham, coreObj.MRcore, 
+                                                                            pcentFFC, ko )
+        
+        # ........... ideal performance (one CEA state or table lookup per unique MR)
+        TwallD = {}
+        for MR in np.unique( MRwall ):
+            TwallD[MR] = self.get_cea_values( float(MR), frozen=False )[3]
+        Twallgas = np.array( [TwallD[MR] for MR in MRwall] )
+        
+        stateD = {}
+        for MR in np.unique( MRbarrier ):
+            IspODE, IspODF, cstarODE = self.get_cea_values( float(MR) )[:3]
+            stateD[MR] = (IspODE, IspODF, cstarODE)
+        IspODE_b, IspODF_b, cstarODE_b = np.array( [stateD[MR] for MR in MRbarrier] ).reshape(-1, 3).T
+        
+        cstarODE_b = cstarODE_b * coreObj.adjCstarODE
+        IspODE_b = IspODE_b * coreObj.adjIspIdeal
+        IspODF_b = IspODF_b * coreObj.adjIspIdeal
+        
+        # ........... kinetics (estimate from core where CEA failed frozen Isp, see calc_kinetics)
+        is_bad = IspODF_b < 10.0
+        for MR in np.unique( MRbarrier[is_bad] ):
+            warningL.append( 'WARNING... CEA failed frozen Isp for MR=%g'%MR  )
+        
+        IspODF_b = np.where( is_bad, IspODE_b * (coreObj.IspODF / coreObj.IspODE), IspODF_b )
+        IspODK_b = IspODF_b + coreObj.fracKin*(IspODE_b - IspODF_b)
+        if not np.all( is_bad ):
+            IspODK_b[~is_bad] = coreObj.adjIspIdeal * calc_IspODK_arr(self.ceaObj, Pc=Pc, eps=eps, 
+                                    Rthrt=self.geomObj.Rthrt, pcentBell=self.geomObj.pcentBell, 
+                                    MR=MRbarrier[~is_bad])
+
+        effKin_b = np.where( IspODE_b > 0.0, IspODK_b / np.where(IspODE_b > 0.0, IspODE_b, 1.0),
+                             coreObj.effObj('Kin') )
+        
+        # ........ make final summary efficiencies (same as evaluate)
+        effObj = coreObj.effObj
+        
+        if effObj.effD['Noz'].is_const:
+            effNoz_b = effKin_b * effObj('Noz')
+        else:
+            effNoz_b = effKin_b * effObj('Div') * effObj('BL') * effObj('TP')
+        
+        if effObj.effD['ERE'].is_const:
+            effERE_b = effObj('ERE')
+        else:
+            effERE_b = effObj('Vap') * effObj('Mix') * effObj('Em') * effObj('HL')
+        
+        effIsp_b = effNoz_b * effERE_b
+        
+        return {'pcentFFC':pcentFFC, 'ko':ko, 'WentrOvWcool':WentrOvWcool, 'effnessFC':effnessFC,
+                'MRbarrier':MRbarrier, 'MRwall':MRwall, 'Twallgas':Twallgas, 
+                'IspODE_b':IspODE_b, 'IspODF_b':IspODF_b, 'IspODK_b':IspODK_b, 'cstarODE_b':cstarODE_b,
+                'effKin_b':effKin_b, 'effIsp_b':effIsp_b, 'IspDel_b':effIsp_b * IspODE_b, 
+                'cstarERE_b':cstarODE_b * effERE_b, 'warningL':warningL}
+    
     def summ_print(self):
         """
         print to standard output, the current state of BarrierStream instance.
@@ -359,8 +528,14 @@ class CoreStream:
         self.adjCstarODE = adjCstarODE # may want to adjust ODE cstar value
         self.adjIspIdeal = adjIspIdeal # may want to adjust ODE and ODF Isp values
         
-        # make CEA object
-        self.ceaObj = CEA_Obj(oxName=oxName, fuelName=fuelName)
+        # make CEA object (results are held in the shared CEA cache)
+        self.ceaObj = CachedCEA_Obj(oxName=oxName, fuelName=fuelName)
+        
+        # optional CEA_Table for fast lookup of ideal performance (see set_fast_lookup)
+        self.ceaTable = None
+        self.n_table_lookups = 0 # number of calc_cea_perf_params calls that used ceaTable
+        
+        self.stages = StageTracker() # skips CEA and nozzle separation calcs if their inputs are unchanged
         
         # ... if pcentFFC > 0.0, then there's barrier cooling
         if pcentFFC > 0.0:
@@ -375,6 +550,7 @@ class CoreStream:
             self.barrierObj = BarrierStream(self, pcentFFC=pcentFFC, ko=ko)
         else:
             self.barrierObj = None
+        self.saved_barrierObj = None # barrier removed by pcentFFC=0 (see batch_eval.set_pcentFFC)
         
         self.evaluate()
         
@@ -406,26 +582,69 @@ class CoreStream:
             raise Exception('Attempting to set un-authorized CoreStream attribute named "%s"'%name )
             
         if name in ['oxName','fuelName']:
-            # make CEA object
-            self.ceaObj = CEA_Obj(oxName=self.oxName, fuelName=self.fuelName)
+            # make CEA object (results are held in the shared CEA cache)
+            self.ceaObj = CachedCEA_Obj(oxName=self.oxName, fuelName=self.fuelName)
+            self.ceaTable = None # any CEA_Table is for the old propellants
 
             
         if re_evaluate:
             self.evaluate()
     
+    def set_fast_lookup(self, ceaTable):
+        """
+        Use a CEA_Table (see cea_table.py) to interpolate IspODE, IspODF, cstarODE, 
+        TcODE, MWchm, gammaChm and PcOvPe instead of running CEA. 
+        The barrier stream (if any) also uses ceaTable for its MRbarrier and MRwall.
+        Points outside of the table range (e.g. a low MRbarrier) are still run with CEA.
+        
+        NOTE: the kinetics model needs chamber species mass fractions that are not 
+        tabulated, so it still runs CEA (one equilibrium and one frozen run) at each 
+        new (Pc, MR, eps).  That includes effKin of the core stream (calc_all_eff) and 
+        IspODK_b of the barrier stream, which is evaluated whenever there is a barrier.
+        Those CEA results are held in the shared CEA cache.
+        Set ceaTable=None to return to running CEA at every point.
+        """
+        if ceaTable is not None:
+            if (ceaTable.oxName, ceaTable.fuelName) != (self.oxName, self.fuelName):
+                raise Exception('CEA_Table for %s/%s can not be used for %s/%s'%\
+                                (ceaTable.oxName, ceaTable.fuelName, self.oxName, self.fuelName))
+        self.ceaTable = ceaTable
+        self.evaluate()
+    
+    def calc_cea_values(self):
+        """
+        Return (IspODE, IspODF, cstarODE, TcODE, MWchm, gammaChm, PcOvPe) from CEA 
+        (or from ceaTable if in fast lookup mode), including the ideal adjustments.
+        """
+        if self.ceaTable is not None and self.ceaTable.is_in_range(self.Pc, self.MRcore, self.geomObj.eps):
+            # interpolate ideal performance parameters from table
+            IspODE, IspODF, cstarODE, TcODE, MWchm, gammaChm, PcOvPe = \
+                self.ceaTable( self.Pc, self.MRcore, self.geomObj.eps )
+            self.n_table_lookups += 1
+        else:
+            # calc ideal CEA performance parameters (one equilibrium and one frozen CEA run)
+            state = self.ceaObj.get_state( Pc=self.Pc, MR=self.MRcore, eps=self.geomObj.eps)
+            IspODE, IspODF, cstarODE, TcODE = state.IspODE, state.IspODF, state.cstarODE, state.TcODE
+            MWchm, gammaChm, PcOvPe = state.MWchm, state.gammaChm, state.PcOvPe
+        
+        cstarODE *= self.adjCstarODE
+        IspODE *= self.adjIspIdeal
+        IspODF *= self.adjIspIdeal
+        
+        return IspODE, IspODF, cstarODE, TcODE, MWchm, gammaChm, PcOvPe
+    
     def calc_cea_perf_params(self):
         """Calc basic Isp values from CEA and calc implied IspODK from current effKin value."""
         
-        # calc ideal CEA performance parameters
-        self.IspODE, self.cstarODE, self.TcODE, self.MWchm, self.gammaChm = \
-                self.ceaObj.get_IvacCstrTc_ChmMwGam( Pc=self.Pc, MR=self.MRcore, eps=self.geomObj.eps)
-        
-        self.cstarODE *= self.adjCstarODE
-        self.IspODE *= self.adjIspIdeal
+        # CEA results depend only on propellants, Pc, MRcore, eps and ideal adjustments
+        key = (self.oxName, self.fuelName, self.Pc, self.MRcore, self.geomObj.eps, 
+               self.adjCstarODE, self.adjIspIdeal, id(self.ceaTable))
+        is_clean, result = self.stages.get('cea', key)
+        if not is_clean:
+            result = self.calc_cea_values()
+            self.stages.set('cea', key, result)
         
-        self.IspODF,_,_ = self.ceaObj.getFrozen_IvacCstrTc( Pc=self.Pc, MR=self.MRcore, 
-                                                            eps=self.geomObj.eps)
-        self.IspODF *= self.adjIspIdeal
+        self.IspODE, self.IspODF, self.cstarODE, self.TcODE, self.MWchm, self.gammaChm, PcOvPe = result
         
         # use user effKin to set IspODK (or most recent update)
         self.IspODK = self.IspODE * self.effObj('Kin')
@@ -438,7 +657,7 @@ class CoreStream:
         self.fracKin = (self.IspODK - self.IspODF) / (self.IspODE - self.IspODF)
         
         
-        self.Pexit = self.Pc / self.ceaObj.get_PcOvPe( Pc=self.Pc, MR=self.MRcore, eps=self.geomObj.eps)
+        self.Pexit = self.Pc / PcOvPe
         
         self.CfVacIdeal = 32.174 * self.IspODE / self.cstarODE
         
@@ -532,8 +751,12 @@ class CoreStream:
             self.IspAmb = self.IspDel
             self.noz_mode = '(Pexit=%g psia)'%self.Pexit
         else:
-            CfOvCfvacAtEsep, CfOvCfvac, Cfsep, CfiVac, CfiAmbSimple, CfVac, self.epsSep, self.Psep = \
-                 sepNozzleCf(self.gammaChm, self.geomObj.eps, self.Pc, self.Pamb)
+            key = (self.gammaChm, self.geomObj.eps, self.Pc, self.Pamb)
+            is_clean, result = self.stages.get('noz_sep', key)
+            if not is_clean:
+                result = sepNozzleCf(self.gammaChm, self.geomObj.eps, self.Pc, self.Pamb)
+                self.stages.set('noz_sep', key, result)
+            CfOvCfvacAtEsep, CfOvCfvac, Cfsep, CfiVac, CfiAmbSimple, CfVac, self.epsSep, self.Psep = result
             #print('epsSep=%g, Psep=%g'%(self.epsSep, self.Psep))
             #print('========= Pexit=%g'%self.Pexit, '    Psep=%g'%self.Psep, '  epsSep=%g'%self.epsSep)
             
@@ -570,6 +793,43 @@ class CoreStream:
         self.CfVacDel = self.FvacTotal / (self.geomObj.At * self.Pc) # includes impact of CdThroat
         self.CfAmbDel = self.Fambient  / (self.geomObj.At * self.Pc) # includes impact of CdThroat
     
+    def evaluate_ffc_arr(self, pcentFFC=None, ko=None):
+        """
+        Evaluate the thruster for arrays of pcentFFC and ko (broadcast against each other)
+        in one vectorized call, e.g. for film cooling trades of IspDel vs Twallgas.
+        The core stream and efficiencies are held at their current values and
+        the attributes of CoreStream are not changed. (requires a barrier stream, i.e. pcentFFC > 0)
+        
+        Return dictionary of arrays from BarrierStream.evaluate_arr plus frac_At_core,
+        wdotTot, FvacTotal, IspDel, effFFC and MRthruster.
+        """
+        if not self.add_barrier:
+            raise Exception('evaluate_ffc_arr requires a barrier stream (pcentFFC > 0)')
+        
+        resultD = self.barrierObj.evaluate_arr( pcentFFC=pcentFFC, ko=ko )
+        
+        # same as evaluate with barrier
+        effERE_core = self.effObj('ERE')
+        cstarERE_core = self.cstarODE * effERE_core
+        
+        fAtc = solve_At_split_arr( self.MRcore, resultD['MRbarrier'], resultD['pcentFFC'] / 100.0,
+                                   cstarERE_core, resultD['cstarERE_b'] )
+        
+        wdotTot_b = self.Pc * (1.0 - fAtc) * self.geomObj.At * self.CdThroat * 32.174 / resultD['cstarERE_b']
+        wdotTot_c = self.Pc * fAtc * self.geomObj.At * self.CdThroat * 32.174 / cstarERE_core
+        
+        FvacTotal = wdotTot_c * self.IspDel_core + wdotTot_b * resultD['IspDel_b']
+        wdotTot = wdotTot_c + wdotTot_b
+        
+        resultD['frac_At_core'] = fAtc
+        resultD['wdotTot'] = wdotTot
+        resultD['FvacTotal'] = FvacTotal
+        resultD['IspDel'] = FvacTotal / wdotTot
+        resultD['effFFC'] = resultD['IspDel'] / self.IspDel_core
+        resultD['MRthruster'] = self.MRcore * (1.0 - resultD['pcentFFC'] / 100.0)
+        
+        return resultD
+    
     def summ_print(self):
         """
         print to standard output, the current state of CoreStream instance.
@@ -678,6 +938,12 @@ class CoreStream:
         
         if self.CdThroat_method != 'default':
             M.add_inp_comment('CdThroat', '(%s)'%self.CdThroat_method)
+        
+        if self.ceaTable is not None and self.ceaTable.is_in_range(self.Pc, self.MRcore, self.geomObj.eps):
+            if self.ceaTable.errorD:
+                M.add_out_comment('IspODE', 'table lookup, max err %.3f%%'%(100.0*self.ceaTable.errorD['IspODE']))
+            else:
+                M.add_out_comment('IspODE', 'table lookup')
             
         
         if self.add_barrier:
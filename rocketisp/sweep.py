@@ -0,0 +1,276 @@
+r"""
+Parametric sweeps of a RocketThruster with process-pool parallelism.
+
+A sweep takes a set of design points, each a value for some of the inputs of
+RocketThruster, CoreStream, Geometry, BarrierStream or Injector (see SWEEP_INPUT_L),
+and evaluates every point.  Design points can be a full-factorial grid
+(full_factorial), a Latin hypercube sample (latin_hypercube) or any user
+supplied list of dictionaries, dictionary of arrays or numpy structured array.
+oxName and fuelName can also be swept (string inputs).
+
+Points are split into chunks and evaluated by a pool of worker processes
+(CEA is not thread-safe).  Workers receive a ThrusterSpec (see thruster_spec.py)
+and build one warm thruster, with its own CEA object, for each propellant pair
+they see, so CEA results and kinetic models are reused from point to point.  Results are returned as a numpy structured
+array with one column for each input and each numeric output attribute of
+the thruster (efficiencies are columns named "eff" + name), and can be saved as CSV.
+
+For example::
+
+    from rocketisp.sweep import run_sweep, full_factorial
+
+    inpD = full_factorial( MRcore=[1.4, 1.6, 1.8], eps=[20, 40, 80], Pc=[150, 300] )
+    resultArr = run_sweep( R, inpD, csv_file='sweep.csv' )
+    print( resultArr['IspDel'] )
+"""
+import os
+import csv
+import numpy as np
+from rocketisp.thruster_spec import ThrusterSpec
+from rocketisp.design_optimizer import evaluate_design, get_output, DESIGN_VAR_L
+
+PROPELLANT_INPUT_L = ['oxName', 'fuelName']
+SWEEP_INPUT_L = DESIGN_VAR_L + PROPELLANT_INPUT_L
+
+# numeric attributes that count calls or cache use, they are not outputs of the design
+SWEEP_EXCLUDE_L = ['n_evals_mr_search', 'n_table_lookups', 'nozzle_build_count', 'nozzle_rescale_count']
+
+def full_factorial( **levelsD ):
+    """
+    Return dictionary of input arrays for every combination of input levels
+    (e.g. full_factorial(MRcore=[1.4, 1.6], eps=[20, 40]) gives 4 points).
+    """
+    nameL = list( levelsD.keys() )
+    gridL = np.meshgrid( *[np.asarray(levelsD[name]) for name in nameL], indexing='ij' )
+    return dict( [(name, grid.ravel()) for name, grid in zip(nameL, gridL)] )
+
+def latin_hypercube( Npts, seed=None, **boundsD ):
+    """
+    Return dictionary of input arrays for Npts points of a Latin hypercube sample
+    (e.g. latin_hypercube(20, MRcore=(1.4, 2.0), eps=(20, 80)).
+    Each input range is split into Npts equal intervals with one point in each interval.
+    """
+    rng = np.random.default_rng( seed )
+    inpD = {}
+    for name, (lo, hi) in boundsD.items():
+        fracArr = (rng.permutation( Npts ) + rng.random( Npts )) / Npts
+        inpD[name] = lo + fracArr * (hi - lo)
+    return inpD
+
+def get_sweep_points( inputs ):
+    """
+    Return (list of input names, list of point dictionaries) for inputs given as
+    a dictionary of arrays, a numpy structured array or a list of dictionaries.
+    Scalar values in a dictionary of arrays are applied to every point.
+    """
+    if isinstance(inputs, np.ndarray) and inputs.dtype.names:
+        inputs = dict( [(name, inputs[name]) for name in inputs.dtype.names] )
+
+    if isinstance(inputs, dict):
+        nameL = list( inputs.keys() )
+        Npts = max( [np.size(v) if not isinstance(v, str) else 1 for v in inputs.values()] + [1] )
+        colL = []
+        for name in nameL:
+            v = inputs[name]
+            if isinstance(v, str) or np.ndim(v) == 0:
+                colL.append( [v] * Npts )
+            elif len(v) != Npts:
+                raise Exception('sweep input "%s" has %i values, expected %i'%(name, len(v), Npts))
+            else:
+                colL.append( list(v) )
+        pointL = [dict( zip(nameL, row) ) for row in zip(*colL)]
+    else:
+        pointL = [dict(point) for point in inputs]
+        nameL = []
+        for point in pointL:
+            nameL.extend( [name for name in point.keys() if name not in nameL] )
+
+    for name in nameL:
+        if name not in SWEEP_INPUT_L:
+            raise Exception('"%s" is not a recognized sweep input'%name)
+
+    for point in pointL:
+        for name, value in point.items():
+            if name in PROPELLANT_INPUT_L:
+                point[name] = str( value )
+            elif value is None or (isinstance(value, float) and np.isnan(value)):
+                point[name] = None # no user input (e.g. LchamberInp)
+            else:
+                point[name] = float( value )
+
+    return nameL, pointL
+
+def get_output_names( rocketObj ):
+    """
+    Return list of names of all numeric output attributes of rocketObj.
+    Attribute names are searched in the order RocketThruster, CoreStream,
+    Geometry, BarrierStream and Injector, then efficiencies are added as "eff" + name.
+    Bookkeeping counters in SWEEP_EXCLUDE_L are not outputs.
+    """
+    coreObj = rocketObj.coreObj
+    nameL = []
+    for obj in [rocketObj, coreObj, rocketObj.geomObj, coreObj.barrierObj, rocketObj.injObj]:
+        if obj is None:
+            continue
+        for name, value in vars(obj).items():
+            if isinstance(value, (int, float, np.floating, np.integer)) and not isinstance(value, bool):
+                if name not in nameL and name not in SWEEP_EXCLUDE_L:
+                    nameL.append( name )
+    nameL.extend( ['eff'+name for name in coreObj.effObj.effD.keys() if 'eff'+name not in nameL] )
+    return nameL
+
+# ........ worker process support (each worker keeps one thruster per propellant pair)
+_worker_stateD = {}
+
+def _init_worker( spec, output_nameL, ThrustLbf, Pamb ):
+    _worker_stateD.clear()
+    _worker_stateD['args'] = (spec, output_nameL, ThrustLbf, Pamb)
+    _worker_stateD['thrusterD'] = {} # index=(oxName, fuelName), value=RocketThruster
+
+def _evaluate_chunk( pointL ):
+    """Return list of output rows (tuples in order of output_nameL) for list of points."""
+    spec, output_nameL, ThrustLbf, Pamb = _worker_stateD['args']
+    thrusterD = _worker_stateD['thrusterD']
+
+    rowL = []
+    for point in pointL:
+        prop_key = (point.get('oxName', spec.coreD['oxName']), point.get('fuelName', spec.coreD['fuelName']))
+        if prop_key not in thrusterD:
+            # thruster is built in the worker process (see ThrusterSpec)
+            thrusterD[prop_key] = spec.copy( oxName=prop_key[0], fuelName=prop_key[1] ).build()
+        R = thrusterD[prop_key]
+
+        evaluate_design( R, dict( [(k,v) for k,v in point.items() if k not in PROPELLANT_INPUT_L] ), [],
+                         ThrustLbf=ThrustLbf, Pamb=Pamb )
+
+        row = []
+        for name in output_nameL:
+            try:
+                row.append( float( get_output(R, name) ) )
+            except Exception:
+                row.append( np.nan ) # output does not apply to this point (e.g. epsSep in vacuum)
+        rowL.append( tuple(row) )
+    return rowL
+
+def run_sweep( rocketObj, inputs, n_workers=None, output_nameL=None, ThrustLbf=None, Pamb=0.0,
+               csv_file=None, chunksize=None ):
+    """
+    Evaluate rocketObj at every sweep point and return a numpy structured array
+    of inputs and outputs, one row per point.
+    rocketObj is not changed by the sweep.
+
+    :param rocketObj: RocketThruster to sweep
+    :param inputs: dictionary of arrays, structured array or list of dictionaries of inputs (see SWEEP_INPUT_L)
+    :param n_workers: number of worker processes (default is number of cores, 1=no parallel)
+    :param output_nameL: list of output names (default is all numeric outputs, see get_output_names)
+    :param ThrustLbf: lbf, if not None, scale throat to give ThrustLbf at Pamb for every point
+    :param Pamb: psia, ambient pressure for ThrustLbf
+    :param csv_file: if not None, save results to csv_file
+    :param chunksize: number of points sent to a worker at a time (default gives about 4 chunks per worker)
+    :type rocketObj: RocketThruster
+    :type inputs: dict
+    :type n_workers: int
+    :type output_nameL: list
+    :type ThrustLbf: float
+    :type Pamb: float
+    :type csv_file: str
+    :type chunksize: int
+    :return: structured array of results, one row per point
+    :rtype: numpy.ndarray
+    """
+    inp_nameL, pointL = get_sweep_points( inputs )
+    Npts = len( pointL )
+
+    # inputs missing from a point use the value of rocketObj (points share warm thrusters)
+    coreObj = rocketObj.coreObj
+    for name in inp_nameL:
+        if name in PROPELLANT_INPUT_L:
+            base_value = getattr( coreObj, name )
+        else:
+            try:
+                base_value = get_output( rocketObj, name )
+            except Exception:
+                base_value = 0.0 if name == 'pcentFFC' else None
+        for point in pointL:
+            point.setdefault( name, base_value )
+
+    if output_nameL is None:
+        output_nameL = [name for name in get_output_names( rocketObj ) if name not in inp_nameL]
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, Npts))
+    if chunksize is None:
+        chunksize = max(1, Npts // (4*n_workers))
+    chunkL = [pointL[i:i+chunksize] for i in range(0, Npts, chunksize)]
+
+    init_args = (ThrusterSpec.from_thruster( rocketObj ), output_nameL, ThrustLbf, Pamb)
+    if n_workers > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool( n_workers, initializer=_init_worker, initargs=init_args )
+        try:
+            rowLL = pool.map( _evaluate_chunk, chunkL, chunksize=1 )
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        _init_worker( *init_args )
+        try:
+            rowLL = [_evaluate_chunk( chunk ) for chunk in chunkL]
+        finally:
+            _worker_stateD.clear()
+
+    # ........ build columnar results
+    dtype = []
+    for name in inp_nameL:
+        if name in PROPELLANT_INPUT_L:
+            dtype.append( (name, 'U%i'%max([len(p[name]) for p in pointL] + [1])) )
+        else:
+            dtype.append( (name, np.float64) )
+    dtype.extend( [(name, np.float64) for name in output_nameL] )
+
+    resultArr = np.zeros( Npts, dtype=dtype )
+    for name in inp_nameL:
+        if name in PROPELLANT_INPUT_L:
+            resultArr[name] = [p[name] for p in pointL]
+        else:
+            resultArr[name] = [np.nan if p[name] is None else p[name] for p in pointL]
+
+    outArr = np.array( [row for rowL in rowLL for row in rowL], dtype=np.float64 ).reshape(Npts, -1)
+    for j, name in enumerate( output_nameL ):
+        resultArr[name] = outArr[:, j]
+
+    if csv_file:
+        save_sweep_csv( resultArr, csv_file )
+    return resultArr
+
+def save_sweep_csv( resultArr, csv_file ):
+    """Save structured array of sweep results to csv_file (header row holds the column names)."""
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer( f )
+        writer.writerow( resultArr.dtype.names )
+        for row in resultArr.tolist():
+            writer.writerow( ['%.10g'%v if isinstance(v, float) else v for v in row] )
+
+def load_sweep_csv( csv_file ):
+    """Return structured array of sweep results from csv_file (made by save_sweep_csv)."""
+    return np.genfromtxt( csv_file, delimiter=',', names=True, dtype=None, encoding='utf-8' )
+
+
+if __name__ == '__main__':
+    import time
+    from rocketisp.geometry import Geometry
+    from rocketisp.efficiencies import Efficiencies
+    from rocketisp.stream_tubes import CoreStream
+    from rocketisp.rocket_isp import RocketThruster
+
+    C = CoreStream( geomObj=Geometry(eps=375), effObj=Efficiencies(ERE=0.99), pcentFFC=30,
+                    oxName='N2O4', fuelName='N2H4', MRcore=1.26, Pc=137, Pamb=0)
+    R = RocketThruster(name='100 lbf Aerojet HiPAT R-4D', coreObj=C)
+
+    inpD = full_factorial( MRcore=np.linspace(1.0, 1.5, 6), pcentFFC=[10.0, 20.0, 30.0] )
+    t0 = time.time()
+    resultArr = run_sweep( R, inpD, ThrustLbf=100.0 )
+    print( '%i points, %i columns in %.2f sec'%(len(resultArr), len(resultArr.dtype.names), time.time()-t0) )
+
+    for row in resultArr[ ['MRcore', 'pcentFFC', 'IspDel', 'Twallgas', 'Rthrt'] ]:
+        print( 'MRcore=%5.2f  pcentFFC=%4.1f  IspDel=%7.2f  Twallgas=%6.0f  Rthrt=%.4f'%tuple(row) )
@@ -0,0 +1,167 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+import numpy as np
+import rocketisp.rocket_isp
+from rocketisp.batch_eval import evaluate_batch, BATCH_EFF_L
+from rocketisp.tests.thruster_builders import make_thruster
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_batch_matches_single_points(self):
+        """test batch matches single points"""
+        R = make_thruster()
+        IspDel_orig = R.coreObj.IspDel
+        
+        MRArr = np.array([1.4, 1.6, 1.8])
+        RtArr = np.array([0.8, 1.0, 1.2])
+        resultArr = R.evaluate_batch( MRcore=MRArr, Rthrt=RtArr, Pc=200.0 )
+        
+        self.assertEqual( len(resultArr), 3 )
+        for name in BATCH_EFF_L:
+            self.assertIn( 'eff'+name, resultArr.dtype.names )
+        
+        # thruster is returned to original state
+        self.assertAlmostEqual(R.coreObj.IspDel, IspDel_orig, places=6)
+        self.assertAlmostEqual(R.geomObj.Rthrt, 1.0, places=9)
+        
+        for i in range(3):
+            R2 = make_thruster()
+            R2.coreObj.reset_attr('Pc', 200.0, re_evaluate=False)
+            R2.coreObj.reset_attr('MRcore', MRArr[i], re_evaluate=False)
+            R2.geomObj.reset_attr('Rthrt', RtArr[i], re_evaluate=True)
+            R2.coreObj.evaluate()
+            R2.calc_all_eff()
+            
+            self.assertAlmostEqual(resultArr['IspDel'][i], R2.coreObj.IspDel, places=6)
+            self.assertAlmostEqual(resultArr['FvacTotal'][i], R2.coreObj.FvacTotal, places=6)
+            self.assertAlmostEqual(resultArr['effBL'][i], R2.coreObj.effObj('BL'), places=9)
+            self.assertAlmostEqual(resultArr['effKin'][i], R2.coreObj.effObj('Kin'), places=9)
+    
+    def test_batch_pcentFFC(self):
+        """test batch pcentFFC"""
+        R = make_thruster( pcentFFC=0.0 )
+        IspDel_orig = R.coreObj.IspDel
+        
+        resultArr = evaluate_batch( R, {'pcentFFC':[0.0, 10.0]} )
+        self.assertAlmostEqual(resultArr['IspDel'][0], IspDel_orig, places=6)
+        self.assertAlmostEqual(resultArr['effFFC'][0], 1.0, places=9)
+        self.assertLess(resultArr['effFFC'][1], 1.0)
+        
+        self.assertIsNone( R.coreObj.barrierObj )
+        self.assertAlmostEqual(R.coreObj.IspDel, IspDel_orig, places=6)
+        
+        with self.assertRaises(Exception):
+            evaluate_batch( R, MRbad=[1.0, 2.0] )
+        
+        # inputs that would not be applied
+        with self.assertRaises(Exception):
+            evaluate_batch( R, ko=[0.04, 0.05] ) # no barrier stream
+        with self.assertRaises(Exception):
+            evaluate_batch( R, CdThroat=[0.98, 0.99] ) # replaced by Cd model
+    
+    def test_batch_pcentFFC_order(self):
+        """test batch pcentFFC order"""
+        R = make_thruster( ko=0.06 )
+        
+        # barrier removed by pcentFFC=0 comes back with the thruster's ko
+        IspDel = R.evaluate_batch( pcentFFC=[10.0] )['IspDel'][0]
+        resultArr = R.evaluate_batch( pcentFFC=[0.0, 10.0, 0.0, 10.0] )
+        self.assertAlmostEqual( resultArr['IspDel'][1], IspDel, places=9 )
+        self.assertAlmostEqual( resultArr['IspDel'][3], IspDel, places=9 )
+        
+        resultArr = R.evaluate_batch( pcentFFC=[0.0, 10.0], ko=0.04 )
+        self.assertAlmostEqual( resultArr['IspDel'][1], 
+                                R.evaluate_batch( pcentFFC=10.0, ko=0.04 )['IspDel'][0], places=9 )
+    
+    def test_batch_uses_array_models(self):
+        """test batch uses array models"""
+        R = make_thruster()
+        
+        # scalar MLP models should not be called point by point
+        callL = []
+        def count_calls( func ):
+            def wrapper(*args, **kwargs):
+                callL.append( func.__name__ )
+                return func(*args, **kwargs)
+            return wrapper
+        
+        saveD = dict( [(name, getattr(rocketisp.rocket_isp, name)) for name in ['calc_Cd', 'calc_pcentLossBL', 'calc_IspODK']] )
+        try:
+            for name, func in saveD.items():
+                setattr( rocketisp.rocket_isp, name, count_calls(func) )
+            resultArr = R.evaluate_batch( MRcore=[1.4, 1.6, 1.8], Rthrt=[0.8, 1.0, 1.2], Pc=200.0 )
+        finally:
+            for name, func in saveD.items():
+                setattr( rocketisp.rocket_isp, name, func )
+        
+        self.assertEqual( callL, [] )
+        
+        R2 = make_thruster()
+        R2.coreObj.reset_attr('Pc', 200.0, re_evaluate=False)
+        R2.coreObj.reset_attr('MRcore', 1.8, re_evaluate=False)
+        R2.geomObj.reset_attr('Rthrt', 1.2, re_evaluate=True)
+        R2.calc_all_eff()
+        self.assertAlmostEqual(resultArr['IspDel'][2], R2.coreObj.IspDel, places=9)
+        self.assertAlmostEqual(resultArr['CdThroat'][2], R2.coreObj.CdThroat, places=9)
+
+
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
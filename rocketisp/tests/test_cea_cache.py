@@ -0,0 +1,250 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+from rocketcea.cea_obj import CEA_Obj
+from rocketisp.cea_cache import CachedCEA_Obj, CEA_ResultCache, get_cea_cache_stats, clear_cea_cache
+from rocketisp.geometry import Geometry
+from rocketisp.efficiencies import Efficiencies
+from rocketisp.stream_tubes import CoreStream
+from rocketisp.cea_store import CEA_Store, enable_cea_store, disable_cea_store, get_cea_store, \
+    STORE_SCHEMA_VERSION, get_rocketcea_version
+import rocketisp.cea_cache
+import tempfile
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_cached_values_match_CEA(self):
+        """test cached values match CEA"""
+        clear_cea_cache()
+        ceaObj = CEA_Obj(oxName='N2O4', fuelName='MMH')
+        cachedObj = CachedCEA_Obj(oxName='N2O4', fuelName='MMH')
+        
+        for _ in range(2):
+            a = ceaObj.get_IvacCstrTc_ChmMwGam( Pc=500, MR=1.9, eps=40)
+            b = cachedObj.get_IvacCstrTc_ChmMwGam( Pc=500, MR=1.9, eps=40)
+            for va, vb in zip(a, b):
+                self.assertAlmostEqual(va, vb, places=6)
+        
+            a = ceaObj.getFrozen_IvacCstrTc( Pc=500, MR=1.9, eps=40)
+            b = cachedObj.getFrozen_IvacCstrTc( 500, 1.9, 40) # positional args share cache entry
+            for va, vb in zip(a, b):
+                self.assertAlmostEqual(va, vb, places=6)
+            
+            a = ceaObj.get_SonicVelocities( Pc=500, MR=1.9, eps=40)
+            b = cachedObj.get_SonicVelocities( Pc=500, MR=1.9, eps=40)
+            self.assertIsInstance(b, list)
+            self.assertAlmostEqual(a[0], b[0], places=6)
+        
+        # all three methods are answered from one CEA_State (one equilibrium and one frozen run)
+        statsD = get_cea_cache_stats()
+        self.assertEqual(statsD['misses'], 1)
+        self.assertEqual(statsD['hits'], 5)
+        self.assertEqual(statsD['cea_runs'], 2)
+    
+    def test_fused_state_matches_CEA(self):
+        """test fused state matches CEA"""
+        clear_cea_cache()
+        ceaObj = CEA_Obj(oxName='LOX', fuelName='CH4')
+        cachedObj = CachedCEA_Obj(oxName='LOX', fuelName='CH4')
+        
+        state = cachedObj.get_state( Pc=300, MR=3.2, eps=25 )
+        self.assertEqual( get_cea_cache_stats()['cea_runs'], 2 )
+        
+        IspODE, cstarODE, TcODE, MWchm, gammaChm = ceaObj.get_IvacCstrTc_ChmMwGam( Pc=300, MR=3.2, eps=25)
+        self.assertAlmostEqual(state.IspODE, IspODE, places=9)
+        self.assertAlmostEqual(state.cstarODE, cstarODE, places=9)
+        self.assertAlmostEqual(state.TcODE, TcODE, places=9)
+        self.assertAlmostEqual(state.MWchm, MWchm, places=9)
+        self.assertAlmostEqual(state.gammaChm, gammaChm, places=9)
+        self.assertAlmostEqual(state.IspODF, ceaObj.getFrozen_IvacCstrTc( Pc=300, MR=3.2, eps=25)[0], places=9)
+        self.assertAlmostEqual(state.PcOvPe, ceaObj.get_PcOvPe( Pc=300, MR=3.2, eps=25), places=9)
+        self.assertAlmostEqual(state.TcODE, ceaObj.get_Tcomb( Pc=300, MR=3.2), places=9)
+        for a, b in zip( state.sonicVelL, ceaObj.get_SonicVelocities( Pc=300, MR=3.2, eps=25) ):
+            self.assertAlmostEqual(a, b, places=9)
+        
+        molWtD, massFracD = ceaObj.get_SpeciesMassFractions( Pc=300, MR=3.2, eps=25)
+        self.assertEqual( sorted(massFracD.keys()), sorted(state.massFracD.keys()) )
+        for sp, mfL in massFracD.items():
+            for a, b in zip( mfL, state.massFracD[sp] ):
+                self.assertAlmostEqual(a, b, places=12)
+        
+        # frozen at throat is not part of the state, so it is a separate CEA run
+        cachedObj.getFrozen_IvacCstrTc( Pc=300, MR=3.2, eps=25, frozenAtThroat=1)
+        self.assertEqual( get_cea_cache_stats()['cea_runs'], 3 )
+    
+    def test_canonical_inputs(self):
+        """test canonical inputs"""
+        clear_cea_cache()
+        cachedObj = CachedCEA_Obj(oxName='LOX', fuelName='CH4')
+        cachedObj.get_Tcomb( Pc=500, MR=3.6 )
+        cachedObj.get_Tcomb( Pc=500.0, MR=3.6000000000001 )
+        self.assertEqual( get_cea_cache_stats()['hits'], 1)
+        
+        # different propellant pair is a different entry
+        CachedCEA_Obj(oxName='N2O4', fuelName='MMH').get_Tcomb( Pc=500, MR=3.6 )
+        self.assertEqual( get_cea_cache_stats()['misses'], 2)
+    
+    def test_lru_discards_oldest(self):
+        """test lru discards oldest"""
+        C = CEA_ResultCache( maxsize=2 )
+        C.set( 'a', 1 )
+        C.set( 'b', 2 )
+        self.assertEqual( C.get('a'), 1 ) # makes 'b' the least recently used
+        C.set( 'c', 3 )
+        self.assertIsNone( C.get('b') )
+        self.assertEqual( len(C), 2 )
+        self.assertEqual( C.get_stats()['hits'], 1 )
+        self.assertEqual( C.get_stats()['misses'], 1 )
+    
+    def test_core_stream_uses_cache(self):
+        """test core stream uses cache"""
+        C = CoreStream( geomObj=Geometry(eps=35), 
+                effObj=Efficiencies(ERE=0.98, Noz=0.97), 
+                oxName='LOX', fuelName='CH4',  MRcore=3.6,
+                Pc=500, Pamb=14.7)
+        
+        hits_before = get_cea_cache_stats()['hits']
+        C.reset_attr('Pamb', 14.7, re_evaluate=True)
+        self.assertGreater( get_cea_cache_stats()['hits'], hits_before )
+        self.assertAlmostEqual(C('IspDel'), 345.2795, places=2)
+        self.assertAlmostEqual(C('IspAmb'), 251.9288, places=2)
+    
+    def test_persistent_store(self):
+        """test persistent store"""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            enable_cea_store( tmp_dir )
+            clear_cea_cache()
+            cachedObj = CachedCEA_Obj(oxName='LOX', fuelName='LH2')
+            a = cachedObj.get_IvacCstrTc_ChmMwGam( Pc=1000, MR=6, eps=80)
+            mf = cachedObj.get_SpeciesMassFractions( Pc=1000, MR=6, eps=80)
+            
+            store = get_cea_store( cachedObj.cache_prefix )
+            self.assertEqual( store.n_written, 1 ) # both results are in one CEA_State
+            
+            # a fresh in-memory cache (e.g. a new session) reads from disk
+            clear_cea_cache()
+            b = cachedObj.get_IvacCstrTc_ChmMwGam( Pc=1000, MR=6, eps=80)
+            self.assertEqual( store.n_read, 1 )
+            for va, vb in zip(a, b):
+                self.assertAlmostEqual(va, vb, places=9)
+            
+            # a second connection (e.g. another process) sees the same results
+            other = CEA_Store( store.filename )
+            self.assertEqual( len(other), 1 )
+            stateD = other.get( (cachedObj.cache_prefix, 'get_state', 1000.0, 6.0, 80.0) )
+            self.assertEqual( sorted(mf[1].keys()), sorted(stateD['massFracD'].keys()) )
+            
+            # adding frozen values to a state replaces the stored state
+            cachedObj.get_state( Pc=1000, MR=6, eps=80 )
+            self.assertIsNotNone( other.get( (cachedObj.cache_prefix, 'get_state', 1000.0, 6.0, 80.0) )['IspODF'] )
+            other.close()
+            
+            # results of another rocketcea version (or store layout) are discarded
+            self.assertEqual( other.get_meta()['schema_version'], STORE_SCHEMA_VERSION )
+            conn = other.get_connection()
+            conn.execute("UPDATE meta SET value='0.0.0' WHERE name='rocketcea_version'")
+            conn.commit()
+            other.close()
+            
+            stale = CEA_Store( store.filename )
+            self.assertEqual( len(stale), 0 )
+            self.assertEqual( stale.n_rebuilds, 1 )
+            self.assertEqual( stale.get_meta()['rocketcea_version'], get_rocketcea_version() )
+            stale.close()
+        finally:
+            disable_cea_store()
+            clear_cea_cache()
+    
+    def test_unusable_store(self):
+        """test unusable store"""
+        # store directory can not be made under a file
+        tmp_file = tempfile.mkstemp()[1]
+        try:
+            enable_cea_store( os.path.join( tmp_file, 'store' ) )
+            clear_cea_cache()
+            C = CoreStream( geomObj=Geometry(eps=40), effObj=Efficiencies(ERE=0.98), 
+                            oxName='N2O4', fuelName='MMH', MRcore=1.6, Pc=150 )
+            self.assertGreater( C.IspDel, 0.0 )
+            
+            store = get_cea_store( C.ceaObj.cache_prefix )
+            self.assertNotEqual( store.error_msg, '' )
+            self.assertEqual( (store.n_read, store.n_written, len(store)), (0, 0, 0) )
+        finally:
+            disable_cea_store()
+            clear_cea_cache()
+            os.remove( tmp_file )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            if 'TRAVIS' not in os.environ:
+                runpy = imp.load_source('__main__',  rocketisp.cea_cache.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+
+
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
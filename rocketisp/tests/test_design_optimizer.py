@@ -0,0 +1,140 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+import rocketisp.design_optimizer
+from rocketisp.design_optimizer import DesignOptimizer, get_output
+from rocketisp.tests.thruster_builders import make_thruster, run_serial_and_parallel
+
+INJ_D = {'fdPinjOx':0.25, 'fdPinjFuel':0.25}
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_optimize_with_constraints(self):
+        """test optimize with constraints"""
+        R = make_thruster( injD=INJ_D )
+        opt = DesignOptimizer( R, varD={'MRcore':(1.2, 2.4), 'eps':(10.0, 100.0)},
+                               constraintL=[('Ltotal', '<=', 20.0), ('chug_margin_ox', '>=', 0.0)],
+                               ThrustLbf=500.0 )
+        R_opt, historyL = opt.optimize()
+        
+        # original thruster is unchanged
+        self.assertEqual( R.coreObj.MRcore, 1.6 )
+        self.assertEqual( R.geomObj.eps, 40 )
+        
+        self.assertLessEqual( get_output(R_opt, 'Ltotal'), 20.0*1.001 )
+        self.assertAlmostEqual( R_opt.coreObj.FvacTotal, 500.0, delta=1.0 )
+        self.assertGreater( R_opt.coreObj.IspDel, historyL[0]['IspDel'] )
+        self.assertGreaterEqual( get_output(R_opt, 'chug_margin_ox'), 0.0 )
+        
+        # history holds every evaluation once, all from the shared cache
+        self.assertEqual( len(historyL), len(opt.evalD) )
+        self.assertTrue( historyL[0]['feasible'] )
+        self.assertIn( 'MRcore', historyL[-1] )
+        
+        # asking for an evaluated design again is a cache hit
+        n_hits = opt.n_cache_hits
+        opt.evaluate_list( [opt.get_xArr( opt.best_varD )] )
+        self.assertEqual( opt.n_cache_hits, n_hits + 1 )
+        self.assertEqual( len(historyL), len(opt.evalD) )
+    
+    def test_parallel_matches_serial(self):
+        """test parallel matches serial"""
+        R = make_thruster( injD=INJ_D )
+        varD = {'MRcore':(1.2, 2.4), 'pcentFFC':(5.0, 20.0)}
+        constraintL = [('Twallgas', '<=', 3000.0)]
+        
+        optimize = lambda n_workers: DesignOptimizer( R, varD=varD, constraintL=constraintL, 
+                                                      n_workers=n_workers ).optimize()
+        (R_ser, histSerL), (R_par, histParL) = run_serial_and_parallel( optimize )
+        
+        self.assertEqual( len(histSerL), len(histParL) )
+        self.assertAlmostEqual( R_ser.coreObj.IspDel, R_par.coreObj.IspDel, places=6 )
+        self.assertAlmostEqual( R_ser.coreObj.MRcore, R_par.coreObj.MRcore, places=6 )
+    
+    def test_bad_inputs(self):
+        """test bad inputs"""
+        R = make_thruster( injD=INJ_D )
+        with self.assertRaises(Exception):
+            DesignOptimizer( R, varD={'not_a_var':(0.0, 1.0)} )
+        with self.assertRaises(Exception):
+            DesignOptimizer( R, varD={'eps':(20.0, 10.0)} )
+        with self.assertRaises(Exception):
+            DesignOptimizer( R, varD={'eps':(10.0, 20.0)}, constraintL=[('Ltotal', '<', 20.0)] )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__',  rocketisp.design_optimizer.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
@@ -0,0 +1,126 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+import numpy as np
+from rocketisp.efficiency.eff_divergence import eff_div, eff_div_arr, pcentBellL, pcBellFuncL, \
+    pcBellCoefL, build_div_surface
+
+def eff_div_interp1d( eps=25.0, pcBell=80.0 ):
+    """Original eff_div, interp1d of the %Bell curve fits on every call."""
+    from scipy.interpolate import interp1d
+    effL = [bf(eps) for bf in pcBellFuncL]
+    return float( interp1d( pcentBellL , effL, kind=2, fill_value="extrapolate")( pcBell ) )
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_surface_matches_interp1d(self):
+        """test surface matches interp1d"""
+        epsArr = np.geomspace( 1.5, 1000.0, 25 )
+        pcBellArr = np.linspace( 60.0, 120.0, 61 )
+        
+        refArr = np.array( [[eff_div_interp1d(eps, pcBell) for eps in epsArr] for pcBell in pcBellArr] )
+        scalarArr = np.array( [[eff_div(eps, pcBell) for eps in epsArr] for pcBell in pcBellArr] )
+        vecArr = eff_div_arr( epsArr[None,:], pcBellArr[:,None] )
+        
+        np.testing.assert_allclose( scalarArr, refArr, rtol=0.0, atol=1.0E-14 )
+        np.testing.assert_allclose( vecArr, refArr, rtol=0.0, atol=1.0E-14 )
+        self.assertEqual( vecArr.shape, (61, 25) )
+    
+    def test_build_div_surface(self):
+        """test surface is rebuilt from changed curve fits"""
+        from scipy.interpolate import interp1d
+        coefL = [(a, b*1.1, c + 0.001) for (a, b, c) in pcBellCoefL]
+        divBreakL, divSurfaceL = build_div_surface( pcentBellL, coefL )
+        self.assertEqual( divBreakL, [60., 75., 85., 95., 120.] )
+        
+        eps = 12.0
+        effL = [a - b/eps - c/eps**0.5 for (a, b, c) in coefL]
+        for pcBell in [60.0, 72.0, 85.0, 101.0, 120.0]:
+            i = max( 0, min(3, sum( [pcBell > x for x in divBreakL] ) - 1) )
+            dp = pcBell - divBreakL[i]
+            A, B, C = [c0 + dp*(c1 + dp*c2) for (c0, c1, c2) in divSurfaceL[i]]
+            self.assertAlmostEqual( A - B/eps - C/eps**0.5, 
+                                    float( interp1d( pcentBellL, effL, kind=2 )(pcBell) ), places=14 )
+    
+    def test_out_of_range(self):
+        """test out of range"""
+        warningL = []
+        self.assertEqual( eff_div(25.0, 50.0, warningL=warningL), eff_div(25.0, 60.0) )
+        self.assertEqual( eff_div(25.0, 130.0, warningL=warningL), eff_div(25.0, 120.0) )
+        self.assertEqual( len(warningL), 2 )
+        
+        # no warning list, no message
+        self.assertEqual( eff_div(25.0, 50.0), eff_div(25.0, 60.0) )
+        
+        warningL = []
+        effArr = eff_div_arr( [25.0, 25.0, 25.0], [50.0, 80.0, 130.0], warningL=warningL )
+        self.assertEqual( effArr[0], eff_div(25.0, 60.0) )
+        self.assertEqual( effArr[2], eff_div(25.0, 120.0) )
+        self.assertEqual( len(warningL), 1 )
+        self.assertIn( '2 values', warningL[0] )
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
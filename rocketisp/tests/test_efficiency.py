@@ -65,7 +65,28 @@ class MyTest(unittest.TestCase):
         E = Efficiencies( Isp=0.95 )
         
         self.assertAlmostEqual(E('Isp'), .95, places=5)
-    
+
+    def test_evaluate_arr(self):
+        """test evaluate_arr"""
+        E = Efficiencies( Div=0.99 )
+        E.set_value( 'Vap', 0.97, re_evaluate=True )
+
+        resultD = E.evaluate_arr( Div=[0.98, 0.99], Mix=[0.96, 1.0] )
+        for i, (effDiv, effMix) in enumerate( [(0.98, 0.96), (0.99, 1.0)] ):
+            E2 = Efficiencies( Div=effDiv )
+            E2.set_value( 'Vap', 0.97, re_evaluate=False )
+            E2.set_value( 'Mix', effMix, re_evaluate=True )
+            for name in ['Noz', 'ERE', 'Isp', 'IspPulsing']:
+                self.assertAlmostEqual( resultD[name][i], E2(name), places=14 )
+        self.assertEqual( E('Div'), 0.99 ) # not changed
+
+        # consolidated efficiency replaces product of individual efficiencies
+        resultD = E.evaluate_arr( ERE=[0.95], Mix=[0.5] )
+        self.assertAlmostEqual( resultD['Isp'][0], 0.95*0.99, places=14 )
+
+        with self.assertRaises(Exception):
+            E.evaluate_arr( NotAnEff=[1.0] )
+
     def test__main__(self):
         old_sys_argv = list(sys.argv)
         sys.argv = list(sys.argv)
@@ -94,7 +94,35 @@ class MyTest(unittest.TestCase):
         noz.plot_geom( do_show=False, save_to_png=False )
         
         self.assertAlmostEqual(noz.angCone, 19.709, places=2)
-    
+
+    def test_nozzle_rescale(self):
+        """test Rthrt-only changes rescale nozzle contour instead of rebuilding it"""
+        G = Geometry(Rthrt=1.5, CR=2.5, eps=20, pcentBell=80)
+        noz = G.getNozObj()
+
+        G.reset_attr('Rthrt', 2.0, re_evaluate=True)
+        G.reset_attr('LchmMin', 3.0, re_evaluate=False)
+        self.assertIs( G.getNozObj(), noz )
+        self.assertEqual( (G.nozzle_build_count, G.nozzle_rescale_count), (1, 1) )
+
+        G2 = Geometry(Rthrt=2.0, CR=2.5, eps=20, pcentBell=80)
+        noz2 = G2.getNozObj()
+        self.assertEqual( noz.abs_zContour, noz2.abs_zContour )
+        self.assertEqual( noz.abs_rContour, noz2.abs_rContour )
+        self.assertAlmostEqual( noz.get_area_from_z(1.0), noz2.get_area_from_z(1.0), places=10 )
+
+        # shape-affecting inputs rebuild nozzle
+        G.reset_attr('eps', 30.0, re_evaluate=True)
+        self.assertIsNot( G.getNozObj(), noz )
+        self.assertEqual( G.nozzle_build_count, 2 )
+
+        # with input nozzle length, Rthrt changes pcentBell
+        G = Geometry(Rthrt=1.5, CR=2.5, eps=20, LnozInp=18)
+        noz = G.getNozObj()
+        G.reset_attr('Rthrt', 2.0, re_evaluate=True)
+        self.assertIsNot( G.getNozObj(), noz )
+        self.assertAlmostEqual( G.getNozObj().pcentBell, G.pcentBell, places=10 )
+
     def test__main__(self):
         old_sys_argv = list(sys.argv)
         sys.argv = list(sys.argv)
@@ -0,0 +1,101 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+import rocketisp.import_benchmark
+from rocketisp.import_benchmark import run_cold_import, get_cold_import_stats, get_cold_import_str
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_cold_import_is_lazy(self):
+        """test cold import is lazy"""
+        resultD = run_cold_import( 'rocketisp.rocket_isp' )
+        
+        # heavy packages and model weights wait until a calculation needs them
+        self.assertEqual( resultD['heavyL'], [] )
+        self.assertEqual( resultD['loaded_modelL'], [] )
+        self.assertGreater( resultD['t_import'], 0.0 )
+    
+    def test_cold_import_stats(self):
+        """test cold import stats"""
+        statsD = get_cold_import_stats( 'rocketisp.stage_tracker', Nruns=2 )
+        self.assertEqual( statsD['Nruns'], 2 )
+        self.assertLessEqual( statsD['t_min'], statsD['t_max'] )
+        self.assertIn( 'median=', get_cold_import_str( statsD ) )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__',  rocketisp.import_benchmark.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
@@ -0,0 +1,124 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+
+import numpy as np
+from rocketisp.InterpProp_scipy import InterpProp
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_sorted_input(self):
+        """test input data is sorted on x"""
+        i = InterpProp( np.array([1,2,6,4,5]), [10,40,360,160,250] )
+        self.assertEqual( i.x.tolist(), [1.,2.,4.,5.,6.] )
+        self.assertEqual( i.y.tolist(), [10.,40.,160.,250.,360.] )
+        self.assertAlmostEqual( i(4.0), 160.0, places=12 )
+        self.assertIsInstance( i(4), float )
+        
+        with self.assertRaises(Exception):
+            InterpProp( [1,2,3], [1,2] )
+
+    def test_array_matches_scalar(self):
+        """test array calls match scalar calls"""
+        x = [1,2,6,4,5]
+        y = [10,40,360,160,250]
+        xArr = np.linspace(-2.0, 9.0, 45).reshape( (5,9) )
+        for kwD in [{}, {'extrapOK':0}, {'minY':0.0, 'maxY':300.0}]:
+            i = InterpProp( x, y, **kwD )
+            yArr = i( xArr )
+            dydxArr = i.deriv( xArr )
+            self.assertEqual( yArr.shape, (5,9) )
+            for x_val, y_val, dydx in zip( xArr.ravel(), yArr.ravel(), dydxArr.ravel() ):
+                self.assertEqual( y_val, i( float(x_val) ) )
+                self.assertAlmostEqual( dydx, float(i.deriv( float(x_val) )), places=10 )
+        
+        # clamping and extrapolation
+        i = InterpProp( x, y, minY=0.0, maxY=300.0 )
+        self.assertEqual( i( np.array([-10.0, 7.0]) ).tolist(), [0.0, 300.0] )
+        i = InterpProp( x, y, extrapOK=0 )
+        self.assertEqual( i( np.array([-10.0, 7.0]) ).tolist(), [10.0, 360.0] )
+        i = InterpProp( x, y )
+        self.assertEqual( i( np.array([0.0]) ).tolist(), [-20.0] )
+
+    def test_get_scaled(self):
+        """test scaled interpolator matches interpolator of scaled data"""
+        xArr = np.linspace(0.1, 3.0, 25)
+        yArr = np.log( 1.0 + xArr**2 )
+        i = InterpProp( xArr, yArr ).get_scaled( 2.5, 3.7 )
+        i2 = InterpProp( 2.5*xArr, 3.7*yArr )
+        
+        testArr = np.linspace(-1.0, 9.0, 41)
+        self.assertTrue( np.allclose( i(testArr), i2(testArr), rtol=1.0e-13, atol=0.0 ) )
+        self.assertTrue( np.allclose( i.deriv(testArr), i2.deriv(testArr), rtol=1.0e-12, atol=1.0e-12 ) )
+        
+        with self.assertRaises(Exception):
+            i.get_scaled( -1.0, 1.0 )
+
+
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
+
@@ -0,0 +1,203 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+import gc
+import warnings
+import numpy as np
+from rocketcea.cea_obj import CEA_Obj
+from rocketisp.cea_cache import CachedCEA_Obj
+from rocketisp.efficiency.calc_full_pcentLossBL import calc_pcentLossBL, calc_pcentLossBL_arr
+from rocketisp.efficiency.calc_full_pcentLossDiv import calc_pcentLossDiv, calc_pcentLossDiv_arr
+from rocketisp.efficiency.calc_noz_kinetics import calc_IspODK, calc_IspODK_arr, calc_fracKin, calc_fracKin_arr
+import rocketisp.efficiency.calc_noz_kinetics as calc_noz_kinetics
+from rocketisp.nozzle.calc_full_Cd import calc_Cd, calc_Cd_arr
+from rocketisp.mlp_model import MLP_Model, get_mlp_model, set_mlp_float32, get_mlp_dtype
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_array_models_match_scalar(self):
+        """test array models match scalar"""
+        PcArr = np.array([100., 500., 2000.])
+        epsArr = np.array([5., 40., 150.])
+        RtArr = np.array([0.2, 1.0, 5.0])
+        bellArr = np.array([65., 80., 95.])
+        TcArr = np.array([4000., 5500., 6500.])
+        
+        lossArr = calc_pcentLossBL_arr( Pc=PcArr, eps=epsArr, Rthrt=RtArr, pcentBell=bellArr, TcCham=TcArr )
+        self.assertEqual( lossArr.shape, (3,) )
+        for i in range(3):
+            self.assertAlmostEqual( lossArr[i], calc_pcentLossBL( Pc=PcArr[i], eps=epsArr[i], Rthrt=RtArr[i], 
+                                        pcentBell=bellArr[i], TcCham=TcArr[i] ), places=10 )
+        
+        # scalar inputs are broadcast against array inputs
+        CdArr = calc_Cd_arr( Pc=500.0, Rthrt=RtArr, RWTU=1.0 )
+        for i in range(3):
+            self.assertAlmostEqual( CdArr[i], calc_Cd( Pc=500.0, Rthrt=RtArr[i], RWTU=1.0 ), places=10 )
+        
+        lossArr = calc_pcentLossDiv_arr( Pc=PcArr, eps=epsArr, Rthrt=RtArr, pcentBell=bellArr, TcCham=TcArr )
+        for i in range(3):
+            self.assertAlmostEqual( lossArr[i], calc_pcentLossDiv( Pc=PcArr[i], eps=epsArr[i], Rthrt=RtArr[i], 
+                                        pcentBell=bellArr[i], TcCham=TcArr[i] ), places=10 )
+        
+        # output has the broadcast shape of the inputs
+        self.assertEqual( calc_Cd_arr( Pc=PcArr.reshape(3,1), Rthrt=RtArr ).shape, (3,3) )
+    
+    def test_array_kinetics_match_scalar(self):
+        """test array kinetics match scalar"""
+        ceaObj = CachedCEA_Obj(oxName='N2O4', fuelName='MMH')
+        MRArr = np.array([1.4, 1.65, 1.9, 1.9])
+        
+        fracArr = calc_fracKin_arr( ceaObj, Pc=500, eps=40, Rthrt=1, pcentBell=80, MR=MRArr )
+        IspODKArr = calc_IspODK_arr( ceaObj, Pc=500, eps=40, Rthrt=1, pcentBell=80, MR=MRArr )
+        for i in range(4):
+            self.assertAlmostEqual( fracArr[i], calc_fracKin( ceaObj, Pc=500, eps=40, Rthrt=1, 
+                                        pcentBell=80, MR=MRArr[i] ), places=10 )
+            self.assertAlmostEqual( IspODKArr[i], calc_IspODK( ceaObj, Pc=500, eps=40, Rthrt=1, 
+                                        pcentBell=80, MR=MRArr[i] ), places=8 )
+        self.assertTrue( np.all( (fracArr >= 0.0) & (fracArr <= 1.0) ) )
+    
+    def test_mlp_model_lazy_load(self):
+        """test mlp model lazy load"""
+        npz_filename = os.path.join( up_one, 'nozzle', 'calc_full_Cd.npz' )
+        model = MLP_Model( npz_filename )
+        self.assertFalse( model.is_loaded() )
+        self.assertEqual( model.n_loads, 0 )
+        
+        X = np.array( [[0.6, 0.5, 1.0/3.0], [0.7, 0.5, 0.5]] )
+        yArr = model.predict_arr( X )
+        self.assertTrue( model.is_loaded() )
+        self.assertEqual( yArr.shape, (2,) )
+        
+        # same results, buffers reused for fewer rows and reallocated for more
+        model.predict_arr( np.tile(X, (50,1)) )
+        self.assertTrue( np.allclose( model.predict_arr( X ), yArr, rtol=0.0, atol=1.0E-14 ) )
+        self.assertAlmostEqual( model.predict_arr( X[1] )[0], yArr[1], places=14 )
+        self.assertEqual( model.n_loads, 1 )
+        
+        # one shared model per npz file
+        self.assertIs( get_mlp_model( npz_filename ), get_mlp_model( npz_filename ) )
+    
+    def test_mlp_float32(self):
+        """test mlp float32"""
+        PcArr = np.linspace( 50.0, 2000.0, 20 )
+        lossArr = calc_pcentLossBL_arr( Pc=PcArr, eps=40, Rthrt=1, pcentBell=80, TcCham=5500 )
+        try:
+            set_mlp_float32( True )
+            self.assertEqual( get_mlp_dtype(), np.float32 )
+            lossArr32 = calc_pcentLossBL_arr( Pc=PcArr, eps=40, Rthrt=1, pcentBell=80, TcCham=5500 )
+        finally:
+            set_mlp_float32( False )
+        
+        self.assertEqual( lossArr32.dtype, np.float64 )
+        self.assertTrue( np.allclose( lossArr32, lossArr, rtol=1.0E-4, atol=1.0E-5 ) )
+        self.assertEqual( calc_pcentLossBL_arr( Pc=PcArr, eps=40, Rthrt=1, pcentBell=80, TcCham=5500 ).tolist(), 
+                          lossArr.tolist() )
+    
+    def test_kin_module_cache(self):
+        """test kin module cache"""
+        # discarded CEA objects are not held by the cache
+        gc.collect()
+        n_held = len(calc_noz_kinetics.module_by_ceaObjD)
+        for oxName, fuelName in [('N2O4','MMH'), ('LOX','LH2'), ('LOX','CH4')]*3:
+            ceaObj = CEA_Obj(oxName=oxName, fuelName=fuelName)
+            calc_IspODK( ceaObj, Pc=500, eps=20, Rthrt=1, pcentBell=80, MR=2.0 )
+        del ceaObj
+        gc.collect()
+        self.assertEqual( len(calc_noz_kinetics.module_by_ceaObjD), n_held )
+        self.assertIn( 'HO', calc_noz_kinetics.get_cached_kin_groups() )
+        
+        # each CEA object gets the module of its own propellant group
+        ceaHO = CEA_Obj(oxName='LOX', fuelName='LH2')
+        ceaCHNO = CEA_Obj(oxName='N2O4', fuelName='MMH')
+        self.assertEqual( calc_noz_kinetics.get_kin_module( ceaHO ).__name__, 
+                          'rocketisp.efficiency.fracKinODK.calc_HO_fracKin' )
+        self.assertEqual( calc_noz_kinetics.get_kin_module( ceaCHNO ).__name__, 
+                          'rocketisp.efficiency.fracKinODK.calc_CHNO_fracKin' )
+        
+        self.assertEqual( calc_noz_kinetics.preload_kin_models( 'CHO', ceaHO ), ['CHO', 'HO'] )
+        self.assertTrue( calc_noz_kinetics.get_kin_module( ceaHO ).mlp_model.is_loaded() )
+        
+        # unknown group falls back to "All" with a warning
+        with warnings.catch_warnings(record=True) as wL:
+            warnings.simplefilter('always')
+            self.assertEqual( calc_noz_kinetics.preload_kin_models( 'XYZ' ), ['All'] )
+        self.assertEqual( len(wL), 1 )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__', os.path.join(up_one, 'mlp_model.py') )
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+    
+    
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
@@ -0,0 +1,162 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+from functools import partial
+import numpy as np
+import rocketisp.monte_carlo
+from rocketisp.monte_carlo import MonteCarlo, get_samples
+from rocketisp.tests import thruster_builders
+
+# model efficiencies held constant so that a full evaluation can check the samples
+EFF_D = {'ERE':0.98, 'Div':0.99, 'BL':0.985, 'Kin':0.99}
+make_thruster = partial( thruster_builders.make_thruster, eps=10.0, pcentFFC=0.0, Pamb=5.0, effD=EFF_D,
+                         CdThroat=0.99, calc_CdThroat=False )
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_against_full_evaluation(self):
+        """test against full evaluation"""
+        R = make_thruster()
+        distD = {'ERE':[0.97, 0.98, 0.99], 'Div':[0.985, 0.99, 0.995],
+                 'Pc':[140.0, 150.0, 160.0], 'MRcore':[1.5, 1.6, 1.7]}
+        mcObj = R.run_monte_carlo( distD )
+        self.assertEqual( mcObj.Nsamples, 3 )
+        self.assertEqual( mcObj.warningL, [] )
+        
+        for i in range(3):
+            inpD = dict( [(name, distD[name][i]) for name in distD.keys()] )
+            effD = dict( EFF_D, ERE=inpD.pop('ERE'), Div=inpD.pop('Div') )
+            R2 = make_thruster( effD=effD, **inpD )
+            for name in ['IspDel', 'FvacTotal', 'Fambient', 'wdotTot', 'wdotOx', 'wdotFl']:
+                # table interpolation error only
+                self.assertAlmostEqual( mcObj.resultD[name][i], getattr(R2.coreObj, name),
+                                        delta=2.0E-4*getattr(R2.coreObj, name) )
+        
+        # base inputs give base outputs
+        for name in mcObj.baseD.keys():
+            self.assertAlmostEqual( mcObj.resultD[name][1], mcObj.baseD[name], places=9 )
+    
+    def test_base_state_with_barrier(self):
+        """test base state with barrier"""
+        R = make_thruster( pcentFFC=10.0, Pamb=0.0 )
+        mcObj = MonteCarlo( R, {'ERE':[0.98, 0.98], 'adjCstarODE':[1.0, 1.0]} )
+        self.assertIsNone( mcObj.ceaTable ) # CEA state of base thruster is reused
+        for name in mcObj.baseD.keys():
+            np.testing.assert_allclose( mcObj.resultD[name], mcObj.baseD[name], rtol=1.0E-12 )
+        
+        # ERE only changes flow rate through cstar (same as CoreStream.evaluate)
+        mcObj = MonteCarlo( R, {'ERE':[0.98, 0.96]} )
+        self.assertAlmostEqual( mcObj.resultD['wdotTot'][1] / mcObj.resultD['wdotTot'][0], 0.98/0.96, places=12 )
+    
+    def test_distributions(self):
+        """test distributions"""
+        R = make_thruster()
+        mcObj = R.run_monte_carlo( {'ERE':('normal', 0.98, 0.002), 'Pc':('uniform', 145.0, 155.0)},
+                                   Nsamples=100000, seed=1 )
+        self.assertEqual( len(mcObj.resultD['IspDel']), 100000 )
+        self.assertAlmostEqual( np.mean(mcObj.sampleD['ERE']), 0.98, places=4 )
+        self.assertTrue( np.all( (mcObj.sampleD['Pc'] >= 145.0) & (mcObj.sampleD['Pc'] <= 155.0) ) )
+        
+        pD = mcObj.get_percentiles( 'IspDel' )
+        self.assertLess( pD[5.0], mcObj.baseD['IspDel'] )
+        self.assertGreater( pD[95.0], mcObj.baseD['IspDel'] )
+        
+        # same seed, same samples
+        mcObj2 = R.run_monte_carlo( {'ERE':('normal', 0.98, 0.002), 'Pc':('uniform', 145.0, 155.0)},
+                                    Nsamples=100000, seed=1 )
+        np.testing.assert_array_equal( mcObj2.resultD['FvacTotal'], mcObj.resultD['FvacTotal'] )
+        
+        rng = np.random.default_rng( 0 )
+        samples = get_samples( ('triangular', 0.9, 0.95, 1.0), 1000, rng )
+        self.assertTrue( np.all( (samples >= 0.9) & (samples <= 1.0) ) )
+        
+        with self.assertRaises(Exception):
+            get_samples( ('gamma', 1.0), 10, rng )
+        with self.assertRaises(Exception):
+            R.run_monte_carlo( {'CR':('normal', 2.5, 0.1)} )
+    
+    def test_clip_warning(self):
+        """test clip warning"""
+        R = make_thruster()
+        mcObj = R.run_monte_carlo( {'Div':[0.99, 1.01]} )
+        self.assertEqual( len(mcObj.warningL), 1 )
+        self.assertEqual( mcObj.sampleD['Div'][1], 1.01 )
+        self.assertAlmostEqual( mcObj.resultD['IspDel'][1] / mcObj.resultD['IspDel'][0], 1.0/0.99, places=12 )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__',  rocketisp.monte_carlo.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
@@ -0,0 +1,115 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+import rocketisp.mr_range
+from rocketisp.mr_range import MRrange, get_MRrange, clear_MRrange_cache, ISP_TOL
+from rocketcea.cea_obj import CEA_Obj
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_mr_range_edges(self):
+        """test mr range edges"""
+        # LOX/RP1 peak MR is far from stoichiometric
+        for oxName, fuelName in [('N2O4','MMH'), ('LOX','LH2'), ('LOX','CH4'), ('LOX','RP1')]:
+            ispObj = CEA_Obj(oxName=oxName, fuelName=fuelName)
+            mrr = MRrange(ispObj, Pc=500., eps=20., edge_frac=0.97)
+            mrlo, mrhi = mrr.get_mr_range()
+            
+            self.assertLess( mrlo, mrr.peakMR )
+            self.assertGreater( mrhi, mrr.peakMR )
+            self.assertLessEqual( abs( mrr.dataL[0][1]/mrr.peakIsp - 0.97 ), ISP_TOL )
+            self.assertLessEqual( abs( mrr.dataL[-1][1]/mrr.peakIsp - 0.97 ), ISP_TOL )
+            self.assertEqual( mrr.get_mr_list(), sorted(mrr.get_mr_list()) )
+            
+            # far fewer CEA calls than fixed steps of MRstoic/30
+            self.assertLessEqual( mrr.n_cea_calls, 20 )
+    
+    def test_mr_range_cache(self):
+        """test mr range cache"""
+        clear_MRrange_cache()
+        ispObj = CEA_Obj(oxName='N2O4', fuelName='MMH')
+        mrr = get_MRrange(ispObj, Pc=500., eps=20., edge_frac=0.97)
+        
+        self.assertIs( mrr, get_MRrange(CEA_Obj(oxName='N2O4', fuelName='MMH'), Pc=500.0, eps=20, edge_frac=0.97) )
+        self.assertIsNot( mrr, get_MRrange(ispObj, Pc=500., eps=20., edge_frac=0.95) )
+        self.assertIsNot( mrr, get_MRrange(ispObj, Pc=400., eps=20., edge_frac=0.97) )
+        clear_MRrange_cache()
+        self.assertIsNot( mrr, get_MRrange(ispObj, Pc=500., eps=20., edge_frac=0.97) )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__',  rocketisp.mr_range.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
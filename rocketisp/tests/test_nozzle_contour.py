@@ -0,0 +1,174 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+
+from math import pi, sqrt, atan
+import numpy as np
+from rocketisp.InterpProp_scipy import InterpProp
+from rocketisp.nozzle.nozzle import Nozzle, ref_nozzle, ref_nozzle_arr, calc_cone_angle, \
+    sinDeg, cosDeg, tanDeg, get_contour_cache_stats, clear_contour_cache
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_ref_nozzle_lists(self):
+        """test ref_nozzle returns lists matching ref_nozzle_arr"""
+        zL, rL, imaCone, angCone, i_throat = ref_nozzle( eps=16., theta=30., alphaExit=10., Nsegs=30 )
+        zArr, rArr, imaCone2, angCone2, i_throat2 = ref_nozzle_arr( eps=16., theta=30., alphaExit=10., Nsegs=30 )
+        self.assertIsInstance( zL, list )
+        self.assertEqual( zL, zArr.tolist() )
+        self.assertEqual( rL, rArr.tolist() )
+        self.assertEqual( (imaCone, angCone, i_throat), (imaCone2, angCone2, i_throat2) )
+
+        self.assertAlmostEqual( rL[i_throat], 1.0, places=14 )
+        self.assertAlmostEqual( zL[i_throat], 0.0, places=14 )
+        self.assertAlmostEqual( rL[-1], 4.0, places=14 )
+        self.assertAlmostEqual( rL[0], sqrt(2.5), places=14 )
+
+    def test_cone_angle(self):
+        """test cone is tangent to Rd"""
+        for eps, pcBell, Rd in [(1.5, 120., 2.0), (16., 80., 1.0), (60., 100., 0.4)]:
+            rE = sqrt(eps)
+            zE = (rE - 1.0) / tanDeg(15.) * pcBell / 100.0
+            angCone = calc_cone_angle( Rd, rE, zE )
+            zT = Rd * sinDeg(angCone)
+            rT = 1.0 + Rd*(1.-cosDeg(angCone))
+            self.assertLess( zT, zE )
+            self.assertAlmostEqual( atan( (rE-rT)/(zE-zT) ) * 180.0 / pi, angCone, places=10 )
+
+    def test_out_of_sequence_warnings(self):
+        """test out of sequence contour points are put in warningL"""
+        warningL = []
+        ref_nozzle_arr( eps=16., theta=30., alphaExit=10., warningL=warningL )
+        self.assertEqual( warningL, [] )
+
+        # eps=1 gives a zero length nozzle
+        ref_nozzle_arr( eps=1.0, theta=30., alphaExit=10., warningL=warningL )
+        self.assertGreater( len(warningL), 0 )
+        self.assertIn( 'out of sequence', warningL[0] )
+
+    def test_contour_cache(self):
+        """test identical contour inputs share cached contour"""
+        clear_contour_cache()
+        noz1 = Nozzle(CR=2.5, eps=40., pcentBell=80.0, Rt=1.5)
+        noz2 = Nozzle(CR=2.5, eps=40., pcentBell=80.0, Rt=3.0)
+        noz3 = Nozzle(CR=2.5, eps=40., pcentBell=90.0, Rt=1.5)
+        statsD = get_contour_cache_stats()
+        self.assertEqual( statsD['misses'], 2 )
+        self.assertEqual( statsD['hits'], 1 )
+        self.assertIs( noz1.refContour, noz2.refContour )
+        self.assertIsNot( noz1.refContour, noz3.refContour )
+
+        self.assertEqual( noz1.zContour, noz2.zContour )
+        self.assertIsNot( noz1.zContour, noz2.zContour )
+        with self.assertRaises(ValueError):
+            noz1.refContour.zArr[0] = 0.0
+
+    def test_set_abs_Rt(self):
+        """test scaled interpolators match interpolators of absolute contour"""
+        noz = Nozzle(CR=2.5, eps=40., pcentBell=80.0, Rt=1.5)
+        noz.set_abs_Rt( 2.7 )
+        absNoz = Nozzle(CR=2.5, eps=40., pcentBell=80.0, Rt=2.7)
+        self.assertEqual( noz.abs_zContour, absNoz.abs_zContour )
+        self.assertEqual( noz.abs_rContour, absNoz.abs_rContour )
+        self.assertAlmostEqual( noz.zExit, 2.7*noz.zContour[-1], places=12 )
+
+        z2r_terp = InterpProp( noz.abs_zContour, noz.abs_rContour )
+        z2area_terp = InterpProp( noz.abs_zContour, [pi*r**2 for r in noz.abs_rContour] )
+        div_terp = InterpProp( np.log(noz.epsContour[noz.i_throat:]),
+                               noz.abs_zContour[noz.i_throat:], extrapOK=False )
+        for z in np.linspace( noz.z_min()-1.0, noz.z_max()+1.0, 37 ):
+            self.assertAlmostEqual( noz.z2r_terp(z), z2r_terp(z), places=10 )
+            self.assertAlmostEqual( noz.get_area_from_z(z), z2area_terp(z), places=9 )
+            self.assertAlmostEqual( noz.get_dadz_from_z(z), z2area_terp.deriv(z), places=8 )
+        for eps in [1.0, 1.5, 10.0, 40.0, 50.0]:
+            self.assertAlmostEqual( noz.get_z_from_div_eps(eps), div_terp(np.log(eps)), places=10 )
+
+    def test_array_queries(self):
+        """test contour queries at many stations at once"""
+        noz = Nozzle(CR=2.5, eps=40., pcentBell=80.0, Rt=1.5)
+        zArr = np.linspace( noz.z_min(), noz.z_max(), 501 )
+        epsArr = noz.get_eps_from_z( zArr )
+        areaArr = noz.get_area_from_z( zArr )
+        dadzArr = noz.get_dadz_from_z( zArr )
+        self.assertGreaterEqual( epsArr.min(), 1.0 )
+        for i in range(0, 501, 50):
+            z = float( zArr[i] )
+            self.assertEqual( epsArr[i], noz.get_eps_from_z(z) )
+            self.assertEqual( areaArr[i], noz.get_area_from_z(z) )
+            self.assertAlmostEqual( dadzArr[i], float(noz.get_dadz_from_z(z)), places=10 )
+        
+        divEpsArr = np.linspace( 1.0, 40.0, 201 )
+        zDivArr = noz.get_z_from_div_eps( divEpsArr )
+        self.assertTrue( np.all( np.diff(zDivArr) > 0.0 ) )
+        self.assertEqual( zDivArr[-1], noz.get_z_from_div_eps(40.0) )
+        zConvArr = noz.get_z_from_conv_eps( np.array([2.5, 1.5, 1.0]) )
+        self.assertTrue( np.all( np.diff(zConvArr) > 0.0 ) )
+
+
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
+
@@ -0,0 +1,167 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+from math import log10
+import numpy as np
+import rocketisp.nozzle.quad_interp
+from rocketisp.nozzle.quad_interp import QuadInterp, QuadInterp2D
+from rocketisp.nozzle import six_opt_parab, huzel_data
+from rocketisp.nozzle.nozzle import Nozzle
+
+def six_opt_my_interp( eps, pcentBell, angLL ):
+    """Original six_opt_parab lookup, my_interp of each %Bell row then in %Bell."""
+    vL = [six_opt_parab.my_interp( log10(eps), six_opt_parab.log10_epsL, angL ) for angL in angLL]
+    return float( six_opt_parab.my_interp( pcentBell, six_opt_parab.pcentBellL, vL ) )
+
+def huzel_my_interp( eps, pcBell ):
+    """Original huzel_data lookup (inputs clamped)."""
+    eps = max(5, min(50, eps))
+    pcBell = max(60, min(100, pcBell))
+    entAng = huzel_data.my_interp( pcBell, huzel_data.pcentBellL, [f(eps) for f in huzel_data.entFuncL] )
+    exitAng = huzel_data.my_interp( pcBell, huzel_data.pcentBellL, [f(eps) for f in huzel_data.exitFuncL] )
+    return float(entAng), float(exitAng)
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_matches_interp1d(self):
+        """test matches interp1d"""
+        from scipy.interpolate import interp1d
+        rng = np.random.default_rng( 0 )
+        for xL in [[1.0, 2.0, 4.0], [60.0, 70.0, 80.0, 90.0, 100.0, 120.0], six_opt_parab.log10_epsL]:
+            yL = rng.random( len(xL) )
+            qi = QuadInterp( xL, yL )
+            xArr = np.linspace( xL[0], xL[-1], 201 )
+            refArr = interp1d( xL, yL, kind=2 )( xArr )
+            
+            np.testing.assert_allclose( qi(xArr), refArr, rtol=0.0, atol=1.0E-13 )
+            np.testing.assert_allclose( [qi.eval_scalar(x) for x in xArr], refArr, rtol=0.0, atol=1.0E-13 )
+            np.testing.assert_allclose( qi.get_weights(xArr) @ yL, refArr, rtol=0.0, atol=1.0E-13 )
+            
+            # clamped outside of xL
+            self.assertAlmostEqual( qi.eval_scalar( xL[0] - 1.0 ), yL[0], places=13 )
+            self.assertAlmostEqual( float(qi( xL[-1] + 1.0 )), yL[-1], places=13 )
+        
+        with self.assertRaises(Exception):
+            QuadInterp( [1.0, 2.0] )
+        with self.assertRaises(Exception):
+            QuadInterp2D( [1.0, 2.0, 3.0], [1.0, 2.0, 3.0], np.zeros((3,4)) )
+    
+    def test_six_opt_parab(self):
+        """test six_opt_parab"""
+        epsArr = np.geomspace( 1.5, 800.0, 25 )
+        pcentBellArr = np.linspace( 55.0, 125.0, 29 )
+        
+        entArr, exitArr = six_opt_parab.getOptEntranceExitAngles_arr( epsArr[None,:], pcentBellArr[:,None] )
+        self.assertEqual( entArr.shape, (29, 25) )
+        for i, pcentBell in enumerate( pcentBellArr ):
+            for j, eps in enumerate( epsArr ):
+                entRef = six_opt_my_interp( eps, pcentBell, six_opt_parab.entranceAngLL )
+                exitRef = six_opt_my_interp( eps, pcentBell, six_opt_parab.exitAngLL )
+                self.assertAlmostEqual( entArr[i,j], entRef, places=10 )
+                self.assertAlmostEqual( exitArr[i,j], exitRef, places=10 )
+                
+                entAng, exitAng = six_opt_parab.getOptEntranceExitAngles( eps=eps, pcentBell=pcentBell )
+                self.assertAlmostEqual( entAng, entRef, places=10 )
+                self.assertAlmostEqual( exitAng, exitRef, places=10 )
+    
+    def test_huzel_data(self):
+        """test huzel_data"""
+        epsArr = np.linspace( 3.0, 60.0, 20 )
+        pcentBellArr = np.linspace( 55.0, 105.0, 21 )
+        
+        warningL = []
+        entArr, exitArr = huzel_data.getHuzelEntranceExitAngles_arr( epsArr[None,:], pcentBellArr[:,None],
+                                                                     warningL=warningL )
+        self.assertEqual( len(warningL), 1 )
+        for i, pcBell in enumerate( pcentBellArr ):
+            for j, eps in enumerate( epsArr ):
+                entRef, exitRef = huzel_my_interp( eps, pcBell )
+                self.assertAlmostEqual( entArr[i,j], entRef, places=10 )
+                self.assertAlmostEqual( exitArr[i,j], exitRef, places=10 )
+                
+                entAng, exitAng = huzel_data.getHuzelEntranceExitAngles( eps=eps, pcBell=pcBell )
+                self.assertAlmostEqual( entAng, entRef, places=10 )
+                self.assertAlmostEqual( exitAng, exitRef, places=10 )
+        
+        # out of range messages are collected by Nozzle
+        noz = Nozzle( eps=80.0, pcentBell=80.0, use_huzel_angles=True )
+        self.assertEqual( len(noz.warningL), 1 )
+        self.assertEqual( Nozzle( eps=20.0, pcentBell=80.0, use_huzel_angles=True ).warningL, [] )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__',  rocketisp.nozzle.quad_interp.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
@@ -69,6 +69,11 @@ class MyTest(unittest.TestCase):
         # See if the self.myclass object exists
         self.assertTrue(result)
 
+    def test_default_coreObj_not_shared(self):
+        """Check that each default RocketThruster gets its own CoreStream"""
+        other = RocketThruster()
+        self.assertIsNot( other.coreObj, self.myclass.coreObj )
+
 
 if __name__ == '__main__':
     # Can test just this file from command prompt
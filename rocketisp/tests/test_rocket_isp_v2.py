@@ -52,7 +52,10 @@ from rocketisp.rocket_isp import RocketThruster
 from rocketisp.geometry import Geometry
 from rocketisp.stream_tubes import CoreStream
 from rocketisp.efficiencies import Efficiencies
+import numpy as np
 import rocketisp.rocket_isp
+import rocketisp.stream_tubes
+from rocketisp.goldSearch import search_max, brent_min, brent_max
 
 class MyTest(unittest.TestCase):
 
@@ -88,6 +91,148 @@ class MyTest(unittest.TestCase):
         self.assertAlmostEqual(R.coreObj.effObj('BL'), 0.993258, places=3)
 
     
+    def test_stage_tracking(self):
+        """test stage tracking"""
+        R = RocketThruster(name='stage_tracking', 
+                           coreObj=CoreStream(geomObj=Geometry(), effObj=Efficiencies(), pcentFFC=10))
+        R.stages.reset_counts()
+        R.coreObj.stages.reset_counts()
+        
+        # Rthrt changes Cd, BL and Kin, but not the CEA results
+        R.scale_Rt_to_Thrust( ThrustLbf=1000.0, Pamb=0.0, use_scipy=False)
+        countD = R.get_stage_counts()
+        self.assertEqual( countD['cea'][0], 0 )
+        self.assertGreater( countD['cea'][1], 0 )
+        self.assertGreater( countD['BL'][0], 0 )
+        self.assertEqual( countD['Div'][0], 0 )
+        self.assertAlmostEqual(R.coreObj.Fambient, 1000.0, places=3)
+        
+        # repeat evaluation recomputes nothing
+        R.stages.reset_counts()
+        R.calc_all_eff()
+        for stage, (computed, skipped) in R.stages.get_counts().items():
+            self.assertEqual( computed, 0 )
+        
+        # changing MRcore invalidates CEA
+        R.coreObj.reset_attr('MRcore', 1.7, re_evaluate=False)
+        R.calc_all_eff()
+        self.assertEqual( R.get_stage_counts()['cea'][0], 1 )
+        self.assertIn( 'barrier_thermo', R.get_stage_counts_str() )
+    
+    def test_brent_search(self):
+        """test brent search"""
+        xmin, fmin, nEval = brent_min(lambda x: (3.123 - x)**2, 0.0, 5.0, tol=1.0E-6)
+        self.assertAlmostEqual(xmin, 3.123, places=5)
+        self.assertLess( nEval, 12 )
+        
+        # warm start near the peak uses fewer evaluations
+        xmax, fmax, nEval = brent_max(lambda x: 10.0 - (x - 1.5)**2 - (x - 1.5)**4, 0.0, 6.0, tol=0.01)
+        xmax2, fmax2, nEval2 = brent_max(lambda x: 10.0 - (x - 1.5)**2 - (x - 1.5)**4, 1.0, 2.0, 
+                                         tol=0.01, x_start=1.45)
+        self.assertAlmostEqual(xmax, 1.5, places=2)
+        self.assertAlmostEqual(xmax2, 1.5, places=2)
+        self.assertLess( nEval2, nEval )
+    
+    def test_set_mr_to_max_ispdel(self):
+        """test set mr to max ispdel"""
+        R = RocketThruster(name='mr_search', 
+                           coreObj=CoreStream(geomObj=Geometry(), effObj=Efficiencies(), pcentFFC=10))
+        
+        MRcore = R.set_mr_to_max_ispdel()
+        self.assertAlmostEqual(R.coreObj.MRcore, MRcore, places=10)
+        self.assertLessEqual( R.n_evals_mr_search, 12 )
+        IspMax = R.coreObj.IspDel
+        
+        # same peak as golden section search
+        def get_ispdel( MR ):
+            R.coreObj.reset_attr('MRcore', MR, re_evaluate=True)
+            R.calc_all_eff()
+            return R.coreObj.IspDel
+        MRstoic = R.coreObj.ceaObj.getMRforER( ERr=1.0 )
+        MRgold, IspGold = search_max(get_ispdel, MRstoic/3.0, MRstoic*3.0, tol=0.01)
+        self.assertAlmostEqual(MRcore, MRgold, delta=0.01)
+        self.assertAlmostEqual(IspMax, IspGold, places=2)
+        
+        # warm start from a nearby design
+        R.coreObj.reset_attr('Pc', 200.0)
+        MRwarm = R.set_mr_to_max_ispdel( MRstart=MRcore )
+        self.assertLessEqual( R.n_evals_mr_search, 8 )
+        IspWarm = R.coreObj.IspDel
+        MRcold = R.set_mr_to_max_ispdel()
+        self.assertAlmostEqual(MRwarm, MRcold, delta=0.01)
+        self.assertAlmostEqual(IspWarm, R.coreObj.IspDel, places=2)
+        
+        # peak outside of a tight bracket is still found
+        MRedge = R.set_mr_to_max_ispdel( MRlo=MRcold*1.1, MRhi=MRcold*1.3 )
+        self.assertAlmostEqual(MRedge, MRcold, delta=0.02)
+    
+    def test_scale_Rt_to_Thrust_batch(self):
+        """test scale Rt to Thrust batch"""
+        R = RocketThruster(name='Rt_batch', 
+                           coreObj=CoreStream(geomObj=Geometry(), effObj=Efficiencies(), pcentFFC=10))
+        Rthrt_save = R.geomObj.Rthrt
+        
+        # count scalar kinetics calls (array models should be used instead)
+        callL = []
+        def count_calls( func ):
+            def wrapper(*args, **kwargs):
+                callL.append( func.__name__ )
+                return func(*args, **kwargs)
+            return wrapper
+        
+        saveL = [rocketisp.rocket_isp.calc_IspODK, rocketisp.stream_tubes.calc_IspODK]
+        rocketisp.rocket_isp.calc_IspODK = count_calls( saveL[0] )
+        rocketisp.stream_tubes.calc_IspODK = count_calls( saveL[1] )
+        try:
+            ThrustL = [100.0, 400.0, 1000.0, 5000.0]
+            RtArr = R.scale_Rt_to_Thrust_batch( ThrustL, Pamb=0.0 )
+        finally:
+            rocketisp.rocket_isp.calc_IspODK, rocketisp.stream_tubes.calc_IspODK = saveL
+        
+        # only scalar calls are from restoring the original Rthrt (core and barrier)
+        self.assertLessEqual( len(callL), 3 )
+        self.assertEqual( R.geomObj.Rthrt, Rthrt_save )
+        
+        for Rthrt, ThrustLbf in zip(RtArr, ThrustL):
+            R.scale_Rt_to_Thrust( ThrustLbf=ThrustLbf, Pamb=0.0, use_scipy=False)
+            self.assertAlmostEqual( Rthrt/R.geomObj.Rthrt, 1.0, places=6 )
+            
+            R.geomObj.reset_attr( 'Rthrt', Rthrt, re_evaluate=True)
+            R.calc_all_eff()
+            self.assertAlmostEqual( R.coreObj.Fambient, ThrustLbf, places=3 )
+        self.assertTrue( R.is_convergedArr.all() )
+        self.assertEqual( R.batch_warningL, [] )
+        
+        # too few iterations leaves thrust levels unconverged
+        Rthrt_save = R.geomObj.Rthrt
+        RtArr = R.scale_Rt_to_Thrust_batch( ThrustL, Pamb=0.0, max_iter=1 )
+        self.assertEqual( len(R.is_convergedArr), len(ThrustL) )
+        self.assertFalse( R.is_convergedArr.all() )
+        self.assertEqual( len(R.batch_warningL), 1 )
+        self.assertEqual( R.geomObj.Rthrt, Rthrt_save )
+    
+    def test_set_eps_to_equal_pexit(self):
+        """test set eps to equal pexit"""
+        R = RocketThruster(name='eps_pexit')
+        
+        eps = R.set_eps_to_equal_pexit( Pexit_psia=3.0 )
+        self.assertEqual( R.geomObj.eps, eps )
+        self.assertAlmostEqual( R.coreObj.Pexit, 3.0, places=3 )
+        
+        # no eps limits (e.g. old range was 2 to 200)
+        PexitL = [100.0, 14.7, 1.0, 0.01]
+        epsArr = R.get_eps_at_pexit_arr( PexitL )
+        self.assertEqual( R.geomObj.eps, eps ) # RocketThruster is unchanged
+        self.assertLess( epsArr[0], 2.0 )
+        self.assertGreater( epsArr[-1], 200.0 )
+        for Pexit, eps in zip(PexitL, epsArr):
+            PcOvPe = R.coreObj.ceaObj.get_PcOvPe( Pc=R.coreObj.Pc, MR=R.coreObj.MRcore, eps=eps )
+            self.assertAlmostEqual( R.coreObj.Pc / PcOvPe / Pexit, 1.0, places=4 )
+        
+        # exit pressure can not be above throat pressure
+        with self.assertRaises(Exception):
+            R.get_eps_at_pexit( Pexit_psia=R.coreObj.Pc / 1.5 )
+    
     def test__main__(self):
         old_sys_argv = list(sys.argv)
         sys.argv = list(sys.argv)
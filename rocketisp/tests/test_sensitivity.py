@@ -0,0 +1,142 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+from functools import partial
+import numpy as np
+import rocketisp.sensitivity
+from rocketisp.sensitivity import Sensitivity, get_sensitivity_inputs
+from rocketisp.tests import thruster_builders
+from rocketisp.tests.thruster_builders import run_serial_and_parallel
+
+make_thruster = partial( thruster_builders.make_thruster, Pamb=5.0 )
+INJ_D = {'fdPinjOx':0.3}
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_input_names(self):
+        """test input names"""
+        nameL = get_sensitivity_inputs( make_thruster() )
+        for name in ['Rthrt', 'eps', 'MRcore', 'Pc', 'pcentFFC', 'ko', 'effDiv', 'effERE']:
+            self.assertIn( name, nameL )
+        # unused inputs and inputs replaced by ERE
+        for name in ['LchamberInp', 'CdThroat', 'pulse_sec', 'noz_regen_eps', 'effMix', 'fdPinjOx']:
+            self.assertNotIn( name, nameL )
+        
+        nameL = get_sensitivity_inputs( make_thruster(injD=INJ_D) )
+        self.assertIn( 'fdPinjOx', nameL )
+    
+    def test_against_full_evaluation(self):
+        """test against full evaluation"""
+        R = make_thruster()
+        IspDel0 = R.coreObj.IspDel
+        sensObj = R.get_sensitivity( n_workers=1 )
+        self.assertEqual( R.coreObj.IspDel, IspDel0 ) # thruster unchanged
+        self.assertEqual( sensObj.baseD['IspDel'], IspDel0 )
+        self.assertEqual( sensObj.warningL, [] )
+        
+        for name, value in [('Rthrt', 1.0), ('MRcore', 1.6)]:
+            h = value * 0.001
+            Rup = make_thruster( **{name:value + h} )
+            Rdn = make_thruster( **{name:value - h} )
+            for out_name in ['IspDel', 'FvacTotal', 'wdotTot', 'Fambient']:
+                deriv = (getattr(Rup.coreObj, out_name) - getattr(Rdn.coreObj, out_name)) / (2.0*h)
+                self.assertAlmostEqual( sensObj.jacD[out_name][name], deriv, delta=1.0E-6*abs(deriv) + 1.0E-9 )
+        
+        # IspDel is proportional to ERE
+        self.assertAlmostEqual( sensObj.get_normalized('IspDel', 'effERE'), 1.0, places=6 )
+        self.assertEqual( sensObj.get_jacobian_arr().shape, (4, len(sensObj.input_nameL)) )
+    
+    def test_stage_reuse(self):
+        """test stage reuse"""
+        sensObj = make_thruster().get_sensitivity( input_nameL=['Rthrt'], n_workers=1 )
+        self.assertEqual( sensObj.stage_countD['cea'][0], 0 ) # CEA not re-run for throat size
+        self.assertGreater( sensObj.stage_countD['BL'][0], 0 )
+    
+    def test_parallel(self):
+        """test parallel"""
+        R = make_thruster( injD=INJ_D )
+        sens1, sens2 = run_serial_and_parallel( R.get_sensitivity )
+        np.testing.assert_allclose( sens2.get_jacobian_arr(), sens1.get_jacobian_arr(), rtol=1.0E-4, atol=1.0E-6 )
+    
+    def test_bad_input(self):
+        """test bad input"""
+        with self.assertRaises(Exception):
+            make_thruster().get_sensitivity( input_nameL=['not_an_input'], n_workers=1 )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__',  rocketisp.sensitivity.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
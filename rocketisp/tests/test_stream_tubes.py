@@ -50,7 +50,7 @@ import imp
 
 from rocketisp.geometry import Geometry
 from rocketisp.efficiencies import Efficiencies
-from rocketisp.stream_tubes import CoreStream
+from rocketisp.stream_tubes import CoreStream, solve_At_split, solve_At_split_arr
 import rocketisp.stream_tubes
 
 class MyTest(unittest.TestCase):
@@ -102,6 +102,123 @@ class MyTest(unittest.TestCase):
         C.reset_attr('Pamb', 15, re_evaluate=True)
         
     
+    def test_fast_lookup(self):
+        """test fast lookup"""
+        from rocketisp.cea_table import build_cea_table
+        import tempfile
+        
+        C = CoreStream( geomObj=Geometry(eps=35), 
+                effObj=Efficiencies(ERE=0.98, Noz=0.97), 
+                oxName='LOX', fuelName='CH4',  MRcore=3.6,
+                Pc=500, Pamb=14.7)
+        IspDel_cea = C('IspDel')
+        Pexit_cea = C('Pexit')
+        
+        npz_file = os.path.join( tempfile.mkdtemp(), 'LOX_CH4.npz' )
+        table = build_cea_table('LOX', 'CH4', PcMin=300, PcMax=800, NPc=4, MRmin=3.0, MRmax=4.0, NMR=11,
+                                epsMin=20, epsMax=50, Neps=5, npz_file=npz_file)
+        self.assertLess( table.errorD['IspODE'], 0.002 )
+        
+        C.set_fast_lookup( table )
+        self.assertEqual( C.n_table_lookups, 1 )
+        self.assertAlmostEqual(C('IspDel')/IspDel_cea, 1.0, places=3)
+        self.assertAlmostEqual(C('Pexit')/Pexit_cea, 1.0, places=2)
+        
+        # saved table reloads with its error estimate
+        table2 = build_cea_table('LOX', 'CH4', PcMin=300, PcMax=800, NPc=4, MRmin=3.0, MRmax=4.0, NMR=11,
+                                epsMin=20, epsMax=50, Neps=5, npz_file=npz_file)
+        self.assertAlmostEqual(table2.errorD['IspODE'], table.errorD['IspODE'], places=9)
+        arrD = table2.get_arrays( [400.0, 500.0], 3.6, 35.0 )
+        self.assertAlmostEqual(arrD['IspODE'][1], C('IspODE'), places=6)
+        
+        # outside of table, use CEA
+        C.reset_attr('Pc', 1000)
+        self.assertEqual( C.n_table_lookups, 1 )
+        
+        with self.assertRaises(Exception):
+            C.set_fast_lookup( build_cea_table('N2O4', 'MMH', NPc=2, NMR=2, Neps=2, estimate_error=False) )
+
+    def test_fast_lookup_barrier(self):
+        """test fast lookup of barrier stream thermo"""
+        from rocketisp.cea_table import build_cea_table
+        from rocketisp.cea_cache import get_cea_cache_stats, clear_cea_cache
+        
+        C = CoreStream( geomObj=Geometry(eps=40), 
+                effObj=Efficiencies(ERE=0.98, Noz=0.97), 
+                oxName='N2O4', fuelName='MMH',  MRcore=1.6,
+                Pc=150, Pamb=0.0, pcentFFC=10)
+        MRL = [1.5, 1.6, 1.7]
+        IspDelL = []
+        for MR in MRL:
+            C.reset_attr('MRcore', MR)
+            IspDelL.append( C('IspDel') )
+        
+        table = build_cea_table('N2O4', 'MMH', PcMin=100, PcMax=300, NPc=3, MRmin=0.3, MRmax=2.5, NMR=12,
+                                epsMin=20, epsMax=60, Neps=3, estimate_error=False)
+        C.set_fast_lookup( table )
+        clear_cea_cache()
+        for MR, IspDel in zip(MRL, IspDelL):
+            C.reset_attr('MRcore', MR)
+            self.assertAlmostEqual(C('IspDel')/IspDel, 1.0, places=2)
+        
+        # MRbarrier and MRwall from table, only barrier kinetics runs CEA
+        self.assertEqual( C.barrierObj.n_table_lookups, 2*(len(MRL) + 1) )
+        self.assertEqual( get_cea_cache_stats()['cea_runs'], 2*len(MRL) )
+    
+    def test_solve_At_split(self):
+        """test solve At split"""
+        def bisect_At_split( MRc, MRb, ffc, cstar_c, cstar_b ):
+            MReng = MRc * (1.0 - ffc)
+            lo, hi = 0.0, 1.0
+            for _ in range(60):
+                fAtc = (lo + hi)/2.0
+                p = fAtc / (cstar_c * (MRc + 1.0))
+                q = (1.0 - fAtc) / (cstar_b * (MRb + 1.0))
+                if (p*MRc + q*MRb) / (p + q) < MReng:
+                    lo = fAtc
+                else:
+                    hi = fAtc
+            return (lo + hi)/2.0
+        
+        for MRc, MRb, ffc in [(1.6, 0.8, 0.1), (3.6, 0.5, 0.05), (1.2, 1.1, 0.01), (2.0, 0.1, 0.4)]:
+            fAtc = solve_At_split( MRc, MRb, ffc, 5200.0, 4100.0 )
+            self.assertAlmostEqual( fAtc, bisect_At_split( MRc, MRb, ffc, 5200.0, 4100.0 ), places=12 )
+            self.assertAlmostEqual( fAtc, float(solve_At_split_arr( MRc, [MRb], ffc, 5200.0, 4100.0 )[0]), places=14 )
+        
+        # no split possible, same as MRcore stream
+        self.assertEqual( solve_At_split( 1.6, 1.6, 0.0, 5200.0, 4100.0 ), 0.0 )
+    
+    def test_evaluate_ffc_arr(self):
+        """test evaluate ffc arr"""
+        geomObj = Geometry(Rthrt=1.0, CR=2.5, eps=40, pcentBell=80, LchmOvrDt=3.0)
+        effObj = Efficiencies()
+        effObj.set_const('ERE', 0.98)
+        C = CoreStream( geomObj, effObj, oxName='N2O4', fuelName='MMH', MRcore=1.6,
+                        Pc=150, pcentFFC=10, ko=0.035)
+        
+        resultD = C.evaluate_ffc_arr( pcentFFC=[2.0, 10.0, 25.0], ko=[[0.03], [0.05]] )
+        self.assertEqual( len(resultD['IspDel']), 6 )
+        
+        # evaluate_ffc_arr does not change C
+        self.assertEqual( C.barrierObj.pcentFFC, 10 )
+        IspDel = C.IspDel
+        
+        for i, (pcentFFC, ko) in enumerate( zip(resultD['pcentFFC'], resultD['ko']) ):
+            C.barrierObj.pcentFFC = pcentFFC
+            C.barrierObj.ko = ko
+            C.evaluate()
+            self.assertAlmostEqual( resultD['IspDel'][i], C.IspDel, places=9 )
+            self.assertAlmostEqual( resultD['Twallgas'][i], C.barrierObj.Twallgas, places=9 )
+            self.assertAlmostEqual( resultD['frac_At_core'][i], C.frac_At_core, places=12 )
+        
+        C.barrierObj.pcentFFC = 10
+        C.barrierObj.ko = 0.035
+        C.evaluate()
+        self.assertAlmostEqual( C.IspDel, IspDel, places=12 )
+        
+        with self.assertRaises(Exception):
+            CoreStream( Geometry(), Efficiencies(), pcentFFC=0.0 ).evaluate_ffc_arr( [5.0, 10.0] )
+    
     def test__main__(self):
         old_sys_argv = list(sys.argv)
         sys.argv = list(sys.argv)
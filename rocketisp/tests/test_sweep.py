@@ -0,0 +1,145 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+import tempfile
+import numpy as np
+import rocketisp.sweep
+from rocketisp.sweep import run_sweep, full_factorial, latin_hypercube, load_sweep_csv, \
+    get_output_names, SWEEP_EXCLUDE_L
+from rocketisp.tests.thruster_builders import make_thruster, run_serial_and_parallel
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_sampling(self):
+        """test sampling"""
+        inpD = full_factorial( MRcore=[1.4, 1.6, 1.8], eps=[20.0, 40.0] )
+        self.assertEqual( len(inpD['MRcore']), 6 )
+        self.assertEqual( sorted( set( zip(inpD['MRcore'], inpD['eps']) ) )[0], (1.4, 20.0) )
+        
+        inpD = latin_hypercube( 10, seed=1, MRcore=(1.0, 2.0), eps=(10.0, 110.0) )
+        # one point in each of the 10 intervals of each input
+        self.assertEqual( sorted( np.floor( (inpD['MRcore'] - 1.0)*10 ).astype(int) ), list(range(10)) )
+        self.assertEqual( sorted( np.floor( (inpD['eps'] - 10.0)/10 ).astype(int) ), list(range(10)) )
+    
+    def test_parallel_matches_serial(self):
+        """test parallel matches serial"""
+        R = make_thruster()
+        inpD = full_factorial( MRcore=[1.4, 1.6, 1.8], pcentFFC=[5.0, 15.0] )
+        
+        serArr, parArr = run_serial_and_parallel( run_sweep, R, inpD, ThrustLbf=100.0 )
+        
+        self.assertEqual( serArr.dtype.names, parArr.dtype.names )
+        for name in ['IspDel', 'Twallgas', 'Rthrt', 'effFFC', 'FvacTotal']:
+            np.testing.assert_allclose( serArr[name], parArr[name], rtol=1.0E-6 ) # Rt sizing tolerance
+        np.testing.assert_allclose( serArr['FvacTotal'], 100.0, rtol=1.0E-3 )
+        
+        # each point agrees with a thruster evaluated on its own
+        R2 = make_thruster( MRcore=1.8, pcentFFC=15.0 )
+        R2.scale_Rt_to_Thrust( 100.0, Pamb=0.0 )
+        self.assertAlmostEqual( serArr['IspDel'][-1], R2.coreObj.IspDel, places=6 )
+        self.assertAlmostEqual( R.geomObj.Rthrt, 1.0 ) # R is unchanged
+    
+    def test_propellant_sweep_and_csv(self):
+        """test propellant sweep and csv"""
+        R = make_thruster( pcentFFC=0.0 )
+        pointL = [{'oxName':'LOX', 'fuelName':'CH4', 'MRcore':3.2}, {'MRcore':1.8},
+                  {'oxName':'LOX', 'fuelName':'CH4', 'MRcore':3.4, 'eps':60.0}]
+        csv_file = os.path.join( tempfile.mkdtemp(), 'sweep.csv' )
+        resultArr = run_sweep( R, pointL, n_workers=1, csv_file=csv_file )
+        
+        self.assertEqual( list(resultArr['oxName']), ['LOX', 'N2O4', 'LOX'] )
+        self.assertEqual( list(resultArr['eps']), [40.0, 40.0, 60.0] ) # missing inputs from R
+        
+        for i, (oxName, fuelName, MRcore) in enumerate( [('LOX','CH4',3.2), ('N2O4','MMH',1.8)] ):
+            R2 = make_thruster( oxName=oxName, fuelName=fuelName, MRcore=MRcore, pcentFFC=0.0 )
+            self.assertAlmostEqual( resultArr['IspDel'][i], R2.coreObj.IspDel, places=6 )
+        
+        # bookkeeping counters are not sweep outputs
+        for name in SWEEP_EXCLUDE_L:
+            self.assertNotIn( name, resultArr.dtype.names )
+        self.assertNotIn( 'n_table_lookups', get_output_names( make_thruster() ) )
+        
+        csvArr = load_sweep_csv( csv_file )
+        self.assertEqual( csvArr.dtype.names, resultArr.dtype.names )
+        np.testing.assert_allclose( csvArr['IspDel'], resultArr['IspDel'], rtol=1.0E-9 )
+        
+        with self.assertRaises(Exception):
+            run_sweep( R, {'not_an_input':[1.0, 2.0]} )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__',  rocketisp.sweep.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
@@ -0,0 +1,157 @@
+
+import unittest
+# import unittest2 as unittest # for versions of python < 2.7
+
+"""
+        Method                            Checks that
+self.assertEqual(a, b)                      a == b   
+self.assertNotEqual(a, b)                   a != b   
+self.assertTrue(x)                          bool(x) is True  
+self.assertFalse(x)                         bool(x) is False     
+self.assertIs(a, b)                         a is b
+self.assertIsNot(a, b)                      a is not b
+self.assertIsNone(x)                        x is None 
+self.assertIsNotNone(x)                     x is not None 
+self.assertIn(a, b)                         a in b
+self.assertNotIn(a, b)                      a not in b
+self.assertIsInstance(a, b)                 isinstance(a, b)  
+self.assertNotIsInstance(a, b)              not isinstance(a, b)  
+self.assertAlmostEqual(a, b, places=5)      a within 5 decimal places of b
+self.assertNotAlmostEqual(a, b, delta=0.1)  a is not within 0.1 of b
+self.assertGreater(a, b)                    a is > b
+self.assertGreaterEqual(a, b)               a is >= b
+self.assertLess(a, b)                       a is < b
+self.assertLessEqual(a, b)                  a is <= b
+
+for expected exceptions, use:
+
+with self.assertRaises(Exception):
+    blah...blah...blah
+
+with self.assertRaises(KeyError):
+    blah...blah...blah
+
+Test if __name__ == "__main__":
+    def test__main__(self):
+        # loads and runs the bottom section: if __name__ == "__main__"
+        runpy = imp.load_source('__main__', os.path.join(up_one, 'filename.py') )
+
+
+See:
+      https://docs.python.org/2/library/unittest.html
+         or
+      https://docs.python.org/dev/library/unittest.html
+for more assert options
+"""
+
+import sys, os
+import imp
+
+
+
+here = os.path.abspath(os.path.dirname(__file__)) # Needed for py.test
+up_one = os.path.split( here )[0]  # Needed to find rocketisp development version
+if here not in sys.path[:3]:
+    sys.path.insert(0, here)
+if up_one not in sys.path[:3]:
+    sys.path.insert(0, up_one)
+
+import json
+import pickle
+import multiprocessing
+import rocketisp.thruster_spec
+from rocketisp.thruster_spec import ThrusterSpec
+from rocketisp.geometry import Geometry
+from rocketisp.efficiencies import Efficiencies
+from rocketisp.stream_tubes import CoreStream
+from rocketisp.injector import Injector
+from rocketisp.rocket_isp import RocketThruster
+
+def make_thrusters():
+    C = CoreStream( geomObj=Geometry(Rthrt=1.0, eps=40), effObj=Efficiencies(ERE=0.98),
+                    oxName='N2O4', fuelName='MMH', MRcore=1.6, Pc=150, pcentFFC=10, ko=0.04 )
+    R1 = RocketThruster(name='with injector', coreObj=C, injObj=Injector(C, fdPinjOx=0.3))
+    R1.scale_Rt_to_Thrust( 100.0, Pamb=0.0 )
+    
+    C = CoreStream( geomObj=Geometry(Rthrt=2.4485, CR=4.30692, eps=61, pcentBell=70, LchamberInp=15),
+                    effObj=Efficiencies(ERE=0.9892), oxName='LOX', fuelName='LH2', MRcore=5.0,
+                    Pc=475.5, CdThroat=0.975, Pamb=5.0 )
+    R2 = RocketThruster(name='RL-10', coreObj=C, noz_regen_eps=61.0, isRegenCham=True, calc_CdThroat=False)
+    
+    C = CoreStream( geomObj=Geometry(eps=20), effObj=Efficiencies(Isp=0.95), oxName='LOX', fuelName='CH4',
+                    MRcore=3.3, Pc=300 )
+    R3 = RocketThruster(name='const Isp', coreObj=C, pulse_sec=0.1)
+    return [R1, R2, R3]
+
+def get_IspDel( spec ):
+    return spec.build().coreObj.IspDel
+
+class MyTest(unittest.TestCase):
+
+
+    def test_should_always_pass_cleanly(self):
+        """Should always pass cleanly."""
+        pass
+
+    def test_round_trip(self):
+        """test round trip"""
+        for R in make_thrusters():
+            spec = ThrusterSpec.from_thruster( R )
+            
+            # small to pickle and rebuilds to the same performance
+            self.assertLess( len(pickle.dumps(spec)), 2000 )
+            R2 = pickle.loads( pickle.dumps(spec) ).build()
+            for name in ['IspDel', 'IspAmb', 'FvacTotal', 'wdotTot', 'CdThroat']:
+                self.assertEqual( getattr(R2.coreObj, name), getattr(R.coreObj, name) )
+            self.assertEqual( R2.name, R.name )
+            
+            # spec of rebuilt thruster is unchanged
+            self.assertEqual( ThrusterSpec.from_thruster(R2), spec )
+            
+            # plain values round trip through json
+            spec3 = ThrusterSpec.from_dict( json.loads( json.dumps( spec.to_dict() ) ) )
+            self.assertEqual( spec3.build().coreObj.IspDel, R.coreObj.IspDel )
+    
+    def test_copy(self):
+        """test copy"""
+        spec = ThrusterSpec.from_thruster( make_thrusters()[2] )
+        spec2 = spec.copy( MRcore=3.0, eps=30.0, pcentFFC=5.0 )
+        self.assertEqual( spec.coreD['MRcore'], 3.3 ) # original unchanged
+        self.assertNotEqual( spec, spec2 )
+        
+        R = spec2.build()
+        self.assertEqual( R.coreObj.MRcore, 3.0 )
+        self.assertEqual( R.geomObj.eps, 30.0 )
+        self.assertEqual( R.coreObj.barrierObj.pcentFFC, 5.0 )
+        
+        with self.assertRaises(Exception):
+            spec.copy( not_an_input=1.0 )
+    
+    def test_build_in_workers(self):
+        """test build in workers"""
+        specL = [ThrusterSpec.from_thruster(R) for R in make_thrusters()]
+        pool = multiprocessing.Pool( 2 )
+        try:
+            IspDelL = pool.map( get_IspDel, specL )
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual( IspDelL, [get_IspDel(spec) for spec in specL] )
+    
+    def test__main__(self):
+        old_sys_argv = list(sys.argv)
+        sys.argv = list(sys.argv)
+        sys.argv.append('suppress_show')
+        
+        try:
+            runpy = imp.load_source('__main__',  rocketisp.thruster_spec.__file__)
+        except:
+            raise Exception('ERROR... failed in __main__ routine')
+        finally:
+            sys.argv = old_sys_argv
+        
+
+if __name__ == '__main__':
+    # Can test just this file from command prompt
+    #  or it can be part of test discovery from nose, unittest, pytest, etc.
+    unittest.main()
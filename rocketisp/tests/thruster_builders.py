@@ -0,0 +1,51 @@
+r"""
+Shared test thruster builder and serial vs parallel helper for the test files.
+
+make_thruster builds a small N2O4/MMH thruster (Rthrt=1, eps=40, Pc=150) that
+each test file adjusts through keyword arguments instead of copying its own
+factory.
+
+For example::
+
+    R = make_thruster( MRcore=1.8, pcentFFC=0.0, injD={'fdPinjOx':0.3} )
+    serial, parallel = run_serial_and_parallel( R.get_sensitivity )
+"""
+from rocketisp.geometry import Geometry
+from rocketisp.efficiencies import Efficiencies
+from rocketisp.stream_tubes import CoreStream
+from rocketisp.injector import Injector
+from rocketisp.rocket_isp import RocketThruster
+
+def make_thruster( name='test thruster', oxName='N2O4', fuelName='MMH', MRcore=1.6, Pc=150.0,
+                   pcentFFC=10.0, Pamb=0.0, Rthrt=1.0, eps=40.0, effD=None, injD=None,
+                   calc_CdThroat=True, **coreD ):
+    """
+    Return RocketThruster of test thruster.
+
+    :param effD: constant efficiencies (None=ERE of 0.98 only)
+    :param injD: Injector inputs (None=no injector)
+    :param calc_CdThroat: passed to RocketThruster
+    :param coreD: any other CoreStream inputs (e.g. CdThroat)
+    :type effD: dict
+    :type injD: dict
+    :type calc_CdThroat: bool
+    :type coreD: dict
+    :return: test thruster
+    :rtype: RocketThruster
+    """
+    if effD is None:
+        effD = {'ERE':0.98}
+
+    coreObj = CoreStream( geomObj=Geometry(Rthrt=Rthrt, eps=eps), effObj=Efficiencies(**effD),
+                          oxName=oxName, fuelName=fuelName, MRcore=MRcore, Pc=Pc,
+                          pcentFFC=pcentFFC, Pamb=Pamb, **coreD )
+
+    if injD is None:
+        injObj = None
+    else:
+        injObj = Injector( coreObj, **injD )
+    return RocketThruster( name=name, coreObj=coreObj, injObj=injObj, calc_CdThroat=calc_CdThroat )
+
+def run_serial_and_parallel( func, *args, **kwargs ):
+    """Return (serial, parallel) results of func(*args, n_workers=1 or 2, **kwargs)."""
+    return func( *args, n_workers=1, **kwargs ), func( *args, n_workers=2, **kwargs )
@@ -0,0 +1,174 @@
+r"""
+Compact, picklable specification of a RocketThruster.
+
+A ThrusterSpec holds only the plain inputs (numbers, strings, booleans and None)
+of Geometry, CoreStream (including the BarrierStream inputs pcentFFC and ko),
+Injector, RocketThruster and the state of each Efficiency.  It holds no CEA
+objects, interpolators or caches, so it is small to pickle and safe to send to
+worker processes.  A worker rebuilds the thruster with ThrusterSpec.build, and
+the rebuilt thruster uses the CEA results already held in that worker's CEA cache.
+
+Input names are taken from the __init__ signature of each class, so new inputs
+are picked up automatically.  An optional fast lookup CEA_Table (see
+CoreStream.set_fast_lookup) is not part of the spec.
+
+For example::
+
+    from rocketisp.thruster_spec import ThrusterSpec
+
+    spec = ThrusterSpec.from_thruster( R )
+    R2 = spec.build() # same performance as R
+    spec2 = spec.copy( MRcore=1.8, eps=60.0 )
+"""
+import inspect
+import numpy as np
+from rocketisp.geometry import Geometry
+from rocketisp.efficiencies import Efficiencies
+from rocketisp.stream_tubes import CoreStream
+from rocketisp.injector import Injector
+from rocketisp.rocket_isp import RocketThruster
+
+def get_input_names( cls ):
+    """Return list of __init__ input names of cls (object inputs, e.g. coreObj, are skipped)."""
+    return [name for name in inspect.signature( cls.__init__ ).parameters \
+            if name != 'self' and not name.endswith('Obj')]
+
+def plain_value( value ):
+    """Return value as a plain python type (e.g. numpy float to float)."""
+    if isinstance(value, np.generic) or (isinstance(value, np.ndarray) and value.ndim == 0):
+        return value.item()
+    return value
+
+class ThrusterSpec(object):
+    """
+    Plain input specification of a RocketThruster.
+
+    :param geomD: Geometry inputs (index=name, value=value)
+    :param coreD: CoreStream inputs, including pcentFFC and ko
+    :param effL: list of Efficiency states (name, value, value_src, is_const)
+    :param injD: Injector inputs (None if thruster has no Injector)
+    :param thrusterD: RocketThruster inputs
+    :type geomD: dict
+    :type coreD: dict
+    :type effL: list
+    :type injD: dict
+    :type thrusterD: dict
+    :return: ThrusterSpec object
+    :rtype: ThrusterSpec
+    """
+
+    def __init__(self, geomD, coreD, effL, injD=None, thrusterD=None):
+        self.geomD = dict( geomD )
+        self.coreD = dict( coreD )
+        self.effL = [tuple(e) for e in effL]
+        self.injD = None if injD is None else dict( injD )
+        self.thrusterD = dict( thrusterD or {} )
+
+    @classmethod
+    def from_thruster(cls, rocketObj):
+        """Return ThrusterSpec of the current inputs of rocketObj."""
+        coreObj = rocketObj.coreObj
+        geomObj = rocketObj.geomObj
+
+        geomD = dict( [(name, plain_value(getattr(geomObj, name))) for name in get_input_names(Geometry)] )
+
+        coreD = {}
+        for name in get_input_names( CoreStream ):
+            if name in ['pcentFFC', 'ko']:
+                if coreObj.barrierObj is not None:
+                    coreD[name] = plain_value( getattr(coreObj.barrierObj, name) )
+            else:
+                coreD[name] = plain_value( getattr(coreObj, name) )
+
+        effL = [(e.name, plain_value(e.value), e.value_src, e.is_const) for e in coreObj.effObj.effD.values()]
+
+        if rocketObj.injObj is None:
+            injD = None
+        else:
+            injD = dict( [(name, plain_value(getattr(rocketObj.injObj, name))) \
+                          for name in get_input_names(Injector)] )
+
+        thrusterD = dict( [(name, plain_value(getattr(rocketObj, name))) \
+                           for name in get_input_names(RocketThruster)] )
+
+        return cls( geomD, coreD, effL, injD=injD, thrusterD=thrusterD )
+
+    def build(self):
+        """Return a new, evaluated RocketThruster built from the spec."""
+        effObj = Efficiencies()
+        for name, value, value_src, is_const in self.effL:
+            if is_const:
+                effObj.effD[name].set_const( value )
+            else:
+                effObj.effD[name].set_value( value, value_src )
+        effObj.evaluate()
+
+        geomObj = Geometry( **self.geomD )
+        coreObj = CoreStream( geomObj, effObj, **self.coreD )
+        if self.injD is None:
+            injObj = None
+        else:
+            injObj = Injector( coreObj, **self.injD )
+
+        return RocketThruster( coreObj=coreObj, injObj=injObj, **self.thrusterD )
+
+    def copy(self, **inputD):
+        """
+        Return a copy of the spec with any inputs in inputD changed
+        (e.g. spec.copy(MRcore=1.8, eps=60.0)).
+        """
+        spec = ThrusterSpec( self.geomD, self.coreD, self.effL, injD=self.injD, thrusterD=self.thrusterD )
+        for name, value in inputD.items():
+            for D in [spec.geomD, spec.coreD, spec.injD, spec.thrusterD]:
+                if D is not None and name in D:
+                    D[name] = plain_value( value )
+                    break
+            else:
+                if name in ['pcentFFC', 'ko']:
+                    spec.coreD[name] = plain_value( value ) # add barrier stream
+                else:
+                    raise Exception('in ThrusterSpec, "%s" is not a recognized input'%name)
+        return spec
+
+    def to_dict(self):
+        """Return dictionary of plain python values (e.g. for json)."""
+        return {'geomD':dict(self.geomD), 'coreD':dict(self.coreD), 'effL':[list(e) for e in self.effL],
+                'injD':None if self.injD is None else dict(self.injD), 'thrusterD':dict(self.thrusterD)}
+
+    @classmethod
+    def from_dict(cls, D):
+        """Return ThrusterSpec from dictionary made by to_dict."""
+        return cls( D['geomD'], D['coreD'], D['effL'], injD=D['injD'], thrusterD=D['thrusterD'] )
+
+    def get_key(self):
+        """Return hashable key of all inputs (e.g. for caching built thrusters)."""
+        def items( D ):
+            return None if D is None else tuple( sorted( D.items() ) )
+        return (items(self.geomD), items(self.coreD), tuple(self.effL), items(self.injD), items(self.thrusterD))
+
+    def __eq__(self, other):
+        return isinstance(other, ThrusterSpec) and self.get_key() == other.get_key()
+
+    def __hash__(self):
+        return hash( self.get_key() )
+
+    def __repr__(self):
+        return 'ThrusterSpec(%s/%s, MRcore=%g, Pc=%g, eps=%g, Rthrt=%g)'%(self.coreD['oxName'],
+                self.coreD['fuelName'], self.coreD['MRcore'], self.coreD['Pc'],
+                self.geomD['eps'], self.geomD['Rthrt'])
+
+
+if __name__ == '__main__':
+    import pickle
+
+    C = CoreStream( geomObj=Geometry(Rthrt=1.0, eps=40), effObj=Efficiencies(ERE=0.98),
+                    oxName='N2O4', fuelName='MMH', MRcore=1.6, Pc=150, pcentFFC=10)
+    R = RocketThruster(name='spec demo', coreObj=C, injObj=Injector(C))
+    R.scale_Rt_to_Thrust( 100.0, Pamb=0.0 )
+
+    spec = ThrusterSpec.from_thruster( R )
+    print( spec )
+    print( 'pickled size: thruster = %i bytes, spec = %i bytes'%(len(pickle.dumps(R)), len(pickle.dumps(spec))) )
+
+    R2 = pickle.loads( pickle.dumps(spec) ).build()
+    print( 'IspDel original = %.6f, rebuilt = %.6f'%(R.coreObj.IspDel, R2.coreObj.IspDel) )